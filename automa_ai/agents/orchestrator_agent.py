@@ -1,4 +1,7 @@
+import asyncio
 import logging
+import time
+from collections import deque
 from typing import AsyncIterable, Any
 
 from a2a.types import (
@@ -12,9 +15,23 @@ from langchain_core.prompts import PromptTemplate
 
 from automa_ai.agents import GenericLLM
 from automa_ai.agents.agent_factory import resolve_chat_model
+from automa_ai.common import tracing
+from automa_ai.common.artifact_store import get_artifact_store
 from automa_ai.common.response_parser import extract_and_parse_json
 from automa_ai.common.base_agent import BaseAgent
-from automa_ai.common.workflow import WorkflowGraph, WorkflowNode, Status
+from automa_ai.common.checkpoint import CheckpointStore
+from automa_ai.common.human_input import ConsoleInputProvider, HumanInputProvider
+from automa_ai.common.prompts import RESULTS_MAP_SUMMARY_PROMPT
+from automa_ai.common.results_accumulator import ResultsAccumulator, pack_chunks, token_budget_for
+from automa_ai.common.scheduler import AgentScheduler, Priority, get_agent_scheduler
+from automa_ai.common.session_store import OrchestratorSession, SessionStore
+from automa_ai.common.workflow import (
+    DEFAULT_MAX_PARALLELISM,
+    NodeResultCache,
+    Status,
+    WorkflowGraph,
+    WorkflowNode,
+)
 
 logging.basicConfig(
     filename="orchestrator_agent.json.log",
@@ -24,40 +41,157 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Summary tokens are forwarded as a working update once this many characters are buffered
+SUMMARY_UPDATE_CHARS = 80
+# Reduce rounds of a map-reduce summary before the partial summaries are used as they are
+MAX_REDUCE_ROUNDS = 3
+
 
 class OrchestratorAgent(BaseAgent):
     """
-    Orchestrator Agent - The agent manages one task workflow.
+    Orchestrator Agent - The agent manages one task workflow per context, kept in a session.
     In the end, the agent will review the final task and decide whether it needs to reboot planner
     or use generate summary
     A blackboard is setup for sharing among agents.
 
     """
 
-    def __init__(self, chat_model: GenericLLM, model_name: str, instruction: str, model_base_url: str | None = None):
+    def __init__(
+        self,
+        chat_model: GenericLLM,
+        model_name: str,
+        instruction: str,
+        model_base_url: str | None = None,
+        max_parallelism: int = DEFAULT_MAX_PARALLELISM,
+        checkpoint_store: CheckpointStore | None = None,
+        node_cache: NodeResultCache | None = None,
+        scheduler: AgentScheduler | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        session_store: SessionStore | None = None,
+        results_token_budget: int | None = None,
+        summary_mode: str = "auto",
+        map_concurrency: int = 4,
+        human_input: HumanInputProvider | None = None,
+    ):
+        """
+        :param max_parallelism: maximum number of independent workflow nodes running at once.
+        :param checkpoint_store: persist workflows per context so they survive a restart, see resume.
+        :param node_cache: replay results of nodes already run with the same agent, task and blackboard.
+        :param scheduler: concurrency limits shared with other orchestrators, the process wide one by default.
+        :param priority: priority of this orchestrator's agent calls, e.g. Priority.BATCH for scenario sweeps.
+        :param session_store: per context workflow state, bounded with LRU and idle eviction. By default
+            128 sessions, spilled to checkpoint_store when one is given.
+        :param results_token_budget: tokens the results may take in the summary prompt, older results are
+            compacted beyond it. By default from the model name, see results_accumulator.MODEL_TOKEN_BUDGETS.
+        :param summary_mode: "single" summarizes the compacted results in one call, "map_reduce" summarizes
+            chunks of the full results concurrently and then merges them, "auto" uses map-reduce only
+            when results were compacted.
+        :param map_concurrency: chunk summaries running at once in map-reduce mode.
+        :param human_input: answers questions of nodes that need user input, the console by default.
+            Use UpstreamInputProvider to send them to the A2A client as input_required instead.
+        """
+        if summary_mode not in ("single", "map_reduce", "auto"):
+            raise ValueError(f"Unknown summary mode {summary_mode}")
         super().__init__(
             agent_name="OrchestratorAgent",
             description="Facilitate inter agent communication",
             content_types=["text", "text/plain"],
         )
-        self.graph: WorkflowGraph | None = None
-        self.results = []
-        self.task_blackboard = (
-            {}
-        )  # shared memory on task specs, data format shall come from planner's response
-        self.query_history = []
-        self.context_id = None
+        # Workflow state per context, so concurrent users do not share a graph
+        self.results_token_budget = results_token_budget or token_budget_for(model_name)
+        self.summary_mode = summary_mode
+        self.map_concurrency = map_concurrency
+        self.sessions = session_store or SessionStore(
+            spill_store=checkpoint_store,
+            results_factory=lambda: ResultsAccumulator(token_budget=self.results_token_budget),
+        )
         self.summary_instruction = instruction
+        # Seconds to the first summary token of recent summaries, see summary_metrics
+        self.summary_ttfb = deque(maxlen=1000)
         self.chat_model = resolve_chat_model(chat_model, model_name, model_base_url)
+        self.max_parallelism = max_parallelism
+        self.checkpoint_store = checkpoint_store
+        self.node_cache = node_cache
+        self.scheduler = scheduler or get_agent_scheduler()
+        self.priority = priority
+        self.human_input = human_input or ConsoleInputProvider()
 
     async def review_task_outcome(self) -> str:
         pass
 
-    async def generate_summary(self) -> str:
+    def use_map_reduce(self, session: OrchestratorSession) -> bool:
+        if self.summary_mode == "auto":
+            # Compacted results lost detail that a single prompt cannot hold
+            return session.results.total_tokens > session.results.token_budget
+        return self.summary_mode == "map_reduce"
+
+    async def map_summaries(self, session: OrchestratorSession) -> list[str]:
+        """Summarizes chunks of the full results concurrently, again on the partial summaries
+        until they fit in the token budget."""
+        prompt = PromptTemplate.from_template(RESULTS_MAP_SUMMARY_PROMPT)
+        map_chain = prompt | self.chat_model | StrOutputParser()
+        semaphore = asyncio.Semaphore(self.map_concurrency)
+        results = session.results
+
+        async def summarize(chunk: list[str]) -> str:
+            async with semaphore:
+                return await map_chain.ainvoke({"query": session.query_history, "results": chunk})
+
+        chunks = results.chunks()
+        for round_ in range(MAX_REDUCE_ROUNDS):
+            with tracing.span("summary.map", round=round_, chunks=len(chunks)):
+                summaries = await asyncio.gather(*(summarize(chunk) for chunk in chunks))
+            logger.info(f"Summarized {len(chunks)} result chunks, round {round_}")
+            next_chunks = pack_chunks(summaries, results.token_budget, results.count_tokens)
+            if len(next_chunks) == 1 or len(next_chunks) >= len(chunks):
+                break
+            chunks = next_chunks
+        return summaries
+
+    async def generate_summary(self, session: OrchestratorSession) -> AsyncIterable[str]:
+        """Streams the summary text as the model generates it, without blocking the event loop.
+
+        The results in the prompt are the compacted ones, or the partial summaries
+        of a map-reduce over the full results, see summary_mode.
+        """
         prompt = PromptTemplate.from_template(self.summary_instruction)
         summary_chain = prompt | self.chat_model | StrOutputParser()
-        response = summary_chain.invoke({"query": self.query_history, "blackboard": self.task_blackboard, "results": self.results})
-        return response
+        # Artifacts passed by reference are only read back here
+        store = session.graph.artifact_store if session.graph else get_artifact_store()
+        with tracing.span("summary", results=len(session.results)) as summary_span:
+            started = time.perf_counter()
+            if self.use_map_reduce(session):
+                results = await self.map_summaries(session)
+            else:
+                results = session.results.prompt_results()
+            first_token = True
+            async for token in summary_chain.astream(
+                {
+                    "query": session.query_history,
+                    "blackboard": store.resolve(session.task_blackboard),
+                    "results": results,
+                }
+            ):
+                if first_token:
+                    first_token = False
+                    ttfb = time.perf_counter() - started
+                    self.summary_ttfb.append(ttfb)
+                    logger.info(f"Summary time to first token: {ttfb:.2f}s")
+                    if summary_span is not None:
+                        summary_span.set(ttfb_ms=ttfb * 1000)
+                yield token
+
+    def summary_metrics(self) -> dict:
+        """Count and percentiles (seconds) of the summary time to first token."""
+        ttfb = sorted(self.summary_ttfb)
+        if not ttfb:
+            return {"count": 0}
+        return {
+            "count": len(ttfb),
+            "ttfb_p50": ttfb[len(ttfb) // 2],
+            "ttfb_p95": ttfb[int(len(ttfb) * 0.95)],
+            "ttfb_max": ttfb[-1],
+        }
 
 #    def answer_user_question(self, question) -> dict:
 #        # autonomous questions and answer workflow
@@ -79,7 +213,9 @@ class OrchestratorAgent(BaseAgent):
 #            logger.info(f"Error answering user question: {e}")
 #        return {"can_answer": "no", "answer": "Cannot answer based on provided context"}
 
-    def set_node_attributes(self, node_id, task_id=None, context_id=None, query=None):
+    def set_node_attributes(
+        self, session: OrchestratorSession, node_id, task_id=None, context_id=None, query=None
+    ):
         attr_val = {}
         if task_id:
             attr_val["task_id"] = task_id
@@ -88,72 +224,243 @@ class OrchestratorAgent(BaseAgent):
         if query:
             attr_val["query"] = query
 
-        self.graph.set_node_attributes(node_id, attr_val)
+        session.graph.set_node_attributes(node_id, attr_val)
 
     def add_graph_node(
         self,
+        session: OrchestratorSession,
         task_id,
         context_id,
         query: str,
         node_id: str = None,
         node_key: str = None,
         node_label: str = None,
+        depends_on: list[str] | None = None,
     ) -> WorkflowNode:
-        """Add a node to the graph."""
+        """Add a node to the graph.
+
+        :param node_id: id of a node the new node runs after.
+        :param depends_on: ids of further nodes the new node runs after.
+        """
         node = WorkflowNode(task=query, node_key=node_key, node_label=node_label)
-        self.graph.add_node(node)
-        if node_id:
-            self.graph.add_edge(node_id, node.id)
-        self.set_node_attributes(node.id, task_id, context_id, query)
+        session.graph.add_node(node)
+        for parent_id in dict.fromkeys([node_id, *(depends_on or [])]):
+            if parent_id:
+                session.graph.add_edge(parent_id, node.id)
+        self.set_node_attributes(session, node.id, task_id, context_id, query)
         return node
 
-    def clear_state(self):
-        self.graph = None
-        self.results.clear()
-        self.task_blackboard.clear()
-        self.query_history.clear()
+    def planner_node_id(self, session: OrchestratorSession) -> str | None:
+        """Id of the planner node of the session's workflow, the parent of the planned tasks."""
+        return next(
+            (node.id for node in session.graph.nodes.values() if node.node_key == "planner"), None
+        )
+
+    def add_task_nodes(
+        self, session: OrchestratorSession, tasks: list[dict], planner_node_id: str, context_id
+    ) -> list[WorkflowNode]:
+        """Add the planner's tasks to the graph, with edges from their ``depends_on`` ids.
+
+        A task without ``depends_on`` runs after the previous task (after the
+        planner for the first one), an empty ``depends_on`` runs right after the
+        planner. Ids may refer to later tasks, all nodes are added before the
+        edges. Unknown ids are ignored.
+
+        Raises:
+            ValueError: If the dependencies form a cycle.
+        """
+        nodes = []
+        node_ids_by_task = {}
+        for idx, task_data in enumerate(tasks):
+            # distribute relevant modeling tasks.
+            node = self.add_graph_node(
+                session,
+                task_id=str(idx),
+                context_id=context_id,
+                query=task_data["description"],
+            )
+            node_ids_by_task[str(task_data.get("id", idx + 1))] = node.id
+            nodes.append(node)
+
+        previous_node_id = planner_node_id
+        for idx, (task_data, node) in enumerate(zip(tasks, nodes)):
+            depends_on = task_data.get("depends_on")
+            if depends_on is None:
+                parents = [previous_node_id]
+            else:
+                parents = []
+                for task_ref in depends_on:
+                    parent_id = node_ids_by_task.get(str(task_ref))
+                    if parent_id is None:
+                        logger.warning(
+                            f"Task {task_data.get('id', idx)} depends on unknown task {task_ref}, ignoring it"
+                        )
+                    else:
+                        parents.append(parent_id)
+                if not depends_on:
+                    parents = [planner_node_id]
+            for parent_id in dict.fromkeys(parents):
+                if parent_id is None:
+                    # First task of a graph without a planner node
+                    continue
+                # Raises on a cycle
+                session.graph.add_edge(parent_id, node.id)
+            previous_node_id = node.id
+        return nodes
+
+    def add_result(self, session: OrchestratorSession, result) -> None:
+        session.results.add(result)
+        self.checkpoint_state(session)
+
+    def checkpoint_state(self, session: OrchestratorSession) -> None:
+        """Persists the query history and results with the workflow checkpoint."""
+        # A graph restored after eviction keeps checkpointing to the spill store
+        checkpoint_store = session.graph.checkpoint_store if session.graph else self.checkpoint_store
+        if checkpoint_store is not None:
+            checkpoint_store.save_extra(session.context_id, session.extra())
+
+    def restore_checkpoint(self, session: OrchestratorSession) -> bool:
+        """Rebuilds the workflow of a session from its checkpoint, returns False if there is none.
+
+        The checkpoint is read from the checkpoint store, or from the session
+        store's spill store for a session that was evicted.
+        """
+        checkpoint_store = self.checkpoint_store or self.sessions.spill_store
+        if checkpoint_store is None:
+            return False
+        context_id = session.context_id
+        graph = WorkflowGraph.from_checkpoint(
+            checkpoint_store,
+            context_id,
+            max_parallelism=self.max_parallelism,
+            node_cache=self.node_cache,
+            scheduler=self.scheduler,
+            priority=self.priority_of(session),
+        )
+        if graph is None:
+            return False
+        session.graph = graph
+        extra = checkpoint_store.load_extra(context_id)
+        session.query_history.extend(extra.get("query_history", []))
+        session.results.load(extra.get("results", []))
+        session.task_blackboard.update(extra.get("task_blackboard", {}))
+        logger.info(f"Resuming workflow of context {context_id} from checkpoint")
+        return True
+
+    async def resume(self, context_id, task_id) -> AsyncIterable[dict[str, Any]]:
+        """Resumes a checkpointed workflow after a restart, without a new user query.
 
-    async def stream(self, query, context_id, task_id) -> AsyncIterable[dict[str, Any]]:
-        """Execute and stream response."""
+        Completed nodes are not executed again. A node that was waiting for user input is
+        re-run so that its agent asks the question again.
+        """
+        session, _ = self.sessions.get_or_create(context_id)
+        async with session.lock:
+            session.clear()
+            if not self.restore_checkpoint(session):
+                raise ValueError(f"No checkpoint for context {context_id}")
+            start_node_id = None
+            if session.graph.state == Status.PAUSED:
+                start_node_id = session.graph.paused_node_id
+            async for item in self.run_graph(session, start_node_id, task_id, context_id):
+                yield item
+
+    def priority_of(self, session: OrchestratorSession) -> Priority:
+        return self.priority if session.priority is None else session.priority
+
+    def human_input_of(self, session: OrchestratorSession) -> HumanInputProvider:
+        return session.human_input or self.human_input
+
+    async def stream(
+        self,
+        query,
+        context_id,
+        task_id,
+        priority: Priority | None = None,
+        human_input: HumanInputProvider | None = None,
+    ) -> AsyncIterable[dict[str, Any]]:
+        """Execute and stream response.
+
+        :param priority: priority of this context's agent calls, the orchestrator's by default.
+        :param human_input: answers questions of this context's nodes, the orchestrator's by default.
+        """
         logger.info(
             f"Running {self.agent_name} stream for session {context_id}, task {task_id} - {query}"
         )
         if not query:
             raise ValueError("Query cannot be empty")
-        if self.context_id != context_id:
-            # Clear state when the context changes
-            self.clear_state()
-            self.context_id = context_id
-
-        self.query_history.append(query)
-        start_node_id = None
-        # Graph does not exist, start a new graph with planner node.
-        if not self.graph:
-            self.graph = WorkflowGraph()
-            planner_node = self.add_graph_node(
-                task_id=task_id,
-                context_id=context_id,
-                query=query,
-                node_key="planner",
-                node_label="planner",
-            )
-            start_node_id = planner_node.id
-        # Pause state is when the agent might need more information
-        elif self.graph.state == Status.PAUSED:
-            start_node_id = self.graph.paused_node_id
-            self.set_node_attributes(node_id=start_node_id, query=query)
+        session, created = self.sessions.get_or_create(context_id)
+        # Requests of one context take turns, other contexts run concurrently
+        async with session.lock:
+            if priority is not None:
+                session.priority = priority
+            if human_input is not None:
+                session.human_input = human_input
+            if created:
+                # Pick up a workflow of this context interrupted by a restart or evicted
+                self.restore_checkpoint(session)
+
+            session.query_history.append(query)
+            self.checkpoint_state(session)
+            start_node_id = None
+            # Graph does not exist, start a new graph with planner node.
+            if not session.graph:
+                session.graph = WorkflowGraph(
+                    max_parallelism=self.max_parallelism,
+                    checkpoint_store=self.checkpoint_store,
+                    workflow_id=context_id,
+                    node_cache=self.node_cache,
+                    scheduler=self.scheduler,
+                    priority=self.priority_of(session),
+                )
+                planner_node = self.add_graph_node(
+                    session,
+                    task_id=task_id,
+                    context_id=context_id,
+                    query=query,
+                    node_key="planner",
+                    node_label="planner",
+                )
+                start_node_id = planner_node.id
+            # Pause state is when the agent might need more information
+            elif session.graph.state == Status.PAUSED:
+                start_node_id = session.graph.paused_node_id
+                self.set_node_attributes(session, node_id=start_node_id, query=query)
+
+            async for item in self.run_graph(session, start_node_id, task_id, context_id):
+                yield item
+
+    async def run_graph(
+        self, session: OrchestratorSession, start_node_id, task_id, context_id
+    ) -> AsyncIterable[dict[str, Any]]:
+        """Runs the workflow graph until it pauses, fails or completes, then summarizes.
 
+        Every incomplete node runs. start_node_id, the new planner or the resumed
+        paused node, is given the task and context ids of this request.
+        """
+        # The graph may predate a priority passed with this request
+        session.graph.priority = self.priority_of(session)
+        with tracing.span("orchestrator.run", workflow_id=context_id, task_id=task_id):
+            async for item in self._run_graph(session, start_node_id, task_id, context_id):
+                yield item
+
+    async def _run_graph(
+        self, session: OrchestratorSession, start_node_id, task_id, context_id
+    ) -> AsyncIterable[dict[str, Any]]:
         # This loop can be avoided if the workflow graph is dynamic or
         # is built from the results of the planner when the planner itself
         # is not a part of the graph.
+        failures = []
         while True:
             # Set attributes on the node so we propagate task and context
             self.set_node_attributes(
+                session,
                 node_id=start_node_id, task_id=task_id, context_id=context_id
             )
             # Resume workflow, used when the workflow nodes are updated.
             should_resume_workflow = False
-            async for chunk in self.graph.run_workflow(start_node_id=start_node_id):
+            # Question without an answer here, sent upstream once the graph has paused
+            upstream_question = None
+            async for chunk in session.graph.run_workflow():
                 if isinstance(chunk.root, SendStreamingMessageSuccessResponse):
                     # The graph node returned TaskStatusUpdateEvent
                     # Check if the node is complete and continue to the next node
@@ -173,34 +480,40 @@ class OrchestratorAgent(BaseAgent):
                             question = task_status_event.status.message.parts[
                                 0
                             ].root.text
-                            try:
-                                # autonomous agent
-                                #    answer = self.answer_user_question(question)
-                                #    logger.info(f"Agent Answer {answer}")
-                                # User interaction setup
-                                answer_text = input(
-                                    f"❓ Agent responded: {question}\n💬 Your response: "
-                                )
-                                answer = {"can_answer": "yes", "answer": answer_text}
-                                logger.info(f"User Answer: {answer}")
-                                start_node_id = self.graph.paused_node_id
-                                self.set_node_attributes(
-                                    node_id=start_node_id, query=answer_text
-                                )
-                                should_resume_workflow = True
-                            except Exception as e:
-                                logger.info("Cannot convert answer data")
+                            # autonomous agent
+                            #    answer = self.answer_user_question(question)
+                            #    logger.info(f"Agent Answer {answer}")
+                            # Waits without blocking the event loop, other contexts keep running
+                            answer_text = await self.human_input_of(session).ask(session.context_id, question)
+                            if answer_text is None:
+                                upstream_question = question
+                                continue
+                            logger.info(f"User Answer: {answer_text}")
+                            start_node_id = session.graph.paused_node_id
+                            self.set_node_attributes(
+                                session,
+                                node_id=start_node_id, query=answer_text
+                            )
+                            should_resume_workflow = True
 
                         if task_status_event.status.state == TaskState.working:
                             message = task_status_event.status.message.parts[0].root.text
                             print(f"🧠 Agent Thinking: {message}")
                             ## yield??
                             continue
+                        if task_status_event.status.state == TaskState.failed:
+                            # e.g. the node's agent timed out or its circuit is open
+                            message = task_status_event.status.message.parts[0].root.text
+                            logger.warning(f"Workflow node failed: {message}")
+                            # Only reported, the node runs again on retry and its
+                            # result then goes into the summary instead
+                            failures.append(message)
+                            continue
                     # The graph node returned TaskArtifactUpdateEvent
                     # Store the node and continue
                     if isinstance(chunk.root.result, TaskArtifactUpdateEvent):
                         artifact = chunk.root.result.artifact
-                        # self.results.append(artifact)
+                        # session.results.append(artifact)
                         if isinstance(artifact.parts[0].root, TextPart):
                             text = artifact.parts[0].root.text
                             if text.startswith("<think>"):
@@ -209,45 +522,40 @@ class OrchestratorAgent(BaseAgent):
                                 if isinstance(parsed, dict):
                                     if parsed.get("status") and parsed["status"] == "completed" and parsed.get("blackboard"):
                                         # if the returned text generated response and response status is completed, update the blackboard.
-                                        self.graph.update_blackboard(parsed.get("blackboard"))
-                            self.results.append(artifact.parts[0].root.text)
+                                        session.graph.update_blackboard(parsed.get("blackboard"))
+                            self.add_result(session, artifact.parts[0].root.text)
                         # if artifact.name == "Planner Agent-result":
                         if isinstance(artifact.parts[0].root, DataPart):
                             artifact_data = artifact.parts[0].root.data
                             # update blackboard
                             if artifact_data.get("blackboard"):
-                                self.graph.update_blackboard(artifact_data.get("blackboard"))
+                                session.graph.update_blackboard(artifact_data.get("blackboard"))
                             # update history
                             if artifact_data.get("results"):
-                                self.results.append(artifact.parts[0].root.data.get("results"))
+                                self.add_result(session, artifact.parts[0].root.data.get("results"))
                             else:
-                                self.results.append(artifact.parts[0].root)
+                                self.add_result(session, artifact.parts[0].root)
                             # any task detected.
                             if artifact.parts[0].root.data.get("tasks"):
                                 # Planning agent returned data, update graph.
                                 logger.info(
                                     f"Updating workflow with {artifact_data} task nodes"
                                 )
-                                # Define the edges
-                                current_node_id = start_node_id
-                                # print(artifact_data)
-                                for idx, task_data in enumerate(artifact_data["tasks"]):
-                                    # distribute relevant modeling tasks.
-                                    node = self.add_graph_node(
-                                        task_id=str(idx),
-                                        context_id=context_id,
-                                        query=task_data["description"],
-                                        node_id=current_node_id,
-                                    )
-                                    current_node_id = node.id
-                                    # Restart graph from the newly inserted subgraph state
-                                    # Start from the new node just created
-                                    if idx == 0:
-                                        should_resume_workflow = True
-                                        start_node_id = node.id
+                                # Define the edges from the tasks' dependencies
+                                # Looked up, the run may have started from a restored checkpoint
+                                # without a start node
+                                task_nodes = self.add_task_nodes(
+                                    session,
+                                    artifact_data["tasks"], self.planner_node_id(session), context_id
+                                )
+                                # Route every task now, while the planner finishes
+                                session.graph.prefetch_agents([node.id for node in task_nodes])
+                                # Restart graph from the planner, it is complete so
+                                # the run starts with the tasks that only need the plan
+                                should_resume_workflow = True
 
                         else:
-                            self.results.append(artifact)
+                            self.add_result(session, artifact)
                             # Not planner but artifacts from other tasks,
                             # Continue to the next node in the workflow
                             # client does not get the artifact,
@@ -262,6 +570,16 @@ class OrchestratorAgent(BaseAgent):
                     yield chunk
 
                 # print("Resume Workflow", should_resume_workflow)
+            if upstream_question is not None:
+                # The paused node resumes with the answer in the next message of this context
+                logger.info(f"Asking upstream for input, context {session.context_id}: {upstream_question}")
+                yield {
+                    "response_type": "text",
+                    "is_task_complete": False,
+                    "require_user_input": True,
+                    "content": upstream_question,
+                }
+                break
             # The graph is complete and no updates, so okay to break from the loop.
             if not should_resume_workflow:
                 logger.info(
@@ -271,11 +589,36 @@ class OrchestratorAgent(BaseAgent):
             else:
                 # Readable logs
                 logger.info("Restarting workflow loop.")
-        if self.graph.state == Status.COMPLETED:
+        if session.graph.state == Status.COMPLETED:
             # All individual actions completed, now generate the summary
-            logger.info(f"Generating summary for {len(self.results)} results")
-            summary = await self.generate_summary()
-            self.clear_state()
+            logger.info(f"Generating summary for {len(session.results)} results")
+            tokens = []
+            buffered = ""
+            async for token in self.generate_summary(session):
+                tokens.append(token)
+                buffered += token
+                if len(buffered) >= SUMMARY_UPDATE_CHARS or "\n" in token:
+                    yield {
+                        "response_type": "text",
+                        "is_task_complete": False,
+                        "require_user_input": False,
+                        "content": buffered,
+                        # Consecutive deltas may repeat, each one must reach the client
+                        "delta": True,
+                    }
+                    buffered = ""
+            if buffered:
+                yield {
+                    "response_type": "text",
+                    "is_task_complete": False,
+                    "require_user_input": False,
+                    "content": buffered,
+                    "delta": True,
+                }
+            summary = "".join(tokens)
+            if session.graph.checkpoint_store is not None:
+                session.graph.checkpoint_store.delete(session.context_id)
+            session.clear()
             logger.info(f"Summary: {summary}")
             yield {
                 "response_type": "text",
@@ -283,3 +626,17 @@ class OrchestratorAgent(BaseAgent):
                 "require_user_input": False,
                 "content": summary,
             }
+        elif session.graph.state == Status.FAILED:
+            # The workflow and its checkpoint are kept, the failed tasks and
+            # the tasks depending on them run with the next message or resume
+            logger.warning(f"Workflow of context {session.context_id} failed: {failures}")
+            yield {
+                "response_type": "text",
+                "is_task_complete": False,
+                "require_user_input": False,
+                # Ends the A2A task as failed, see GenericAgentExecutor
+                "is_task_failed": True,
+                "content": "Some tasks of the workflow failed:\n"
+                + "\n".join(f"- {failure}" for failure in failures)
+                + "\nSend another message to retry them.",
+            }
@@ -0,0 +1,366 @@
+import asyncio
+import uuid
+
+import pytest
+from a2a.server.agent_execution import RequestContext
+from a2a.server.events import EventQueue
+from a2a.types import (
+    Artifact,
+    DataPart,
+    Message,
+    MessageSendParams,
+    Part,
+    Role,
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+from automa_ai.agents import GenericLLM
+from automa_ai.agents.orchestrator_agent import OrchestratorAgent
+from automa_ai.common.agent_executor import GenericAgentExecutor
+from automa_ai.common.checkpoint import CheckpointStore
+from automa_ai.common.human_input import QueueInputProvider, ScriptedInputProvider, UpstreamInputProvider
+from automa_ai.common.scheduler import AgentScheduler, Priority
+from automa_ai.common.session_store import SessionStore
+from automa_ai.common.workflow import Status, WorkflowGraph, WorkflowNode
+from automa_ai.common.workflow_test import FakeNode
+from automa_ai.network.batch_runner import run_batch
+
+SUMMARY_PROMPT = "Summarize {query} with {blackboard} and {results}"
+SUMMARY = "Savings\n\n\n12% less energy  \n\n"
+PLAN = [
+    {"id": 1, "description": "create baseline model", "depends_on": []},
+    {"id": 2, "description": "add daylighting sensors", "depends_on": [1]},
+]
+ASKING_PLAN = [{"id": 1, "description": "set the climate zone", "depends_on": []}]
+SIMULATION_PLAN = [
+    {"id": 1, "description": "create baseline model", "depends_on": []},
+    {"id": 2, "description": "run annual simulation", "depends_on": [1]},
+]
+# Tasks whose agent fails the first time they run
+FAILING = set()
+
+
+def chunk(event) -> SendStreamingMessageResponse:
+    return SendStreamingMessageResponse(
+        root=SendStreamingMessageSuccessResponse(id=str(uuid.uuid4()), result=event)
+    )
+
+
+def status(state: TaskState, text: str, task_id: str, context_id: str) -> SendStreamingMessageResponse:
+    message = Message(
+        messageId=str(uuid.uuid4()), role=Role.agent, parts=[Part(root=TextPart(text=text))]
+    )
+    return chunk(
+        TaskStatusUpdateEvent(
+            taskId=task_id, contextId=context_id, final=True, status=TaskStatus(state=state, message=message)
+        )
+    )
+
+
+def artifact(part, task_id: str, context_id: str) -> SendStreamingMessageResponse:
+    return chunk(
+        TaskArtifactUpdateEvent(
+            taskId=task_id,
+            contextId=context_id,
+            artifact=Artifact(artifactId=str(uuid.uuid4()), parts=[Part(root=part)]),
+        )
+    )
+
+
+async def stub_run_node(self, query, task_id, context_id, blackboard):
+    """Plans PLAN, fails tasks in FAILING once, asks for the climate zone when a task mentions it,
+    otherwise reports the task done."""
+    await asyncio.sleep(0.01)
+    if self.node_key == "planner":
+        yield artifact(DataPart(data={"tasks": PLAN}), task_id, context_id)
+    elif self.task in FAILING:
+        FAILING.discard(self.task)
+        yield status(TaskState.failed, f"{self.task} timed out", task_id, context_id)
+        return
+    elif "climate zone" in self.task and query == self.task:
+        yield status(TaskState.input_required, "Which climate zone?", task_id, context_id)
+        return
+    else:
+        yield artifact(TextPart(text=f"{query} done in {context_id}"), task_id, context_id)
+    yield status(TaskState.completed, "done", task_id, context_id)
+
+
+@pytest.fixture
+def stub_nodes(monkeypatch):
+    """Workflow nodes run stub_run_node instead of calling agents."""
+    card = FakeNode("Stub Agent", []).agent_card
+
+    async def resolve_agent(self):
+        return card
+
+    monkeypatch.setattr(WorkflowNode, "run_node", stub_run_node)
+    monkeypatch.setattr(WorkflowNode, "resolve_agent", resolve_agent)
+    monkeypatch.setattr(WorkflowGraph, "prefetch_agents", lambda self, node_ids=None: None)
+
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = OrchestratorAgent(
+        chat_model=GenericLLM.OLLAMA,
+        model_name="llama3.1:8b",
+        instruction=SUMMARY_PROMPT,
+        scheduler=AgentScheduler(),
+    )
+    orchestrator.chat_model = FakeListChatModel(responses=[SUMMARY])
+    return orchestrator
+
+
+def request(query: str, context_id: str) -> RequestContext:
+    message = Message(
+        messageId=str(uuid.uuid4()),
+        role=Role.user,
+        parts=[Part(root=TextPart(text=query))],
+        contextId=context_id,
+    )
+    return RequestContext(request=MessageSendParams(message=message), context_id=context_id)
+
+
+async def drain_queue(event_queue: EventQueue) -> list:
+    events = []
+    while True:
+        try:
+            events.append(await event_queue.dequeue_event(no_wait=True))
+        except asyncio.QueueEmpty:
+            return events
+
+
+def planned_session(orchestrator: OrchestratorAgent, context_id: str = "context"):
+    session, _ = orchestrator.sessions.get_or_create(context_id)
+    session.graph = WorkflowGraph(workflow_id=context_id)
+    planner = orchestrator.add_graph_node(
+        session, task_id="t", context_id=context_id, query="plan", node_key="planner"
+    )
+    return session, planner
+
+
+class TestTaskNodes:
+    """Test cases for turning the planner's tasks into workflow nodes."""
+
+    def test_dependency_on_later_task(self, orchestrator):
+        session, planner = planned_session(orchestrator)
+        simulate, build_model = orchestrator.add_task_nodes(
+            session,
+            [
+                {"id": 1, "description": "run annual simulation", "depends_on": [2]},
+                {"id": 2, "description": "create baseline model", "depends_on": []},
+            ],
+            planner.id,
+            "context",
+        )
+        graph = session.graph.graph
+        assert list(graph.predecessors(simulate.id)) == [build_model.id]
+        assert list(graph.predecessors(build_model.id)) == [planner.id]
+        order = session.graph.execution_order()
+        assert order.index(build_model.id) < order.index(simulate.id)
+
+    def test_cycle_is_rejected(self, orchestrator):
+        session, planner = planned_session(orchestrator)
+        with pytest.raises(ValueError, match="cycle"):
+            orchestrator.add_task_nodes(
+                session,
+                [
+                    {"id": 1, "description": "add daylighting sensors", "depends_on": [2]},
+                    {"id": 2, "description": "run annual simulation", "depends_on": [1]},
+                ],
+                planner.id,
+                "context",
+            )
+
+
+class TestSummaryStreaming:
+    """Test cases for streaming the workflow summary to the client."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_deltas_reach_the_client(self, orchestrator, stub_nodes):
+        event_queue = EventQueue()
+        await GenericAgentExecutor(orchestrator).execute(request("retrofit", "c1"), event_queue)
+        updates = [
+            event.status.message.parts[0].root.text
+            for event in await drain_queue(event_queue)
+            if isinstance(event, TaskStatusUpdateEvent) and event.status.state == TaskState.working
+        ]
+        assert "".join(updates) == SUMMARY
+
+
+async def collect(stream) -> list:
+    return [item async for item in stream]
+
+
+async def answer_when_asked(provider: QueueInputProvider, context_id: str, text: str) -> None:
+    while context_id not in provider.pending():
+        await asyncio.sleep(0.005)
+    provider.answer(context_id, text)
+
+
+class TestBatchRuns:
+    """Test cases for batch queries sharing the orchestrator with interactive users."""
+
+    @pytest.mark.asyncio
+    async def test_interactive_request_during_batch(self, orchestrator, stub_nodes, monkeypatch, tmp_path):
+        monkeypatch.setitem(globals(), "PLAN", ASKING_PLAN)
+        interactive_input = QueueInputProvider()
+        orchestrator.human_input = interactive_input
+        queries = [{"id": str(i), "query": f"warehouse {i}", "params": {}} for i in range(4)]
+
+        report, interactive, _ = await asyncio.gather(
+            run_batch(
+                orchestrator, queries, tmp_path / "results.jsonl",
+                concurrency=2, human_input=ScriptedInputProvider([], default="4A"),
+            ),
+            collect(orchestrator.stream("office retrofit", "interactive", "t1")),
+            answer_when_asked(interactive_input, "interactive", "2A"),
+        )
+        assert report["completed"] == 4
+        assert interactive[-1]["content"] == SUMMARY
+        # The batch did not change what interactive requests use
+        assert orchestrator.priority == Priority.INTERACTIVE
+        assert orchestrator.human_input is interactive_input
+        # Planner, question and answered re-run of the task, per query
+        priorities = orchestrator.scheduler.stats()["priorities"]
+        assert priorities["interactive"]["admitted"] == 3
+        assert priorities["batch"]["admitted"] == 3 * len(queries)
+
+
+def echo_prompt(orchestrator: OrchestratorAgent) -> None:
+    """The summary repeats its prompt, so tests can see which results went into it."""
+    orchestrator.chat_model = RunnableLambda(lambda prompt: prompt.to_string())
+
+
+class TestSessions:
+    """Test cases for contexts sharing one orchestrator through its session store."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_contexts_are_isolated(self, orchestrator, stub_nodes):
+        echo_prompt(orchestrator)
+        first, second = await asyncio.gather(
+            collect(orchestrator.stream("retrofit the office", "c1", "t1")),
+            collect(orchestrator.stream("retrofit the school", "c2", "t2")),
+        )
+        assert "retrofit the office" in first[-1]["content"]
+        assert "done in c1" in first[-1]["content"]
+        assert "done in c2" not in first[-1]["content"]
+        assert "retrofit the school" in second[-1]["content"]
+        assert "done in c1" not in second[-1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_evicted_paused_session_resumes(self, orchestrator, stub_nodes, monkeypatch, tmp_path):
+        monkeypatch.setitem(globals(), "PLAN", ASKING_PLAN)
+        echo_prompt(orchestrator)
+        spill_store = CheckpointStore(tmp_path / "spill.sqlite")
+        now = [0.0]
+        orchestrator.sessions = SessionStore(
+            maxsize=1, ttl=60, spill_store=spill_store, clock=lambda: now[0]
+        )
+        orchestrator.human_input = UpstreamInputProvider()
+
+        paused = await collect(orchestrator.stream("office retrofit", "lru", "t1"))
+        assert paused[-1]["require_user_input"]
+        # A second context pushes the paused one out
+        await collect(orchestrator.stream("school retrofit", "other", "t2"))
+        assert "lru" not in orchestrator.sessions
+        resumed = await collect(orchestrator.stream("2A", "lru", "t3"))
+        assert resumed[-1]["is_task_complete"]
+        assert "2A done in lru" in resumed[-1]["content"]
+
+        paused = await collect(orchestrator.stream("office retrofit", "ttl", "t4"))
+        assert paused[-1]["require_user_input"]
+        now[0] = 120.0
+        assert orchestrator.sessions.get("ttl") is None
+        resumed = await collect(orchestrator.stream("4A", "ttl", "t5"))
+        assert "4A done in ttl" in resumed[-1]["content"]
+        spill_store.close()
+
+
+class TestUpstreamInput:
+    """Test cases for asking the A2A client for input."""
+
+    @pytest.mark.asyncio
+    async def test_input_required_round_trip(self, orchestrator, stub_nodes, monkeypatch):
+        monkeypatch.setitem(globals(), "PLAN", ASKING_PLAN)
+        echo_prompt(orchestrator)
+        orchestrator.human_input = UpstreamInputProvider()
+        executor = GenericAgentExecutor(orchestrator)
+
+        event_queue = EventQueue()
+        await executor.execute(request("office retrofit", "up"), event_queue)
+        last = (await drain_queue(event_queue))[-1]
+        assert last.status.state == TaskState.input_required
+        assert last.status.message.parts[0].root.text == "Which climate zone?"
+
+        # The answer resumes the paused node instead of planning again
+        event_queue = EventQueue()
+        await executor.execute(request("2A", "up"), event_queue)
+        events = await drain_queue(event_queue)
+        assert events[-1].status.state == TaskState.completed
+        summary = next(event for event in events if isinstance(event, TaskArtifactUpdateEvent))
+        assert "2A done in up" in summary.artifact.parts[0].root.text
+        # Same workflow, the summary sees both messages
+        assert "office retrofit" in summary.artifact.parts[0].root.text
+
+
+class TestCheckpointResume:
+    """Test cases for resuming a workflow checkpointed before a crash."""
+
+    @pytest.mark.asyncio
+    async def test_resume_mid_planning(self, orchestrator, stub_nodes, tmp_path):
+        echo_prompt(orchestrator)
+        checkpoint_store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+        orchestrator.checkpoint_store = checkpoint_store
+        session, _ = orchestrator.sessions.get_or_create("crash")
+        session.graph = WorkflowGraph(workflow_id="crash", checkpoint_store=checkpoint_store)
+        planner = orchestrator.add_graph_node(
+            session, task_id="t1", context_id="crash", query="office retrofit", node_key="planner"
+        )
+        # The process stops while the planner runs
+        planner.state = Status.RUNNING
+        session.graph.state = Status.RUNNING
+        session.graph.set_node_attributes(planner.id, {})
+        session.graph._checkpoint_workflow()
+        orchestrator.sessions.discard("crash")
+
+        resumed = await collect(orchestrator.resume("crash", "t2"))
+        assert resumed[-1]["is_task_complete"]
+        assert "create baseline model done in crash" in resumed[-1]["content"]
+        assert "add daylighting sensors done in crash" in resumed[-1]["content"]
+        checkpoint_store.close()
+
+
+class TestFailedWorkflow:
+    """Test cases for workflows with a task whose agent failed."""
+
+    @pytest.mark.asyncio
+    async def test_failed_task_fails_the_request_and_retries(self, orchestrator, stub_nodes, monkeypatch):
+        monkeypatch.setitem(globals(), "PLAN", SIMULATION_PLAN)
+        monkeypatch.setitem(globals(), "FAILING", {"run annual simulation"})
+        echo_prompt(orchestrator)
+        executor = GenericAgentExecutor(orchestrator)
+
+        event_queue = EventQueue()
+        await executor.execute(request("office retrofit", "retry"), event_queue)
+        last = (await drain_queue(event_queue))[-1]
+        assert last.status.state == TaskState.failed
+        assert "run annual simulation timed out" in last.status.message.parts[0].root.text
+
+        # The next message of the context re-runs the failed task
+        event_queue = EventQueue()
+        await executor.execute(request("try again", "retry"), event_queue)
+        events = await drain_queue(event_queue)
+        assert events[-1].status.state == TaskState.completed
+        summary = next(event for event in events if isinstance(event, TaskArtifactUpdateEvent))
+        text = summary.artifact.parts[0].root.text
+        assert "create baseline model done in retry" in text
+        assert "run annual simulation done in retry" in text
+        assert "timed out" not in text
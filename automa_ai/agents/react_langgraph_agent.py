@@ -1,5 +1,6 @@
 import logging
 import re
+import time
 from json import JSONDecodeError
 from typing import Dict, AsyncIterable, Any
 
@@ -10,6 +11,7 @@ from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
 from pydantic import BaseModel
 
+from automa_ai.common import tracing
 from automa_ai.common.base_agent import BaseAgent
 from automa_ai.common.response_parser import extract_and_parse_json
 from automa_ai.common.types import ServerConfig
@@ -83,6 +85,25 @@ class GenericLangGraphReactAgent(BaseAgent):
         await self.graph.ainvoke({"messages": [("user", query)]}, config)
         return self.get_agent_response(config)
 
+    async def traced_astream(self, inputs, config) -> AsyncIterable[dict[str, Any]]:
+        """Streams graph values, recording every LLM turn and tool call as a span."""
+        with tracing.span("agent.stream", agent=self.agent_name):
+            started, clock = time.time(), time.perf_counter()
+            async for item in self.graph.astream(inputs, config, stream_mode="values"):
+                if tracing.tracing_enabled() and item.get("messages"):
+                    message = item["messages"][-1]
+                    if isinstance(message, AIMessage):
+                        name = "llm"
+                        attributes = {"tool_calls": [call["name"] for call in message.tool_calls]}
+                    elif isinstance(message, ToolMessage):
+                        name, attributes = "tool", {"tool": message.name}
+                    else:
+                        name, attributes = "step", {}
+                    duration_ms = (time.perf_counter() - clock) * 1000
+                    tracing.record_span(name, started, duration_ms, agent=self.agent_name, **attributes)
+                yield item
+                started, clock = time.time(), time.perf_counter()
+
     async def stream(self, query, sessionId, task_id) -> AsyncIterable[dict[str, Any]]:
         inputs = {"messages": [("user", query)]}
         config = {"configurable": {"thread_id": sessionId}}
@@ -94,7 +115,7 @@ class GenericLangGraphReactAgent(BaseAgent):
         # seen_messages = set()
         # Collect all streaming messages first
         last_item = None
-        async for item in self.graph.astream(inputs, config, stream_mode="values"):
+        async for item in self.traced_astream(inputs, config):
             last_item = item
             if "messages" in item:
                 # Take out the last AI Message
@@ -0,0 +1,121 @@
+import asyncio
+import importlib.util
+import logging
+
+import httpx
+from a2a.client import A2AClient
+from a2a.types import AgentCard
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 30.0
+
+
+class A2AClientPool:
+    """Shared httpx connection pool and per agent URL A2AClient cache.
+
+    Opening an ``httpx.AsyncClient`` per request pays TCP (and TLS) setup on every
+    hop to a specialist agent. The pool keeps one ``httpx.AsyncClient`` for the
+    whole process, so connections to an agent stay alive between nodes and
+    contexts, and hands out one ``A2AClient`` per agent URL.
+
+    Args:
+        max_connections: Upper bound on open connections across all agents.
+        max_keepalive_connections: Idle connections kept for reuse.
+        keepalive_expiry: Seconds an idle connection is kept before it is closed.
+        http2: Negotiate HTTP/2 when the agent supports it. Needs the ``h2``
+            package, falls back to HTTP/1.1 when it is not installed.
+        timeout: Default request timeout in seconds. Streaming requests are
+            sent without a read timeout by the A2A client.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested for A2A calls but h2 is not installed, using HTTP/1.1")
+            http2 = False
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.timeout = timeout
+        self.loop = asyncio.get_running_loop()
+        self._httpx_client: httpx.AsyncClient | None = None
+        self._clients: dict[str, A2AClient] = {}
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def httpx_client(self) -> httpx.AsyncClient:
+        """The shared httpx client, created on first use."""
+        if self._closed:
+            raise RuntimeError("A2AClientPool is closed")
+        if self._httpx_client is None:
+            self._httpx_client = httpx.AsyncClient(
+                limits=self.limits, http2=self.http2, timeout=self.timeout
+            )
+        return self._httpx_client
+
+    def get_client(self, agent_card: AgentCard) -> A2AClient:
+        """Returns the A2AClient for the agent card's URL, creating it on first use."""
+        a2a_client = self._clients.get(agent_card.url)
+        if a2a_client is None:
+            a2a_client = A2AClient(self.httpx_client, agent_card)
+            self._clients[agent_card.url] = a2a_client
+        return a2a_client
+
+    def stats(self) -> dict:
+        return {"agents": sorted(self._clients), "http2": self.http2}
+
+    async def close(self) -> None:
+        """Closes the shared httpx client, later lookups raise RuntimeError."""
+        self._closed = True
+        self._clients.clear()
+        if self._httpx_client is not None:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
+        logger.info("Closed A2A client pool")
+
+
+_pool_settings: dict = {}
+_a2a_client_pool: A2AClientPool | None = None
+
+
+def configure_a2a_client_pool(**settings) -> None:
+    """Sets the A2AClientPool keyword arguments used when the shared pool is next created."""
+    _pool_settings.clear()
+    _pool_settings.update(settings)
+
+
+def get_a2a_client_pool() -> A2AClientPool:
+    """Returns the process wide A2A client pool of the running event loop."""
+    global _a2a_client_pool
+    if (
+        _a2a_client_pool is None
+        or _a2a_client_pool.closed
+        or _a2a_client_pool.loop is not asyncio.get_running_loop()
+    ):
+        _a2a_client_pool = A2AClientPool(**_pool_settings)
+    return _a2a_client_pool
+
+
+async def close_a2a_client_pool() -> None:
+    """Closes the process wide A2A client pool, if one was created in this event loop."""
+    global _a2a_client_pool
+    pool, _a2a_client_pool = _a2a_client_pool, None
+    if pool is not None and not pool.closed and pool.loop is asyncio.get_running_loop():
+        await pool.close()
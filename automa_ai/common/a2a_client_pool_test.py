@@ -0,0 +1,50 @@
+import pytest
+from a2a.types import AgentCapabilities, AgentCard
+
+from automa_ai.common import a2a_client_pool
+from automa_ai.common.a2a_client_pool import A2AClientPool
+
+
+def make_card(name: str, url: str) -> AgentCard:
+    return AgentCard(
+        name=name,
+        description=f"{name} description",
+        url=url,
+        version="0.0.1",
+        capabilities=AgentCapabilities(streaming=True),
+        defaultInputModes=["text"],
+        defaultOutputModes=["text"],
+        skills=[],
+    )
+
+
+class TestA2AClientPool:
+    """Test cases for the shared A2A client pool."""
+
+    @pytest.mark.asyncio
+    async def test_client_reused_per_url(self):
+        pool = A2AClientPool()
+        sim = pool.get_client(make_card("sim", "http://localhost:10105/"))
+        assert pool.get_client(make_card("sim", "http://localhost:10105/")) is sim
+        light = pool.get_client(make_card("light", "http://localhost:10104/"))
+        assert light is not sim
+        assert light.httpx_client is sim.httpx_client
+        await pool.close()
+        with pytest.raises(RuntimeError):
+            pool.get_client(make_card("sim", "http://localhost:10105/"))
+
+    @pytest.mark.asyncio
+    async def test_http2_falls_back_without_h2(self, monkeypatch):
+        monkeypatch.setattr(a2a_client_pool.importlib.util, "find_spec", lambda name: None)
+        pool = A2AClientPool(http2=True)
+        assert pool.http2 is False
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_shared_pool_is_recreated_after_close(self):
+        pool = a2a_client_pool.get_a2a_client_pool()
+        assert a2a_client_pool.get_a2a_client_pool() is pool
+        await a2a_client_pool.close_a2a_client_pool()
+        assert pool.closed
+        assert a2a_client_pool.get_a2a_client_pool() is not pool
+        await a2a_client_pool.close_a2a_client_pool()
@@ -17,6 +17,8 @@ from a2a.types import (
 from a2a.utils import new_task, new_agent_text_message
 from a2a.utils.errors import ServerError
 
+from automa_ai.common import tracing
+from automa_ai.common.artifact_store import ArtifactStore, get_artifact_store
 from automa_ai.common.base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
@@ -26,18 +28,28 @@ class GenericAgentExecutor(AgentExecutor):
     """Agent Executor used by modeling agents.
     Core business logic on how agent handles tasks, formats responses, process streaming and cancellation.
     This defines agent behavior and interface with the A2A runtime
+    Large blackboard and results values of data responses are written to the artifact store
+    and sent as artifact:// handles. Handles in incoming messages are replaced by their values
+    before the agent sees the query.
     """
 
-    def __init__(self, agent: BaseAgent):
+    def __init__(self, agent: BaseAgent, artifact_store: ArtifactStore | None = None):
         self.agent = agent
+        self.artifact_store = artifact_store or get_artifact_store()
 
     async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        # Joins the trace of the orchestrator when it sent one along with the message
+        parent = tracing.extract(context.message.metadata if context.message else None)
+        with tracing.span("agent.execute", parent=parent, agent=self.agent.agent_name):
+            await self._execute(context, event_queue)
+
+    async def _execute(self, context: RequestContext, event_queue: EventQueue) -> None:
         logger.info(f"Executing agent {self.agent.agent_name}")
         error = self._validate_request(context)
         if error:
             raise ServerError(error=InvalidParamsError())
 
-        query = context.get_user_input()
+        query = self.artifact_store.resolve_text(context.get_user_input())
         task = context.current_task
 
         if not task:
@@ -66,7 +78,7 @@ class GenericAgentExecutor(AgentExecutor):
             if is_task_complete:
                 logger.info(f"🔍 Completing with content: {item['content']}")
                 if item["response_type"] == "data":
-                    part = DataPart(data=item["content"])
+                    part = DataPart(data=self._externalize(item["content"]))
                 else:
                     part = TextPart(text=item["content"])
 
@@ -76,6 +88,12 @@ class GenericAgentExecutor(AgentExecutor):
                 await updater.complete()
                 break
 
+            if item.get("is_task_failed"):
+                await updater.failed(
+                    new_agent_text_message(item["content"], task.contextId, task.id)
+                )
+                break
+
             if require_user_input:
                 # logger.info(f"-----Requires User Updates!: {item['content']}")
                 await updater.update_status(
@@ -86,8 +104,9 @@ class GenericAgentExecutor(AgentExecutor):
                 # Stop the execution and waiting for user inputs.
                 break
             # Other status continue the loop
-            # Only send working update if message is different
-            if item["content"] != last_text_sent:
+            # Only send working update if message is different, streamed deltas
+            # (e.g. summary tokens) always go out even when they repeat
+            if item.get("delta") or item["content"] != last_text_sent:
                 logger.info(f"-----Continue updates!: {item['content']}")
                 await updater.update_status(
                     TaskState.working,
@@ -99,6 +118,14 @@ class GenericAgentExecutor(AgentExecutor):
                 )
                 last_text_sent = item["content"]
 
+    def _externalize(self, data: dict) -> dict:
+        data = dict(data)
+        if isinstance(data.get("blackboard"), dict):
+            data["blackboard"] = self.artifact_store.externalize(data["blackboard"])
+        if data.get("results"):
+            data["results"] = self.artifact_store.externalize_value(data["results"])
+        return data
+
     def _validate_request(self, context: RequestContext) -> bool:
         # TODO - see any requests for validations
         return False
@@ -0,0 +1,268 @@
+import ast
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_SCHEME = "artifact://"
+# Agents of one machine share this directory whatever their working directory
+ARTIFACT_DIR = os.environ.get("AUTOMA_AI_ARTIFACT_DIR", str(Path.home() / ".automa_ai" / "artifacts"))
+# Artifacts neither written nor read for this many seconds are collected, a week by default
+ARTIFACT_MAX_AGE = float(os.environ.get("AUTOMA_AI_ARTIFACT_MAX_AGE", 7 * 24 * 3600))
+# Values whose JSON form is larger than this many bytes are stored by reference
+DEFAULT_INLINE_LIMIT = 4096
+# The store is collected once every this many new artifacts
+DEFAULT_GC_INTERVAL = 256
+# Artifacts are written to temporary files first, these are collected once older than this
+# many seconds, left behind by a writer that crashed
+TMP_PREFIX = ".tmp-"
+TMP_GRACE_PERIOD = 3600
+
+_HANDLE_PATTERN = re.compile(re.escape(ARTIFACT_SCHEME) + "[0-9a-f]{64}")
+
+
+def is_artifact_handle(value: Any) -> bool:
+    return (
+        isinstance(value, str)
+        and value.startswith(ARTIFACT_SCHEME)
+        and len(value) == len(ARTIFACT_SCHEME) + 64
+    )
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ArtifactStore:
+    """Content addressed store for large payloads passed between agents.
+
+    Every payload is written once under its SHA-256 and referred to by an
+    ``artifact://<sha256>`` handle, so blackboards and A2A messages carry the
+    short handle instead of the bytes. Files are sharded by the first two hex
+    digits of the digest and written atomically, so several agent processes can
+    share one directory.
+
+    Writing or reading an artifact refreshes its modification time. Artifacts
+    unused for ``max_age`` seconds are removed by ``collect_garbage``, then the
+    least recently used ones while the store holds more than ``max_bytes``. It
+    runs once every ``gc_interval`` new artifacts; a handle whose artifact was
+    collected is left unresolved.
+
+    Example:
+        store = ArtifactStore("/tmp/artifacts")
+        handle = store.put_value(idf_objects)
+        idf_objects = store.get_value(handle)
+    """
+
+    def __init__(
+        self,
+        root: str | Path = ARTIFACT_DIR,
+        inline_limit: int = DEFAULT_INLINE_LIMIT,
+        max_age: float | None = ARTIFACT_MAX_AGE,
+        max_bytes: int | None = None,
+        gc_interval: int = DEFAULT_GC_INTERVAL,
+    ):
+        self.root = Path(root).expanduser()
+        self.inline_limit = inline_limit
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.gc_interval = gc_interval
+        self._writes = 0
+
+    def path(self, handle: str) -> Path:
+        if not is_artifact_handle(handle):
+            raise ValueError(f"Not an artifact handle: {handle!r}")
+        digest = handle[len(ARTIFACT_SCHEME):]
+        return self.root / digest[:2] / digest
+
+    def __contains__(self, handle: str) -> bool:
+        return is_artifact_handle(handle) and self.path(handle).exists()
+
+    def put_bytes(self, data: bytes) -> str:
+        """Stores raw bytes and returns their handle, writing nothing if they are already stored."""
+        handle = ARTIFACT_SCHEME + hashlib.sha256(data).hexdigest()
+        path = self.path(handle)
+        try:
+            # Marks it used, so it is not collected while still passed around
+            os.utime(path)
+            return handle
+        except FileNotFoundError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=TMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        logger.debug(f"Stored artifact {handle} ({len(data)} bytes)")
+        self._writes += 1
+        if self._writes % self.gc_interval == 0:
+            self.collect_garbage()
+        return handle
+
+    def get_bytes(self, handle: str) -> bytes:
+        """Reads the bytes behind a handle.
+
+        Raises:
+            KeyError: If the store has no artifact for the handle.
+        """
+        path = self.path(handle)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            raise KeyError(handle) from None
+        return data
+
+    def put_value(self, value: Any) -> str:
+        """Stores a JSON serializable value and returns its handle."""
+        return self.put_bytes(_encode(value))
+
+    def get_value(self, handle: str) -> Any:
+        return json.loads(self.get_bytes(handle))
+
+    def externalize_value(self, value: Any) -> Any:
+        """Returns a handle for value when its JSON form exceeds the inline limit, else value."""
+        if is_artifact_handle(value):
+            return value
+        data = _encode(value)
+        if len(data) <= self.inline_limit:
+            return value
+        return self.put_bytes(data)
+
+    def externalize(self, value: Any) -> Any:
+        """Replaces large values by handles, entry by entry for a dict such as a blackboard."""
+        if isinstance(value, dict):
+            return {key: self.externalize_value(item) for key, item in value.items()}
+        return self.externalize_value(value)
+
+    def resolve(self, value: Any) -> Any:
+        """Replaces every handle nested in value by the stored value.
+
+        Handles missing from the store are left in place.
+        """
+        if is_artifact_handle(value):
+            try:
+                return self.resolve(self.get_value(value))
+            except KeyError:
+                logger.warning(f"Artifact {value} is missing from {self.root}")
+                return value
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.resolve(item) for item in value]
+        return value
+
+    def resolve_text(self, text: str) -> str:
+        """Replaces the handles in a message text by the stored values, for the agent reading it.
+
+        A text holding a Python dict or list, like the ``{"query": ..., "blackboard": ...}``
+        messages of workflow nodes, is resolved value by value and written back the same way.
+        In other texts each handle is replaced by its value, strings as they are and other
+        values as JSON. Handles missing from the store are left in place.
+        """
+        if ARTIFACT_SCHEME not in text:
+            return text
+        try:
+            value = ast.literal_eval(text)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            value = None
+        if isinstance(value, (dict, list, tuple)):
+            return str(self.resolve(value))
+        return _HANDLE_PATTERN.sub(self._resolve_match, text)
+
+    def _resolve_match(self, match: re.Match) -> str:
+        value = self.resolve(match.group(0))
+        return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+    def collect_garbage(self, now: float | None = None) -> int:
+        """Removes artifacts unused for max_age seconds, then the least recently used ones over max_bytes.
+
+        Returns:
+            The number of files removed.
+        """
+        now = time.time() if now is None else now
+        files = []
+        removed = 0
+        for path in self.root.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.name.startswith(TMP_PREFIX):
+                # May be renamed into place by a put running right now
+                if now - stat.st_mtime > TMP_GRACE_PERIOD:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        # Least recently used first
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for mtime, size, path in files:
+            expired = self.max_age is not None and now - mtime > self.max_age
+            oversized = self.max_bytes is not None and total > self.max_bytes
+            if not (expired or oversized):
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Removed {removed} artifacts from {self.root}, {total} bytes left")
+        return removed
+
+
+_artifact_store_settings: dict = {}
+_artifact_store: ArtifactStore | None = None
+
+
+def configure_artifact_store(**settings) -> None:
+    """Sets the ArtifactStore keyword arguments, e.g. root or max_bytes, and replaces the shared store."""
+    global _artifact_store
+    _artifact_store_settings.clear()
+    _artifact_store_settings.update(settings)
+    _artifact_store = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Returns the process wide artifact store, rooted at ``AUTOMA_AI_ARTIFACT_DIR`` by default.
+
+    Artifacts left over from earlier runs are collected when it is created.
+    """
+    global _artifact_store
+    if _artifact_store is None:
+        _artifact_store = ArtifactStore(**_artifact_store_settings)
+        _artifact_store.collect_garbage()
+    return _artifact_store
+
+
+def register_artifact_tools(mcp, store: ArtifactStore | None = None) -> None:
+    """Adds ``put_artifact`` and ``get_artifact`` tools to a FastMCP server."""
+    store = store or get_artifact_store()
+
+    @mcp.tool(
+        name="put_artifact",
+        description="Stores a large value (text or JSON) once and returns an artifact://<sha256> handle to pass around instead of the value.",
+    )
+    def put_artifact(content: Any) -> str:
+        return store.put_value(content)
+
+    @mcp.tool(
+        name="get_artifact",
+        description="Returns the value stored behind an artifact://<sha256> handle.",
+    )
+    def get_artifact(handle: str) -> Any:
+        try:
+            return store.get_value(handle)
+        except (KeyError, ValueError):
+            return {"message": f"Artifact {handle} not found"}
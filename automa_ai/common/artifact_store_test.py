@@ -0,0 +1,157 @@
+import json
+import os
+import time
+import uuid
+
+import pytest
+from a2a.server.agent_execution import RequestContext
+from a2a.server.events import EventQueue
+from a2a.types import Message, MessageSendParams, Part, Role, TaskArtifactUpdateEvent, TextPart
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from automa_ai.common.agent_executor import GenericAgentExecutor
+from automa_ai.common.artifact_store import (
+    ArtifactStore,
+    is_artifact_handle,
+    register_artifact_tools,
+)
+from automa_ai.common.base_agent import BaseAgent
+from automa_ai.common.workflow import WorkflowGraph
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(tmp_path, inline_limit=64)
+
+
+class EchoAgent(BaseAgent):
+    """Answers with the query it was given."""
+
+    async def stream(self, query, context_id, task_id):
+        yield {"is_task_complete": True, "require_user_input": False, "response_type": "text", "content": query}
+
+
+def age(store: ArtifactStore, handle: str, seconds: float) -> None:
+    mtime = time.time() - seconds
+    os.utime(store.path(handle), (mtime, mtime))
+
+
+class TestArtifactStore:
+    """Test cases for the content addressed artifact store."""
+
+    def test_put_is_content_addressed(self, store):
+        handle = store.put_value({"objects": ["Zone,", "Core_ZN;"]})
+        assert is_artifact_handle(handle)
+        assert store.put_value({"objects": ["Zone,", "Core_ZN;"]}) == handle
+        assert store.get_value(handle) == {"objects": ["Zone,", "Core_ZN;"]}
+        assert handle in store
+
+    def test_missing_handle(self, store):
+        with pytest.raises(KeyError):
+            store.get_bytes("artifact://" + "0" * 64)
+        with pytest.raises(ValueError):
+            store.get_bytes("artifact://not-a-digest")
+
+    def test_externalize_only_large_values(self, store):
+        blackboard = {"model_path": "/tmp/model.osm", "idf_objects": ["Material," * 20] * 5}
+        externalized = store.externalize(blackboard)
+        assert externalized["model_path"] == "/tmp/model.osm"
+        assert is_artifact_handle(externalized["idf_objects"])
+        assert store.resolve(externalized) == blackboard
+        assert store.resolve([externalized]) == [blackboard]
+
+    def test_graph_blackboard_holds_handles(self, store):
+        graph = WorkflowGraph(artifact_store=store)
+        graph.update_blackboard({"results": "x" * 1000, "status": "ok"})
+        assert is_artifact_handle(graph.blackboard["results"])
+        assert len(str(graph.blackboard)) < 200
+
+    @pytest.mark.asyncio
+    async def test_mcp_tools(self, store):
+        mcp = FastMCP("artifacts")
+        register_artifact_tools(mcp, store)
+        async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+            result = await session.call_tool("put_artifact", {"content": "Zone,\n  Core_ZN;"})
+            handle = result.content[0].text
+            assert is_artifact_handle(handle)
+            result = await session.call_tool("get_artifact", {"handle": handle})
+            assert result.content[0].text == "Zone,\n  Core_ZN;"
+            result = await session.call_tool("get_artifact", {"handle": "artifact://missing"})
+            assert "not found" in json.loads(result.content[0].text)["message"]
+
+    def test_resolve_text(self, store):
+        idf_objects = ["Material," * 20] * 5
+        handle = store.put_value(idf_objects)
+        zones = "Zone,\n  Core_ZN;" * 10
+        report = store.put_value(zones)
+        message = str({"query": "add daylighting", "blackboard": {"idf_objects": handle}})
+        assert store.resolve_text(message) == str(
+            {"query": "add daylighting", "blackboard": {"idf_objects": idf_objects}}
+        )
+        assert store.resolve_text(f"Check {report} and {handle}") == (
+            f"Check {zones} and {json.dumps(idf_objects)}"
+        )
+        missing = "artifact://" + "0" * 64
+        assert store.resolve_text(f"Check {missing}") == f"Check {missing}"
+        assert store.resolve_text("add daylighting") == "add daylighting"
+
+    @pytest.mark.asyncio
+    async def test_executor_resolves_handles(self, store):
+        handle = store.put_value({"idf_objects": ["Material," * 20] * 5})
+        message = Message(
+            messageId=str(uuid.uuid4()),
+            role=Role.user,
+            parts=[Part(root=TextPart(text=str({"query": "add daylighting", "blackboard": {"model": handle}})))],
+        )
+        event_queue = EventQueue()
+        executor = GenericAgentExecutor(
+            EchoAgent(agent_name="Echo", description="echo", content_types=["text"]), store
+        )
+        await executor.execute(RequestContext(request=MessageSendParams(message=message)), event_queue)
+        events = []
+        while not event_queue.queue.empty():
+            events.append(await event_queue.dequeue_event(no_wait=True))
+        answer = next(event for event in events if isinstance(event, TaskArtifactUpdateEvent))
+        text = answer.artifact.parts[0].root.text
+        assert "artifact://" not in text
+        assert "Material," in text
+
+    def test_collect_unused_artifacts(self, store):
+        old = store.put_value("x" * 100)
+        used = store.put_value("y" * 100)
+        fresh = store.put_value("z" * 100)
+        store.max_age = 3600
+        age(store, old, 7200)
+        age(store, used, 7200)
+        # Storing or reading it again marks it used
+        store.get_value(used)
+        assert store.collect_garbage() == 1
+        assert old not in store
+        assert used in store and fresh in store
+
+    def test_collect_least_recently_used_over_max_bytes(self, store):
+        handles = [store.put_value(str(i) * 100) for i in range(4)]
+        for seconds, handle in zip([40, 30, 20, 10], handles):
+            age(store, handle, seconds)
+        store.put_value("0" * 100)
+        store.max_bytes = 2 * 102
+        assert store.collect_garbage() == 2
+        assert [handle in store for handle in handles] == [True, False, False, True]
+
+    def test_collected_every_gc_interval(self, tmp_path):
+        store = ArtifactStore(tmp_path, max_age=None, max_bytes=0, gc_interval=3)
+        handles = [store.put_value(i) for i in range(3)]
+        assert not any(handle in store for handle in handles)
+
+    def test_temporary_files_of_writes_in_progress_are_kept(self, store):
+        handle = store.put_value("x" * 100)
+        tmp = store.path(handle).parent / ".tmp-write"
+        tmp.write_bytes(b"partial")
+        store.max_age = 0
+        store.max_bytes = 0
+        assert store.collect_garbage(now=time.time() + 60) == 1
+        assert tmp.exists()
+        # Left behind by a writer that crashed
+        assert store.collect_garbage(now=time.time() + 7200) == 1
+        assert not tmp.exists()
@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DB = os.environ.get("AUTOMA_AI_CHECKPOINT_DB", ".automa_checkpoints.sqlite")
+
+
+def _dumps(value: Any) -> str:
+    """Serializes a checkpoint value, pydantic models (A2A artifacts, parts) are dumped as json."""
+
+    def default(obj):
+        if hasattr(obj, "model_dump"):
+            return obj.model_dump(mode="json", exclude_none=True)
+        if isinstance(obj, (set, tuple)):
+            return list(obj)
+        return str(obj)
+
+    return json.dumps(value, default=default, ensure_ascii=False)
+
+
+class CheckpointStore:
+    """SQLite backed checkpoints of workflow graphs, keyed by a workflow id (the context id).
+
+    Nodes, edges and the workflow row (state, paused node, blackboard and any
+    extra orchestrator state) are written as they change, so a workflow can be
+    rebuilt with ``WorkflowGraph.from_checkpoint`` after the process dies and
+    only its incomplete nodes are executed again.
+    """
+
+    def __init__(self, path: str | Path = CHECKPOINT_DB):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS workflows ("
+                "workflow_id TEXT PRIMARY KEY, state TEXT NOT NULL, paused_node_id TEXT, "
+                "deferred TEXT NOT NULL DEFAULT '[]', blackboard TEXT NOT NULL DEFAULT '{}', "
+                "extra TEXT NOT NULL DEFAULT '{}', updated_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS nodes ("
+                "workflow_id TEXT NOT NULL, node_id TEXT NOT NULL, position INTEGER NOT NULL, "
+                "task TEXT NOT NULL, node_key TEXT, node_label TEXT, state TEXT NOT NULL, "
+                "attributes TEXT NOT NULL DEFAULT '{}', result TEXT, "
+                "PRIMARY KEY (workflow_id, node_id))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS edges ("
+                "workflow_id TEXT NOT NULL, from_node_id TEXT NOT NULL, to_node_id TEXT NOT NULL, "
+                "PRIMARY KEY (workflow_id, from_node_id, to_node_id))"
+            )
+
+    def save_workflow(
+        self,
+        workflow_id: str,
+        state: str,
+        paused_node_id: str | None = None,
+        deferred: list[str] | None = None,
+        blackboard: dict | None = None,
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO workflows (workflow_id, state, paused_node_id, deferred, blackboard, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (workflow_id) DO UPDATE SET "
+                "state = excluded.state, paused_node_id = excluded.paused_node_id, "
+                "deferred = excluded.deferred, blackboard = excluded.blackboard, "
+                "updated_at = excluded.updated_at",
+                (
+                    workflow_id,
+                    state,
+                    paused_node_id,
+                    _dumps(sorted(deferred or [])),
+                    _dumps(blackboard or {}),
+                    time.time(),
+                ),
+            )
+
+    def save_extra(self, workflow_id: str, extra: dict) -> None:
+        """Stores caller state (e.g. the orchestrator's query history and results) with the workflow."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO workflows (workflow_id, state, extra, updated_at) VALUES (?, 'INITIALIZED', ?, ?) "
+                "ON CONFLICT (workflow_id) DO UPDATE SET extra = excluded.extra, updated_at = excluded.updated_at",
+                (workflow_id, _dumps(extra), time.time()),
+            )
+
+    def save_node(
+        self,
+        workflow_id: str,
+        node_id: str,
+        task: str,
+        state: str,
+        node_key: str | None = None,
+        node_label: str | None = None,
+        attributes: dict | None = None,
+        result: Any = None,
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO nodes (workflow_id, node_id, position, task, node_key, node_label, state, attributes, result) "
+                "VALUES (?, ?, (SELECT COUNT(*) FROM nodes WHERE workflow_id = ?), ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (workflow_id, node_id) DO UPDATE SET task = excluded.task, "
+                "node_key = excluded.node_key, node_label = excluded.node_label, state = excluded.state, "
+                "attributes = excluded.attributes, result = excluded.result",
+                (
+                    workflow_id,
+                    node_id,
+                    workflow_id,
+                    task,
+                    node_key,
+                    node_label,
+                    state,
+                    _dumps(attributes or {}),
+                    None if result is None else _dumps(result),
+                ),
+            )
+
+    def save_edge(self, workflow_id: str, from_node_id: str, to_node_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO edges (workflow_id, from_node_id, to_node_id) VALUES (?, ?, ?)",
+                (workflow_id, from_node_id, to_node_id),
+            )
+
+    def load(self, workflow_id: str) -> dict | None:
+        """Returns the checkpoint of a workflow, or None if there is none.
+
+        The result has the workflow columns plus ``nodes`` (in insertion order)
+        and ``edges`` (list of (from, to) pairs).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, paused_node_id, deferred, blackboard, extra, updated_at "
+                "FROM workflows WHERE workflow_id = ?",
+                (workflow_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            nodes = self._conn.execute(
+                "SELECT node_id, task, node_key, node_label, state, attributes, result "
+                "FROM nodes WHERE workflow_id = ? ORDER BY position",
+                (workflow_id,),
+            ).fetchall()
+            edges = self._conn.execute(
+                "SELECT from_node_id, to_node_id FROM edges WHERE workflow_id = ?",
+                (workflow_id,),
+            ).fetchall()
+        state, paused_node_id, deferred, blackboard, extra, updated_at = row
+        return {
+            "workflow_id": workflow_id,
+            "state": state,
+            "paused_node_id": paused_node_id,
+            "deferred": json.loads(deferred),
+            "blackboard": json.loads(blackboard),
+            "extra": json.loads(extra),
+            "updated_at": updated_at,
+            "nodes": [
+                {
+                    "node_id": node_id,
+                    "task": task,
+                    "node_key": node_key,
+                    "node_label": node_label,
+                    "state": node_state,
+                    "attributes": json.loads(attributes),
+                    "result": None if result is None else json.loads(result),
+                }
+                for node_id, task, node_key, node_label, node_state, attributes, result in nodes
+            ],
+            "edges": [tuple(edge) for edge in edges],
+        }
+
+    def load_extra(self, workflow_id: str) -> dict:
+        """Returns the state stored with ``save_extra``, empty if there is none."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT extra FROM workflows WHERE workflow_id = ?", (workflow_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def list_workflows(self) -> list[tuple[str, str, float]]:
+        """Returns (workflow_id, state, updated_at) of every checkpoint, most recent first."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT workflow_id, state, updated_at FROM workflows ORDER BY updated_at DESC"
+            ).fetchall()
+
+    def delete(self, workflow_id: str) -> None:
+        with self._lock, self._conn:
+            for table in ("workflows", "nodes", "edges"):
+                self._conn.execute(f"DELETE FROM {table} WHERE workflow_id = ?", (workflow_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
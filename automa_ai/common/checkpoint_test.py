@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from automa_ai.common.checkpoint import CheckpointStore
+from automa_ai.common.workflow import Status, WorkflowGraph
+from automa_ai.common.workflow_test import build, drain
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+    yield store
+    store.close()
+
+
+class TestCheckpoint:
+    """Test cases for workflow checkpointing and crash resume."""
+
+    @pytest.mark.asyncio
+    async def test_resume_after_crash(self, store):
+        log = []
+        graph = WorkflowGraph(max_parallelism=1, checkpoint_store=store, workflow_id="ctx")
+        nodes = build(graph, log, [("a", "b"), ("b", "c")], a={"delay": 0}, b={"delay": 10}, c={})
+        graph.update_blackboard({"model_path": "/tmp/model.osm"})
+
+        # The process "dies" while b is running
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(drain(graph), 0.5)
+        assert nodes["b"].state == Status.RUNNING
+
+        restored = WorkflowGraph.from_checkpoint(store, "ctx")
+        assert set(restored.nodes) == {node.id for node in nodes.values()}
+        assert set(restored.graph.edges) == set(graph.graph.edges)
+        assert restored.blackboard == {"model_path": "/tmp/model.osm"}
+        assert restored.graph.nodes[nodes["a"].id]["context_id"] == "context"
+        assert restored.nodes[nodes["a"].id].state == Status.COMPLETED
+        assert restored.nodes[nodes["b"].id].state == Status.READY
+        assert restored._pending_nodes() == [nodes["b"].id, nodes["c"].id]
+
+    @pytest.mark.asyncio
+    async def test_paused_workflow_is_restored(self, store):
+        log = []
+        graph = WorkflowGraph(checkpoint_store=store, workflow_id="ctx")
+        nodes = build(graph, log, [("a", "b")], a={"ask": True}, b={})
+        await drain(graph)
+        restored = WorkflowGraph.from_checkpoint(store, "ctx")
+        assert restored.state == Status.PAUSED
+        assert restored.paused_node_id == nodes["a"].id
+
+    def test_missing_checkpoint(self, store):
+        assert WorkflowGraph.from_checkpoint(store, "unknown") is None
+        store.save_extra("ctx", {"query_history": ["q"]})
+        assert WorkflowGraph.from_checkpoint(store, "ctx") is None
+        assert store.load_extra("ctx") == {"query_history": ["q"]}
+        store.delete("ctx")
+        assert store.load("ctx") is None
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class HumanInputProvider(ABC):
+    """Answers the questions of workflow nodes that need user input.
+
+    ``ask`` waits for the answer without blocking the event loop, so other
+    workflows keep running and many contexts can wait at once. It returns
+    None when no answer can be given here: the orchestrator then pauses the
+    workflow and sends the question upstream as ``input_required``, and the
+    next message of the context resumes the paused node with the answer.
+    """
+
+    @abstractmethod
+    async def ask(self, context_id: str, question: str) -> str | None:
+        raise NotImplementedError
+
+
+class UpstreamInputProvider(HumanInputProvider):
+    """Always hands the question to the upstream A2A client, for served orchestrators."""
+
+    async def ask(self, context_id: str, question: str) -> str | None:
+        return None
+
+
+class ConsoleInputProvider(HumanInputProvider):
+    """Reads the answer from the console in a worker thread, one question at a time."""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+
+    async def ask(self, context_id: str, question: str) -> str | None:
+        # Questions of concurrent workflows must not interleave on the terminal
+        async with self._lock:
+            return await asyncio.to_thread(
+                input, f"❓ Agent responded: {question}\n💬 Your response: "
+            )
+
+
+class QueueInputProvider(HumanInputProvider):
+    """Questions wait on per context queues until ``answer`` is called, e.g. from a web UI.
+
+    Args:
+        timeout: Seconds to wait for an answer before sending the question upstream, None waits forever.
+    """
+
+    def __init__(self, timeout: float | None = None):
+        self.timeout = timeout
+        self._answers: dict[str, asyncio.Queue] = {}
+        self._pending: dict[str, str] = {}
+
+    def pending(self) -> dict[str, str]:
+        """Questions waiting for an answer, keyed by context id."""
+        return dict(self._pending)
+
+    def answer(self, context_id: str, text: str) -> None:
+        self._answers.setdefault(context_id, asyncio.Queue()).put_nowait(text)
+
+    async def ask(self, context_id: str, question: str) -> str | None:
+        answers = self._answers.setdefault(context_id, asyncio.Queue())
+        self._pending[context_id] = question
+        try:
+            return await asyncio.wait_for(answers.get(), self.timeout)
+        except asyncio.TimeoutError:
+            logger.info(f"No answer for context {context_id} in {self.timeout}s, asking upstream")
+            return None
+        finally:
+            self._pending.pop(context_id, None)
+            if answers.empty():
+                self._answers.pop(context_id, None)
+
+
+class ScriptedInputProvider(HumanInputProvider):
+    """Answers questions in order from a script, for batch runs without a user.
+
+    The script is a JSON list of answers shared by all contexts, or an object
+    mapping context ids to their lists of answers, with "*" for the others.
+    Once a context's answers run out, ``default`` is used.
+
+    Args:
+        script: Path of the JSON answer file, or the answers themselves.
+        default: Answer once the script runs out, None sends the question upstream.
+    """
+
+    def __init__(self, script: str | Path | list | dict, default: str | None = None):
+        if isinstance(script, (str, Path)):
+            script = json.loads(Path(script).read_text())
+        if isinstance(script, list):
+            script = {"*": script}
+        self._answers = {context_id: deque(answers) for context_id, answers in script.items()}
+        self.default = default
+
+    async def ask(self, context_id: str, question: str) -> str | None:
+        answers = self._answers.get(context_id, self._answers.get("*"))
+        if answers:
+            answer = answers.popleft()
+        else:
+            answer = self.default
+        logger.info(f"Scripted answer for context {context_id}: {question} -> {answer}")
+        return answer
@@ -0,0 +1,42 @@
+import asyncio
+import json
+
+import pytest
+
+from automa_ai.common.human_input import QueueInputProvider, ScriptedInputProvider
+
+
+class TestHumanInput:
+    """Test cases for answering questions of paused workflow nodes."""
+
+    @pytest.mark.asyncio
+    async def test_many_contexts_wait_at_once(self):
+        provider = QueueInputProvider()
+        asks = [
+            asyncio.create_task(provider.ask(context_id, f"Which climate zone for {context_id}?"))
+            for context_id in ("a", "b", "c")
+        ]
+        await asyncio.sleep(0)
+        assert sorted(provider.pending()) == ["a", "b", "c"]
+        provider.answer("b", "4A")
+        provider.answer("a", "2A")
+        provider.answer("c", "6B")
+        assert await asyncio.gather(*asks) == ["2A", "4A", "6B"]
+        assert provider.pending() == {}
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_asks_upstream(self):
+        provider = QueueInputProvider(timeout=0.01)
+        assert await provider.ask("a", "Which model file?") is None
+        assert provider.pending() == {}
+
+    @pytest.mark.asyncio
+    async def test_scripted_answers(self, tmp_path):
+        script = tmp_path / "answers.json"
+        script.write_text(json.dumps({"office": ["4A", "yes"], "*": ["no"]}))
+        provider = ScriptedInputProvider(script, default="skip")
+        assert await provider.ask("office", "Climate zone?") == "4A"
+        assert await provider.ask("office", "Add daylighting?") == "yes"
+        assert await provider.ask("office", "Anything else?") == "skip"
+        assert await provider.ask("school", "Add daylighting?") == "no"
+        assert await ScriptedInputProvider([]).ask("school", "Climate zone?") is None
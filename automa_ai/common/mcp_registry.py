@@ -1,6 +1,6 @@
 # Configure logging
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from multiprocessing import Process
 from typing import Dict, List
 
@@ -18,6 +18,8 @@ class MCPServerConfig:
     serve: callable
     transport: str = "sse"
     agent_cards_dir: str = "/automa_ai"
+    # Extra keyword arguments forwarded to serve (e.g. watch=True for the agent cards server)
+    serve_kwargs: dict = field(default_factory=dict)
 
 
 class MCPServerManager:
@@ -56,6 +58,7 @@ class MCPServerManager:
             process = Process(
                 target=config.serve,
                 args=(config.host, config.port, config.transport, config.agent_cards_dir),
+                kwargs=config.serve_kwargs,
                 daemon=True,
                 name=f"mcp-{name}",
             )
@@ -63,6 +66,7 @@ class MCPServerManager:
             process = Process(
                 target=config.serve,
                 args=(config.host, config.port, config.transport),
+                kwargs=config.serve_kwargs,
                 daemon=True,
                 name=f"mcp-{name}",
             )
@@ -35,6 +35,7 @@ Before each response, reason through:
 3. How should i naturally ask for this information? [Formulate question]
 4. If I have all the information I need, I should now proceed to generating the output
 
+Each task lists in "depends_on" the ids of the tasks it needs, tasks that do not depend on each other run in parallel.
 Your output should follow this example format. Make sure the output is a valid JSON using double quotes only. 
 DO NOT add anything else apart from the JSON format below.
 {
@@ -49,12 +50,14 @@ DO NOT add anything else apart from the JSON format below.
         {
             "id": 1,
             "description": "Load a small office building template.",
-            "status": "pending"
+            "status": "pending",
+            "depends_on": []
         }, 
         {
             "id": 2,
             "description": "Modify the window to wall ratio of the small office building",
-            "status": "pending"
+            "status": "pending",
+            "depends_on": [1]
         }
     ]
 }
@@ -103,6 +106,22 @@ MODELER_SUMMARY_COT_INSTRUCTIONS = """
 
 """
 
+RESULTS_MAP_SUMMARY_PROMPT = """
+    You are a building energy modeling assistant. The results below are one part of the outputs of a
+    multi-agent workflow run for the user request in triple backticks.
+
+    ## User request:
+    ```{query}```
+
+    ## Workflow results (part):
+    ```{results}```
+
+    ## Instructions:
+    Summarize these results in at most a few short paragraphs. Keep every building parameter, measure,
+    number, unit, file path and error message that matters for the user request, and drop everything else.
+    Only use information from the results above.
+"""
+
 QA_COT_PROMPT = """
 You are an AI assistant that answers questions about building energy modeling details based on provided JSON context and the conversation history. Follow this step-by-step reasoning process:
 
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import random
+import time
+from typing import AsyncIterable, AsyncIterator, Callable
+
+import httpx
+from a2a.client.errors import A2AClientHTTPError
+from a2a.types import AgentCard
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 8.0
+# Longest silence tolerated between two chunks of an agent stream
+DEFAULT_IDLE_TIMEOUT = 300.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+
+class CircuitBreaker:
+    """Tracks failing agents by URL and fails fast while they are unhealthy.
+
+    A URL's circuit opens after ``failure_threshold`` consecutive failures and
+    rejects calls for ``reset_timeout`` seconds. After that it is half open:
+    calls go through again, a success closes the circuit and a failure opens it
+    for another ``reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+
+    def state(self, url: str) -> str:
+        """Returns "closed", "open" or "half_open"."""
+        opened_at = self._opened_at.get(url)
+        if opened_at is None:
+            return "closed"
+        if self._clock() - opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self, url: str) -> bool:
+        return self.state(url) != "open"
+
+    def record_success(self, url: str) -> None:
+        if url in self._opened_at:
+            logger.info(f"Circuit for agent {url} closed")
+        self._failures.pop(url, None)
+        self._opened_at.pop(url, None)
+
+    def record_failure(self, url: str) -> None:
+        self._failures[url] = self._failures.get(url, 0) + 1
+        if self._failures[url] >= self.failure_threshold:
+            if self.state(url) != "open":
+                logger.warning(
+                    f"Circuit for agent {url} opened after {self._failures[url]} failures"
+                )
+            self._opened_at[url] = self._clock()
+
+    def stats(self) -> dict:
+        return {url: self.state(url) for url in {*self._failures, *self._opened_at}}
+
+
+class ResiliencePolicy:
+    """Timeouts, retries and circuit breaking applied to every agent call of a workflow node.
+
+    Args:
+        timeout: Deadline in seconds for one call to an agent, None for no deadline.
+            ``WorkflowNode.timeout`` overrides it per node.
+        agent_timeouts: Deadlines per agent, keyed by agent card name or URL.
+        idle_timeout: Longest wait in seconds for the next chunk of a stream.
+        retries: Retries of a call that failed with a transport error or timed
+            out before its first chunk. Calls are never retried once the agent
+            has streamed something, the chunks are already forwarded.
+        backoff_base: First backoff in seconds, doubled on every retry.
+        backoff_max: Upper bound of the backoff.
+        reroute: When an agent stays unreachable or its circuit is open, send
+            the task to the next best matching agent instead of failing.
+        reroute_candidates: Number of matches fetched when looking for another agent.
+        breaker: Circuit breaker shared by all nodes, a new one by default.
+    """
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        agent_timeouts: dict[str, float] | None = None,
+        idle_timeout: float | None = DEFAULT_IDLE_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        reroute: bool = True,
+        reroute_candidates: int = 3,
+        breaker: CircuitBreaker | None = None,
+        rng: Callable[[], float] = random.random,
+    ):
+        if retries < 0:
+            raise ValueError("retries must not be negative")
+        self.timeout = timeout
+        self.agent_timeouts = agent_timeouts or {}
+        self.idle_timeout = idle_timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.reroute = reroute
+        self.reroute_candidates = reroute_candidates
+        self.breaker = breaker or CircuitBreaker()
+        self._rng = rng
+
+    def timeout_for(self, agent_card: AgentCard, node_timeout: float | None = None) -> float | None:
+        """The call deadline: the node's, else the agent's, else the default."""
+        if node_timeout is not None:
+            return node_timeout
+        for key in (agent_card.name, agent_card.url):
+            if key in self.agent_timeouts:
+                return self.agent_timeouts[key]
+        return self.timeout
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before retry number attempt (from 0), with full jitter."""
+        return self._rng() * min(self.backoff_max, self.backoff_base * 2**attempt)
+
+    @staticmethod
+    def is_transient(error: BaseException) -> bool:
+        """True for errors worth retrying: timeouts, network errors and 408, 429 and 5xx responses."""
+        if isinstance(error, (TimeoutError, httpx.TransportError)):
+            return True
+        if isinstance(error, A2AClientHTTPError):
+            return error.status_code in (408, 429) or error.status_code >= 500
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            return status_code in (408, 429) or status_code >= 500
+        return False
+
+
+async def iterate_with_timeout(
+    stream: AsyncIterable, timeout: float | None = None, idle_timeout: float | None = None
+) -> AsyncIterator:
+    """Yields the items of stream, raising TimeoutError past the deadline or a silent idle period.
+
+    Only the wait for the next item is timed, not the time the consumer spends
+    on an item.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    iterator = aiter(stream)
+    try:
+        while True:
+            limits = [idle_timeout] if idle_timeout is not None else []
+            if deadline is not None:
+                limits.append(deadline - loop.time())
+            try:
+                async with asyncio.timeout(min(limits) if limits else None):
+                    item = await anext(iterator)
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+
+
+_policy_settings: dict = {}
+_resilience_policy: ResiliencePolicy | None = None
+
+
+def configure_resilience(**settings) -> None:
+    """Sets the ResiliencePolicy keyword arguments and replaces the shared policy."""
+    global _resilience_policy
+    _policy_settings.clear()
+    _policy_settings.update(settings)
+    _resilience_policy = None
+
+
+def get_resilience_policy() -> ResiliencePolicy:
+    """Returns the process wide policy, so circuit state is shared by all workflows."""
+    global _resilience_policy
+    if _resilience_policy is None:
+        _resilience_policy = ResiliencePolicy(**_policy_settings)
+    return _resilience_policy
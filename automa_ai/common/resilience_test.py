@@ -0,0 +1,189 @@
+import asyncio
+
+import httpx
+import pytest
+from a2a.client.errors import A2AClientHTTPError
+from a2a.types import AgentCapabilities, AgentCard, TaskState
+
+from automa_ai.common import resilience
+from automa_ai.common.resilience import (
+    CircuitBreaker,
+    ResiliencePolicy,
+    configure_resilience,
+    iterate_with_timeout,
+)
+from automa_ai.common.routing_cache import routing_cache
+from automa_ai.common.workflow import WorkflowNode
+from automa_ai.common.workflow_test import status_chunk
+
+
+def agent_card(name: str, port: int) -> AgentCard:
+    return AgentCard(
+        name=name,
+        description=name,
+        url=f"http://localhost:{port}/",
+        version="0.0.1",
+        capabilities=AgentCapabilities(streaming=True),
+        defaultInputModes=["text"],
+        defaultOutputModes=["text"],
+        skills=[],
+    )
+
+
+PRIMARY = agent_card("Energy Simulation Agent", 10101)
+BACKUP = agent_card("Energy Simulation Backup Agent", 10102)
+
+
+class ScriptedNode(WorkflowNode):
+    """Workflow node whose agents follow a script instead of being called over HTTP.
+
+    ``behaviours`` maps an agent URL to a list of calls, each one either an
+    exception raised before the first chunk, "hang", or "partial" (one chunk,
+    then a network error). Calls past the end of the list succeed.
+    """
+
+    def __init__(self, behaviours: dict, alternative: AgentCard | None = None):
+        super().__init__("run annual simulation")
+        self.agent_card = PRIMARY
+        self.behaviours = behaviours
+        self.alternative = alternative
+        self.calls = []
+
+    async def find_alternative_agent(self, exclude):
+        if self.alternative is not None and self.alternative.url not in exclude:
+            return self.alternative
+        return None
+
+    async def send_message(self, agent_card, query, task_id, context_id, blackboard):
+        self.calls.append(agent_card.name)
+        script = self.behaviours.get(agent_card.url, [])
+        behaviour = script.pop(0) if script else None
+        if behaviour == "hang":
+            await asyncio.sleep(10)
+        if behaviour == "partial":
+            yield status_chunk(TaskState.working, "meshing")
+            raise httpx.ReadError("connection reset")
+        if isinstance(behaviour, Exception):
+            raise behaviour
+        yield status_chunk(TaskState.completed, agent_card.name)
+
+
+async def run(node: WorkflowNode) -> list:
+    return [chunk async for chunk in node.run_node("query", "task", "context", {})]
+
+
+def last_state(chunks):
+    return chunks[-1].root.result.status.state
+
+
+@pytest.fixture
+def policy():
+    configure_resilience(backoff_base=0, idle_timeout=0.05, retries=2)
+    routing_cache.put("run annual simulation", PRIMARY)
+    yield resilience.get_resilience_policy()
+    configure_resilience()
+    routing_cache.invalidate()
+
+
+class TestCircuitBreaker:
+    """Test cases for the per agent circuit breaker."""
+
+    def test_opens_and_half_opens(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+        breaker.record_failure(PRIMARY.url)
+        assert breaker.allow(PRIMARY.url)
+        breaker.record_failure(PRIMARY.url)
+        assert breaker.state(PRIMARY.url) == "open"
+        now[0] = 11.0
+        assert breaker.state(PRIMARY.url) == "half_open"
+        breaker.record_failure(PRIMARY.url)
+        assert not breaker.allow(PRIMARY.url)
+        now[0] = 22.0
+        breaker.record_success(PRIMARY.url)
+        assert breaker.state(PRIMARY.url) == "closed"
+
+
+class TestResiliencePolicy:
+    """Test cases for timeouts, backoff and error classification."""
+
+    def test_timeout_precedence(self):
+        policy = ResiliencePolicy(timeout=60, agent_timeouts={PRIMARY.name: 600})
+        assert policy.timeout_for(PRIMARY) == 600
+        assert policy.timeout_for(BACKUP) == 60
+        assert policy.timeout_for(PRIMARY, node_timeout=5) == 5
+
+    def test_backoff_is_capped_and_jittered(self):
+        policy = ResiliencePolicy(backoff_base=1, backoff_max=4, rng=lambda: 0.5)
+        assert [policy.backoff(attempt) for attempt in range(4)] == [0.5, 1, 2, 2]
+
+    def test_transient_errors(self):
+        assert ResiliencePolicy.is_transient(TimeoutError())
+        assert ResiliencePolicy.is_transient(httpx.ConnectError("refused"))
+        assert ResiliencePolicy.is_transient(A2AClientHTTPError(503, "unavailable"))
+        assert not ResiliencePolicy.is_transient(A2AClientHTTPError(400, "bad request"))
+        assert not ResiliencePolicy.is_transient(ValueError())
+
+    @pytest.mark.asyncio
+    async def test_idle_timeout(self):
+        async def slow():
+            yield 1
+            await asyncio.sleep(1)
+            yield 2
+
+        items = []
+        with pytest.raises(TimeoutError):
+            async for item in iterate_with_timeout(slow(), idle_timeout=0.05):
+                items.append(item)
+        assert items == [1]
+
+
+class TestResilientNode:
+    """Test cases for retrying and re-routing agent calls of a workflow node."""
+
+    @pytest.mark.asyncio
+    async def test_transport_error_is_retried(self, policy):
+        node = ScriptedNode({PRIMARY.url: [httpx.ConnectError("refused"), "hang"]})
+        chunks = await run(node)
+        assert node.calls == [PRIMARY.name] * 3
+        assert last_state(chunks) == TaskState.completed
+        assert policy.breaker.state(PRIMARY.url) == "closed"
+
+    @pytest.mark.asyncio
+    async def test_reroutes_after_retries(self, policy):
+        node = ScriptedNode({PRIMARY.url: ["hang"] * 3}, alternative=BACKUP)
+        chunks = await run(node)
+        assert node.calls == [PRIMARY.name] * 3 + [BACKUP.name]
+        assert chunks[-1].root.result.status.message.parts[0].root.text == BACKUP.name
+        assert node.agent_card is BACKUP
+        # Other nodes with the task are routed to the alternative as well
+        assert await WorkflowNode("Run annual simulation").resolve_agent() is BACKUP
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_reroutes(self, policy):
+        for _ in range(policy.breaker.failure_threshold):
+            policy.breaker.record_failure(PRIMARY.url)
+        node = ScriptedNode({}, alternative=BACKUP)
+        chunks = await run(node)
+        assert node.calls == [BACKUP.name]
+        assert last_state(chunks) == TaskState.completed
+        assert routing_cache.get(node.task) is BACKUP
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, policy):
+        for _ in range(policy.breaker.failure_threshold):
+            policy.breaker.record_failure(PRIMARY.url)
+        node = ScriptedNode({})
+        chunks = await run(node)
+        assert node.calls == []
+        assert last_state(chunks) == TaskState.failed
+
+    @pytest.mark.asyncio
+    async def test_no_retry_after_first_chunk(self, policy):
+        node = ScriptedNode({PRIMARY.url: ["partial"]}, alternative=BACKUP)
+        chunks = await run(node)
+        assert node.calls == [PRIMARY.name]
+        assert [chunk.root.result.status.state for chunk in chunks] == [
+            TaskState.working,
+            TaskState.failed,
+        ]
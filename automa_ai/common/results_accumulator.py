@@ -0,0 +1,180 @@
+import json
+import logging
+from typing import Any, Callable
+
+from automa_ai.common.artifact_store import ArtifactStore, get_artifact_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_BUDGET = 6000
+# Token budget of the results part of a summary prompt, by model name prefix.
+# The longest matching prefix wins, other models get DEFAULT_TOKEN_BUDGET.
+MODEL_TOKEN_BUDGETS = {
+    "llama3.1": 6000,
+    "llama3.2": 6000,
+    "qwen2.5": 12000,
+    "qwen3": 12000,
+    "mistral": 12000,
+    "gpt-4o": 48000,
+    "gpt-4.1": 48000,
+    "claude": 48000,
+}
+
+
+def token_budget_for(model_name: str | None, budgets: dict[str, int] | None = None) -> int:
+    budgets = MODEL_TOKEN_BUDGETS if budgets is None else budgets
+    matches = [prefix for prefix in budgets if model_name and model_name.startswith(prefix)]
+    if not matches:
+        return DEFAULT_TOKEN_BUDGET
+    return budgets[max(matches, key=len)]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about four characters per token for English and JSON."""
+    return len(text) // 4 + 1
+
+
+def result_text(result: Any) -> str:
+    """Text of a workflow result: strings as is, A2A parts and artifacts and other values as JSON."""
+    if isinstance(result, str):
+        return result
+    if hasattr(result, "model_dump"):
+        result = result.model_dump(mode="json", exclude_none=True)
+    return json.dumps(result, default=str, ensure_ascii=False)
+
+
+def excerpt(text: str, tokens: int, count_tokens: Callable[[str], int] = estimate_tokens) -> str:
+    """Head and tail of text within about tokens tokens, with a marker where text was cut."""
+    if count_tokens(text) <= tokens:
+        return text
+    keep = max(tokens * 4 // 2, 16)
+    omitted = count_tokens(text[keep:-keep])
+    return f"{text[:keep]} …[{omitted} tokens omitted]… {text[-keep:]}"
+
+
+class ResultsAccumulator:
+    """Workflow results kept within a token budget for the summary prompt.
+
+    Entries are added in order. When their text exceeds ``token_budget``,
+    the oldest entries are compacted first: an entry is cut to an excerpt of
+    ``compact_tokens`` and its full text is written to the artifact store;
+    once every old entry is compacted, the two oldest compacted entries are
+    merged into one excerpt. The newest ``keep_recent`` entries are left
+    untouched. ``chunks`` reads the full texts back for a map-reduce summary.
+
+    Args:
+        token_budget: Tokens the results may take in the summary prompt, see token_budget_for.
+        keep_recent: Newest entries never compacted.
+        compact_tokens: Size of a compacted entry, a sixteenth of the budget by default.
+        count_tokens: Token counter, e.g. a chat model's get_num_tokens.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        keep_recent: int = 4,
+        compact_tokens: int | None = None,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+        artifact_store: ArtifactStore | None = None,
+    ):
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.compact_tokens = compact_tokens or max(32, token_budget // 16)
+        self.count_tokens = count_tokens
+        self.artifact_store = artifact_store or get_artifact_store()
+        # {"text": prompt text, "tokens": its tokens, "handles": artifacts of the full texts if cut}
+        self.entries: list[dict] = []
+        # Tokens of all results before compaction
+        self.total_tokens = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def tokens(self) -> int:
+        return sum(entry["tokens"] for entry in self.entries)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.total_tokens = 0
+
+    def add(self, result: Any) -> None:
+        if hasattr(result, "model_dump"):
+            result = result.model_dump(mode="json", exclude_none=True)
+        # Large values passed by reference are summarized too
+        text = result_text(self.artifact_store.resolve(result))
+        tokens = self.count_tokens(text)
+        self.entries.append({"text": text, "tokens": tokens, "handles": []})
+        self.total_tokens += tokens
+        self._compact()
+
+    def load(self, entries: list) -> None:
+        """Restores entries saved from ``entries``, raw results of older checkpoints are added."""
+        for entry in entries:
+            if isinstance(entry, dict) and entry.keys() == {"text", "tokens", "handles"}:
+                self.entries.append(entry)
+                self.total_tokens += entry["tokens"]
+            else:
+                self.add(entry)
+        self._compact()
+
+    def _compact(self) -> None:
+        while self.tokens > self.token_budget:
+            old = self.entries[: max(len(self.entries) - self.keep_recent, 0)]
+            entry = next((e for e in old if not e["handles"] and e["tokens"] > self.compact_tokens), None)
+            if entry is not None:
+                entry["handles"] = [self.artifact_store.put_value(entry["text"])]
+                entry["text"] = excerpt(entry["text"], self.compact_tokens, self.count_tokens)
+                entry["tokens"] = self.count_tokens(entry["text"])
+                continue
+            if len(old) < 2:
+                logger.info(f"Recent results alone exceed the token budget of {self.token_budget}")
+                return
+            first, second = old[0], old[1]
+            merged = excerpt(f"{first['text']}\n{second['text']}", self.compact_tokens, self.count_tokens)
+            handles = (first["handles"] or [self.artifact_store.put_value(first["text"])]) + (
+                second["handles"] or [self.artifact_store.put_value(second["text"])]
+            )
+            self.entries[:2] = [
+                {"text": merged, "tokens": self.count_tokens(merged), "handles": handles}
+            ]
+
+    def prompt_results(self) -> list[str]:
+        """Texts of the results for a single summary prompt, within the token budget."""
+        return [entry["text"] for entry in self.entries]
+
+    def full_texts(self) -> list[str]:
+        texts = []
+        for entry in self.entries:
+            if not entry["handles"]:
+                texts.append(entry["text"])
+                continue
+            for handle in entry["handles"]:
+                try:
+                    texts.append(self.artifact_store.get_value(handle))
+                except KeyError:
+                    logger.warning(f"Result {handle} is missing, using its excerpt")
+                    texts.append(entry["text"])
+        return texts
+
+    def chunks(self, chunk_tokens: int | None = None) -> list[list[str]]:
+        """The full result texts packed in order into chunks of at most chunk_tokens (the budget)."""
+        return pack_chunks(self.full_texts(), chunk_tokens or self.token_budget, self.count_tokens)
+
+
+def pack_chunks(
+    texts: list[str], chunk_tokens: int, count_tokens: Callable[[str], int] = estimate_tokens
+) -> list[list[str]]:
+    """Packs texts in order into chunks of at most chunk_tokens, cutting texts longer than a chunk."""
+    chunks, current, current_tokens = [], [], 0
+    for text in texts:
+        text = excerpt(text, chunk_tokens, count_tokens)
+        tokens = count_tokens(text)
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,54 @@
+from automa_ai.common.artifact_store import ArtifactStore
+from automa_ai.common.results_accumulator import ResultsAccumulator, token_budget_for
+
+
+def accumulator(tmp_path, **kwargs) -> ResultsAccumulator:
+    return ResultsAccumulator(artifact_store=ArtifactStore(tmp_path), **kwargs)
+
+
+def result(index: int, size: int = 400) -> str:
+    return f"result {index}: " + "x" * size
+
+
+class TestResultsAccumulator:
+    """Test cases for token budgeted workflow results."""
+
+    def test_older_results_are_compacted_within_budget(self, tmp_path):
+        results = accumulator(tmp_path, token_budget=500, keep_recent=2)
+        for index in range(30):
+            results.add(result(index))
+        assert results.tokens <= 500
+        assert results.total_tokens > 500
+        # The newest results are kept whole
+        assert results.prompt_results()[-2:] == [result(28), result(29)]
+
+    def test_full_texts_are_recoverable(self, tmp_path):
+        results = accumulator(tmp_path, token_budget=500, keep_recent=2)
+        for index in range(30):
+            results.add(result(index))
+        assert results.full_texts() == [result(index) for index in range(30)]
+        chunks = results.chunks()
+        assert len(chunks) > 1
+        assert sum(chunks, []) == [result(index) for index in range(30)]
+
+    def test_load_round_trips(self, tmp_path):
+        results = accumulator(tmp_path, token_budget=500, keep_recent=2)
+        for index in range(10):
+            results.add(result(index))
+        results.add({"eui": 42.5, "units": "kBtu/ft2"})
+
+        restored = accumulator(tmp_path, token_budget=500, keep_recent=2)
+        restored.load(results.entries)
+        assert restored.prompt_results() == results.prompt_results()
+        assert restored.full_texts() == results.full_texts()
+
+        # Raw results of checkpoints saved before the accumulator
+        legacy = accumulator(tmp_path)
+        legacy.load(["simulation done", {"eui": 42.5}])
+        assert legacy.prompt_results() == ["simulation done", '{"eui": 42.5}']
+
+    def test_token_budget_for_model(self):
+        assert token_budget_for("llama3.1:8b") == 6000
+        assert token_budget_for("qwen2.5:14b") == 12000
+        assert token_budget_for("unknown") == 6000
+        assert token_budget_for("gpt-4o-mini", {"gpt-4": 8000, "gpt-4o": 64000}) == 64000
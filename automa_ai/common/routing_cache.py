@@ -0,0 +1,97 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from a2a.types import AgentCard
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_task(task: str) -> str:
+    """Normalizes task text for routing lookups (case and whitespace insensitive)."""
+    return " ".join(task.split()).lower()
+
+
+class RoutingCache:
+    """Process wide cache from normalized task text to the AgentCard it was routed to.
+
+    Entries expire ``ttl`` seconds after insertion (never when ttl is None). The
+    cache is cleared when the agent cards server reports a new index version
+    (see ``observe_version``) or when ``invalidate`` is called explicitly.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, AgentCard]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.index_version = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, task: str) -> AgentCard | None:
+        key = normalize_task(task)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or self._clock() - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, task: str, agent_card: AgentCard) -> None:
+        key = normalize_task(task)
+        with self._lock:
+            self._entries[key] = (self._clock(), agent_card)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, task: str | None = None) -> None:
+        """Drops one task, or every entry when task is None."""
+        with self._lock:
+            if task is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(normalize_task(task), None)
+            self.invalidations += 1
+
+    def observe_version(self, version: int | None) -> None:
+        """Records the card index version reported by the server, clearing stale routes on change."""
+        if version is None:
+            return
+        with self._lock:
+            changed = self.index_version is not None and version != self.index_version
+            self.index_version = version
+        if changed:
+            logger.info(f"Agent card index changed to version {version}, clearing routing cache")
+            self.invalidate()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "index_version": self.index_version,
+        }
+
+
+routing_cache = RoutingCache()
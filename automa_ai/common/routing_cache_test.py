@@ -0,0 +1,53 @@
+import pytest
+from a2a.types import AgentCapabilities, AgentCard
+
+from automa_ai.common.routing_cache import RoutingCache
+
+
+def make_card(name: str) -> AgentCard:
+    return AgentCard(
+        name=name,
+        description=f"{name} description",
+        url="http://localhost:10101/",
+        version="0.0.1",
+        capabilities=AgentCapabilities(streaming=True),
+        defaultInputModes=["text"],
+        defaultOutputModes=["text"],
+        skills=[],
+    )
+
+
+class TestRoutingCache:
+    """Test cases for the task to agent routing cache."""
+
+    def test_hit_on_normalized_task(self):
+        cache = RoutingCache()
+        card = make_card("Energy Simulation Agent")
+        cache.put("Run annual  simulation", card)
+        assert cache.get("run annual simulation") is card
+        assert cache.get("load the model") is None
+        assert cache.stats()["hit_rate"] == pytest.approx(0.5)
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = RoutingCache(ttl=60.0, clock=lambda: now[0])
+        cache.put("task", make_card("a"))
+        now[0] = 61.0
+        assert cache.get("task") is None
+
+    def test_version_change_invalidates(self):
+        cache = RoutingCache()
+        cache.observe_version(1)
+        cache.put("task", make_card("a"))
+        cache.observe_version(1)
+        assert cache.get("task") is not None
+        cache.observe_version(2)
+        assert cache.get("task") is None
+        assert cache.stats()["invalidations"] == 1
+
+    def test_bounded_size(self):
+        cache = RoutingCache(maxsize=2)
+        for task in ("a", "b", "c"):
+            cache.put(task, make_card(task))
+        assert len(cache) == 2
+        assert cache.get("a") is None
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Callable
+
+from a2a.types import AgentCard
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GLOBAL_LIMIT = 16
+# Wait times kept per priority for the percentiles in stats
+WAIT_TIME_WINDOW = 1000
+
+
+class Priority(IntEnum):
+    """Priority classes of agent invocations, lower values are served first."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BATCH = 2
+
+
+class _Waiter:
+    __slots__ = ("future", "agent", "backend", "context_id", "priority", "enqueued_at")
+
+    def __init__(self, future, agent, backend, context_id, priority, enqueued_at):
+        self.future = future
+        self.agent = agent
+        self.backend = backend
+        self.context_id = context_id
+        self.priority = priority
+        self.enqueued_at = enqueued_at
+
+
+class AgentScheduler:
+    """Admits agent invocations under global, per agent and per LLM backend concurrency limits.
+
+    Waiting invocations are served by priority class first. Within a class,
+    contexts take turns, so one workflow with many ready nodes cannot starve
+    the others, and each context's invocations keep their order. A waiter
+    blocked by its agent or backend limit does not hold up waiters for other
+    agents.
+
+    Args:
+        global_limit: Invocations running at once across all agents.
+        agent_limits: Limits keyed by agent card name.
+        backend_limits: Limits keyed by backend name, e.g. "ollama".
+        agent_backends: Backend of each agent, keyed by agent card name.
+            Agents without a backend only count against the other limits.
+        default_agent_limit: Limit of agents missing from agent_limits, None for no limit.
+    """
+
+    def __init__(
+        self,
+        global_limit: int = DEFAULT_GLOBAL_LIMIT,
+        agent_limits: dict[str, int] | None = None,
+        backend_limits: dict[str, int] | None = None,
+        agent_backends: dict[str, str] | None = None,
+        default_agent_limit: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if global_limit < 1:
+            raise ValueError("global_limit must be at least 1")
+        self.global_limit = global_limit
+        self.agent_limits = agent_limits or {}
+        self.backend_limits = backend_limits or {}
+        self.agent_backends = agent_backends or {}
+        self.default_agent_limit = default_agent_limit
+        self._clock = clock
+        self._running = 0
+        self._running_agents: dict[str, int] = {}
+        self._running_backends: dict[str, int] = {}
+        # priority -> context id -> waiters of the context in arrival order
+        self._queues: dict[Priority, OrderedDict[str, deque[_Waiter]]] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self._wait_times: dict[Priority, deque[float]] = {
+            priority: deque(maxlen=WAIT_TIME_WINDOW) for priority in Priority
+        }
+        self._admitted = {priority: 0 for priority in Priority}
+
+    def _agent_limit(self, agent: str | None) -> int | None:
+        if agent is None:
+            return None
+        return self.agent_limits.get(agent, self.default_agent_limit)
+
+    def _fits(self, waiter: _Waiter) -> bool:
+        agent_limit = self._agent_limit(waiter.agent)
+        if agent_limit is not None and self._running_agents.get(waiter.agent, 0) >= agent_limit:
+            return False
+        backend_limit = self.backend_limits.get(waiter.backend)
+        if backend_limit is not None and self._running_backends.get(waiter.backend, 0) >= backend_limit:
+            return False
+        return True
+
+    def _next_waiter(self) -> _Waiter | None:
+        for priority in Priority:
+            contexts = self._queues[priority]
+            for context_id, waiters in contexts.items():
+                for waiter in waiters:
+                    # A cancelled waiter is removed by its own task
+                    if not waiter.future.done() and self._fits(waiter):
+                        waiters.remove(waiter)
+                        if waiters:
+                            # The context goes to the back of the rotation
+                            contexts.move_to_end(context_id)
+                        else:
+                            del contexts[context_id]
+                        return waiter
+        return None
+
+    def _admit(self, waiter: _Waiter) -> None:
+        self._running += 1
+        if waiter.agent is not None:
+            self._running_agents[waiter.agent] = self._running_agents.get(waiter.agent, 0) + 1
+        if waiter.backend is not None:
+            self._running_backends[waiter.backend] = self._running_backends.get(waiter.backend, 0) + 1
+        self._wait_times[waiter.priority].append(self._clock() - waiter.enqueued_at)
+        self._admitted[waiter.priority] += 1
+
+    def _release(self, waiter: _Waiter) -> None:
+        self._running -= 1
+        if waiter.agent is not None:
+            self._running_agents[waiter.agent] -= 1
+        if waiter.backend is not None:
+            self._running_backends[waiter.backend] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._running < self.global_limit:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            self._admit(waiter)
+            waiter.future.set_result(None)
+
+    def _discard(self, waiter: _Waiter) -> None:
+        contexts = self._queues[waiter.priority]
+        waiters = contexts.get(waiter.context_id)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del contexts[waiter.context_id]
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        agent_card: AgentCard | None,
+        context_id: str | None = None,
+        priority: Priority = Priority.NORMAL,
+    ):
+        """Waits until the invocation may run and holds its place in the limits until the block exits.
+
+        Yields:
+            Seconds spent waiting.
+        """
+        agent = agent_card.name if agent_card is not None else None
+        waiter = _Waiter(
+            asyncio.get_running_loop().create_future(),
+            agent,
+            self.agent_backends.get(agent),
+            context_id or "",
+            Priority(priority),
+            self._clock(),
+        )
+        self._queues[waiter.priority].setdefault(waiter.context_id, deque()).append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just before the cancellation
+                self._release(waiter)
+            else:
+                self._discard(waiter)
+            raise
+        waited = self._clock() - waiter.enqueued_at
+        if waited > 1.0:
+            logger.info(f"Agent {agent} waited {waited:.1f}s for a slot, context {context_id}")
+        try:
+            yield waited
+        finally:
+            self._release(waiter)
+
+    def queue_depth(self) -> int:
+        return sum(
+            len(waiters) for contexts in self._queues.values() for waiters in contexts.values()
+        )
+
+    def stats(self) -> dict:
+        """Running and queued invocations and wait time percentiles (seconds) per priority."""
+        priorities = {}
+        for priority in Priority:
+            wait_times = sorted(self._wait_times[priority])
+            priorities[priority.name.lower()] = {
+                "queued": sum(len(waiters) for waiters in self._queues[priority].values()),
+                "admitted": self._admitted[priority],
+                "wait_p50": wait_times[len(wait_times) // 2] if wait_times else 0.0,
+                "wait_p95": wait_times[int(len(wait_times) * 0.95)] if wait_times else 0.0,
+                "wait_max": wait_times[-1] if wait_times else 0.0,
+            }
+        return {
+            "running": self._running,
+            "queue_depth": self.queue_depth(),
+            "agents": {k: v for k, v in self._running_agents.items() if v},
+            "backends": {k: v for k, v in self._running_backends.items() if v},
+            "priorities": priorities,
+        }
+
+
+_scheduler_settings: dict = {}
+_agent_scheduler: AgentScheduler | None = None
+
+
+def configure_scheduler(**settings) -> None:
+    """Sets the AgentScheduler keyword arguments and replaces the shared scheduler."""
+    global _agent_scheduler
+    _scheduler_settings.clear()
+    _scheduler_settings.update(settings)
+    _agent_scheduler = None
+
+
+def get_agent_scheduler() -> AgentScheduler:
+    """Returns the process wide scheduler shared by all orchestrators."""
+    global _agent_scheduler
+    if _agent_scheduler is None:
+        _agent_scheduler = AgentScheduler(**_scheduler_settings)
+    return _agent_scheduler
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from automa_ai.common.scheduler import AgentScheduler, Priority
+from automa_ai.common.workflow import WorkflowGraph
+from automa_ai.common.workflow_test import FakeNode, build, drain
+
+
+def card(name: str):
+    return FakeNode(name, []).agent_card
+
+
+async def invoke(scheduler, order, label, agent="Energy Simulation Agent", context_id="c1",
+                 priority=Priority.NORMAL, hold=0.01):
+    async with scheduler.slot(card(agent), context_id, priority):
+        order.append(label)
+        await asyncio.sleep(hold)
+
+
+async def started(*coroutines) -> list[asyncio.Task]:
+    """Starts the coroutines in order, letting each one queue before the next."""
+    tasks = []
+    for coroutine in coroutines:
+        tasks.append(asyncio.create_task(coroutine))
+        await asyncio.sleep(0)
+    return tasks
+
+
+class TestAgentScheduler:
+    """Test cases for admitting agent invocations under limits and priorities."""
+
+    @pytest.mark.asyncio
+    async def test_priority_and_fairness(self):
+        scheduler = AgentScheduler(global_limit=1)
+        order = []
+        tasks = await started(
+            invoke(scheduler, order, "first", hold=0.05),
+            invoke(scheduler, order, "batch", context_id="sweep", priority=Priority.BATCH),
+            invoke(scheduler, order, "a1", context_id="a"),
+            invoke(scheduler, order, "a2", context_id="a"),
+            invoke(scheduler, order, "b1", context_id="b"),
+            invoke(scheduler, order, "chat", context_id="chat", priority=Priority.INTERACTIVE),
+        )
+        assert scheduler.queue_depth() == 5
+        await asyncio.gather(*tasks)
+        # Interactive first, contexts a and b take turns, batch last
+        assert order == ["first", "chat", "a1", "b1", "a2", "batch"]
+        stats = scheduler.stats()
+        assert stats["running"] == 0
+        assert stats["priorities"]["batch"]["admitted"] == 1
+        assert stats["priorities"]["batch"]["wait_max"] > 0
+
+    @pytest.mark.asyncio
+    async def test_agent_and_backend_limits(self):
+        scheduler = AgentScheduler(
+            global_limit=4,
+            agent_limits={"sim": 1},
+            backend_limits={"ollama": 2},
+            agent_backends={"sim": "ollama", "light": "ollama", "hvac": "ollama"},
+        )
+        order = []
+        tasks = await started(
+            invoke(scheduler, order, "sim1", agent="sim", hold=0.05),
+            invoke(scheduler, order, "sim2", agent="sim"),
+            invoke(scheduler, order, "light", agent="light", hold=0.05),
+            invoke(scheduler, order, "hvac", agent="hvac"),
+            invoke(scheduler, order, "geometry", agent="geometry"),
+        )
+        # sim2 waits for its agent, hvac for the backend, geometry is not held up by either
+        assert order == ["sim1", "light", "geometry"]
+        assert scheduler.stats()["backends"] == {"ollama": 2}
+        await asyncio.gather(*tasks)
+        assert sorted(order[3:]) == ["hvac", "sim2"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = AgentScheduler(global_limit=1)
+        order = []
+        holder, waiter = await started(
+            invoke(scheduler, order, "holder", hold=0.05), invoke(scheduler, order, "waiter")
+        )
+        waiter.cancel()
+        await asyncio.gather(holder, waiter, return_exceptions=True)
+        assert order == ["holder"]
+        assert scheduler.stats()["running"] == 0
+        assert scheduler.queue_depth() == 0
+
+    @pytest.mark.asyncio
+    async def test_workflow_nodes_share_limit(self):
+        scheduler = AgentScheduler(global_limit=1)
+        log = []
+        graph = WorkflowGraph(max_parallelism=4, scheduler=scheduler)
+        build(graph, log, [], a={}, b={}, c={})
+        await drain(graph)
+        assert [event for event, _ in log] == ["start", "end"] * 3
+        assert scheduler.stats()["priorities"]["normal"]["admitted"] == 3
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from automa_ai.common.checkpoint import CheckpointStore
+from automa_ai.common.human_input import HumanInputProvider
+from automa_ai.common.results_accumulator import ResultsAccumulator
+from automa_ai.common.scheduler import Priority
+from automa_ai.common.workflow import WorkflowGraph
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SESSIONS = 128
+DEFAULT_SESSION_TTL = 3600.0
+
+
+class OrchestratorSession:
+    """Workflow state of one context: graph, shared blackboard, results and query history.
+
+    ``lock`` is held while a request of the context runs its workflow, so two
+    requests of one context never drive the same graph at once while other
+    contexts run freely. ``priority`` and ``human_input`` override the
+    orchestrator's for this context only, e.g. for the queries of a batch.
+    """
+
+    def __init__(self, context_id: str, results: ResultsAccumulator | None = None):
+        self.context_id = context_id
+        self.graph: WorkflowGraph | None = None
+        self.results = results if results is not None else ResultsAccumulator()
+        # shared memory on task specs, data format shall come from planner's response
+        self.task_blackboard = {}
+        self.query_history = []
+        self.lock = asyncio.Lock()
+        # Kept by clear, they belong to the caller rather than to one workflow
+        self.priority: Priority | None = None
+        self.human_input: HumanInputProvider | None = None
+
+    @property
+    def busy(self) -> bool:
+        return self.lock.locked()
+
+    def clear(self) -> None:
+        self.graph = None
+        self.results.clear()
+        self.task_blackboard.clear()
+        self.query_history.clear()
+
+    def extra(self) -> dict:
+        """State stored with the workflow checkpoint, see CheckpointStore.save_extra."""
+        return {
+            "query_history": self.query_history,
+            "results": self.results.entries,
+            "task_blackboard": self.task_blackboard,
+        }
+
+
+class SessionStore:
+    """Bounded store of orchestrator sessions with LRU and idle time eviction.
+
+    Sessions idle for more than ``ttl`` seconds, and the least recently used
+    ones beyond ``maxsize``, are evicted. A session whose workflow is running
+    is never evicted, nor is the session just created, so the store may hold
+    more than ``maxsize`` sessions while they are all busy. With a ``spill_store``, an evicted session's graph and
+    state are written there first, so the context can be restored from it with
+    ``WorkflowGraph.from_checkpoint``. Without one the state of an evicted
+    session is lost. New sessions get their results accumulator from
+    ``results_factory``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAX_SESSIONS,
+        ttl: float | None = DEFAULT_SESSION_TTL,
+        spill_store: CheckpointStore | None = None,
+        results_factory: Callable[[], ResultsAccumulator] = ResultsAccumulator,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.spill_store = spill_store
+        self.results_factory = results_factory
+        self._clock = clock
+        # context id -> (last used, session), least recently used first
+        self._sessions: OrderedDict[str, tuple[float, OrchestratorSession]] = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, context_id: str) -> bool:
+        return context_id in self._sessions
+
+    def get(self, context_id: str) -> OrchestratorSession | None:
+        self._evict_expired()
+        entry = self._sessions.get(context_id)
+        if entry is None:
+            return None
+        self._sessions[context_id] = (self._clock(), entry[1])
+        self._sessions.move_to_end(context_id)
+        return entry[1]
+
+    def get_or_create(self, context_id: str) -> tuple[OrchestratorSession, bool]:
+        """Returns the session of a context and whether it was just created."""
+        session = self.get(context_id)
+        if session is not None:
+            return session, False
+        session = OrchestratorSession(context_id, self.results_factory())
+        self._sessions[context_id] = (self._clock(), session)
+        self._evict_overflow(keep=context_id)
+        return session, True
+
+    def discard(self, context_id: str) -> None:
+        self._sessions.pop(context_id, None)
+
+    def _evict_expired(self) -> None:
+        if self.ttl is None:
+            return
+        now = self._clock()
+        expired = [
+            context_id
+            for context_id, (last_used, session) in self._sessions.items()
+            if now - last_used > self.ttl and not session.busy
+        ]
+        for context_id in expired:
+            self._evict(context_id)
+
+    def _evict_overflow(self, keep: str) -> None:
+        """Evicts the least recently used idle sessions beyond maxsize, except the one of context keep."""
+        for context_id, (_, session) in list(self._sessions.items()):
+            if len(self._sessions) <= self.maxsize:
+                return
+            if context_id != keep and not session.busy:
+                self._evict(context_id)
+
+    def _evict(self, context_id: str) -> None:
+        _, session = self._sessions.pop(context_id)
+        self.evictions += 1
+        if self.spill_store is None or session.graph is None:
+            logger.info(f"Evicted session {context_id}")
+            return
+        if session.graph.checkpoint_store is None:
+            session.graph.attach_checkpoint_store(self.spill_store)
+        session.graph.checkpoint_store.save_extra(context_id, session.extra())
+        logger.info(f"Evicted session {context_id}, spilled to {session.graph.checkpoint_store.path}")
@@ -0,0 +1,74 @@
+import pytest
+
+from automa_ai.common.checkpoint import CheckpointStore
+from automa_ai.common.session_store import SessionStore
+from automa_ai.common.workflow import Status, WorkflowGraph
+from automa_ai.common.workflow_test import build
+
+
+class TestSessionStore:
+    """Test cases for per context orchestrator sessions."""
+
+    def test_sessions_are_isolated(self):
+        sessions = SessionStore()
+        alice, created = sessions.get_or_create("alice")
+        assert created
+        bob, _ = sessions.get_or_create("bob")
+        alice.query_history.append("add daylighting sensors")
+        assert bob.query_history == []
+        assert sessions.get_or_create("alice") == (alice, False)
+
+    def test_lru_eviction(self):
+        sessions = SessionStore(maxsize=2)
+        sessions.get_or_create("a")
+        sessions.get_or_create("b")
+        sessions.get("a")
+        sessions.get_or_create("c")
+        assert "b" not in sessions
+        assert "a" in sessions and "c" in sessions
+        assert sessions.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_new_session_is_kept_while_others_are_busy(self):
+        sessions = SessionStore(maxsize=2)
+        first, _ = sessions.get_or_create("a")
+        second, _ = sessions.get_or_create("b")
+        async with first.lock, second.lock:
+            new, created = sessions.get_or_create("c")
+            assert created
+            assert sessions.get("c") is new
+            assert len(sessions) == 3
+        # Back within maxsize once the others are idle again
+        sessions.get_or_create("d")
+        assert "a" not in sessions and "b" not in sessions
+        assert "c" in sessions and "d" in sessions
+
+    @pytest.mark.asyncio
+    async def test_ttl_spares_busy_sessions(self):
+        now = [0.0]
+        sessions = SessionStore(ttl=10, clock=lambda: now[0])
+        idle, _ = sessions.get_or_create("idle")
+        busy, _ = sessions.get_or_create("busy")
+        async with busy.lock:
+            now[0] = 11.0
+            assert sessions.get("idle") is None
+            assert sessions.get("busy") is busy
+
+    def test_evicted_session_is_spilled(self, tmp_path):
+        spill_store = CheckpointStore(tmp_path / "spill.sqlite")
+        sessions = SessionStore(maxsize=1, spill_store=spill_store)
+        session, _ = sessions.get_or_create("context")
+        session.graph = WorkflowGraph(workflow_id="context")
+        nodes = build(session.graph, [], [("plan", "a")], plan={}, a={})
+        nodes["plan"].state = Status.COMPLETED
+        session.graph.update_blackboard({"model_path": "/tmp/model.osm"})
+        session.query_history.append("run annual simulation")
+
+        sessions.get_or_create("other")
+        assert "context" not in sessions
+        restored = WorkflowGraph.from_checkpoint(spill_store, "context")
+        assert restored.execution_order() == [nodes["plan"].id, nodes["a"].id]
+        assert restored.nodes[nodes["plan"].id].state == Status.COMPLETED
+        assert restored.blackboard == {"model_path": "/tmp/model.osm"}
+        assert spill_store.load_extra("context")["query_history"] == ["run annual simulation"]
+        spill_store.close()
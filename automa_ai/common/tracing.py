@@ -0,0 +1,277 @@
+import contextvars
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import click
+
+logger = logging.getLogger(__name__)
+
+# Spans are exported to this JSONL file when it is set, tracing is off otherwise
+TRACE_FILE = os.environ.get("AUTOMA_AI_TRACE_FILE")
+# Recorded on every span, set it per agent process to tell the processes apart
+TRACE_SERVICE = os.environ.get("AUTOMA_AI_TRACE_SERVICE", "automa_ai")
+# Key of the W3C style trace context in A2A message metadata
+TRACEPARENT = "traceparent"
+
+
+class Span:
+    """A timed operation of a trace, e.g. routing a task, one agent call or one LLM turn."""
+
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "service",
+        "start",
+        "duration_ms",
+        "attributes",
+        "error",
+        "_started",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, service: str, attributes: dict):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.service = service
+        # Wall clock start, so spans of different processes line up
+        self.start = time.time()
+        self.duration_ms: float | None = None
+        self.attributes = attributes
+        self.error: str | None = None
+        self._started = time.perf_counter()
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def finish(self) -> None:
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "service": self.service,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class SpanContext:
+    """Trace and span id of a span in another process, the parent of local spans."""
+
+    __slots__ = ("trace_id", "span_id")
+
+    def __init__(self, trace_id: str, span_id: str):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+
+class JsonlSpanExporter:
+    """Appends finished spans to a JSONL file, one json object per span.
+
+    Several processes may append to the same file, each span is one write.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str, ensure_ascii=False) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+_current_span: contextvars.ContextVar[Span | SpanContext | None] = contextvars.ContextVar(
+    "automa_ai_span", default=None
+)
+_exporter: JsonlSpanExporter | None = JsonlSpanExporter(TRACE_FILE) if TRACE_FILE else None
+_service = TRACE_SERVICE
+
+
+def configure_tracing(path: str | Path | None, service: str | None = None) -> None:
+    """Exports spans to the JSONL file at path, or turns tracing off when path is None.
+
+    Args:
+        path: File the spans are appended to.
+        service: Name recorded on every span of this process, e.g. the agent name.
+    """
+    global _exporter, _service
+    _exporter = JsonlSpanExporter(path) if path else None
+    if service:
+        _service = service
+
+
+def tracing_enabled() -> bool:
+    return _exporter is not None
+
+
+def current_span() -> Span | None:
+    span = _current_span.get()
+    return span if isinstance(span, Span) else None
+
+
+@contextmanager
+def span(name: str, parent: SpanContext | None = None, **attributes) -> Iterator[Span | None]:
+    """Times the enclosed block as a child of the current span, or of parent when given.
+
+    Yields None when tracing is off. Exceptions are recorded on the span and re-raised.
+    Tasks created inside the block inherit the span as their parent.
+    """
+    if _exporter is None:
+        yield None
+        return
+    parent = parent or _current_span.get()
+    trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+    parent_id = parent.span_id if parent is not None else None
+    current = Span(name, trace_id, parent_id, _service, attributes)
+    token = _current_span.set(current)
+    closing = False
+    try:
+        yield current
+    except BaseException as e:
+        current.error = repr(e)
+        closing = isinstance(e, GeneratorExit)
+        raise
+    finally:
+        current.finish()
+        record(current)
+        try:
+            _current_span.reset(token)
+        except ValueError as e:
+            # An async generator holding the span may be closed from another task,
+            # e.g. by aclosing or the loop's finalizer, anywhere else it is a bug
+            if not closing:
+                raise
+            logger.debug(f"Span {name} closed outside the context it was opened in: {e}")
+
+
+def record(finished: Span) -> None:
+    if _exporter is not None:
+        try:
+            _exporter.export(finished)
+        except OSError as e:
+            logger.warning(f"Failed to export span {finished.name}: {e}")
+
+
+def record_span(name: str, start: float, duration_ms: float, **attributes) -> None:
+    """Records an already measured operation, e.g. one step of an agent stream, under the current span."""
+    parent = _current_span.get()
+    if _exporter is None or parent is None:
+        return
+    finished = Span(name, parent.trace_id, parent.span_id, _service, attributes)
+    finished.start = start
+    finished.duration_ms = duration_ms
+    record(finished)
+
+
+def inject(metadata: dict | None = None) -> dict:
+    """Returns metadata with the current trace context added, to send along with an A2A message."""
+    metadata = dict(metadata or {})
+    current = _current_span.get()
+    if current is not None and _exporter is not None:
+        metadata[TRACEPARENT] = f"00-{current.trace_id}-{current.span_id}-01"
+    return metadata
+
+
+def extract(metadata: dict | None) -> SpanContext | None:
+    """Reads the trace context injected by the sender of an A2A message, None if there is none."""
+    traceparent = (metadata or {}).get(TRACEPARENT)
+    if not isinstance(traceparent, str):
+        return None
+    fields = traceparent.split("-")
+    if len(fields) != 4 or len(fields[1]) != 32 or len(fields[2]) != 16:
+        logger.info(f"Ignoring malformed traceparent {traceparent!r}")
+        return None
+    return SpanContext(fields[1], fields[2])
+
+
+def load_spans(paths) -> list[dict]:
+    spans = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            spans.extend(json.loads(line) for line in f if line.strip())
+    return spans
+
+
+def waterfall(spans: list[dict], width: int = 40) -> str:
+    """Renders the spans of one trace as an indented tree with a bar per span on a shared time axis."""
+    if not spans:
+        return ""
+    by_id = {s["span_id"]: s for s in spans}
+    children: dict[str | None, list[dict]] = {}
+    for s in spans:
+        # Spans whose parent was not exported are shown as roots
+        parent_id = s["parent_id"] if s["parent_id"] in by_id else None
+        children.setdefault(parent_id, []).append(s)
+    origin = min(s["start"] for s in spans)
+    total_ms = max(
+        (s["start"] - origin) * 1000 + (s["duration_ms"] or 0) for s in spans
+    ) or 1.0
+    lines = [f"{'span':<48} {'start ms':>9} {'dur ms':>9}  timeline"]
+
+    def render(s: dict, depth: int) -> None:
+        offset_ms = (s["start"] - origin) * 1000
+        duration_ms = s["duration_ms"] or 0
+        begin = int(offset_ms / total_ms * width)
+        length = max(1, int(duration_ms / total_ms * width))
+        bar = " " * begin + "#" * min(length, width - begin)
+        label = "  " * depth + s["name"]
+        detail = s["attributes"].get("agent") or s["attributes"].get("task") or ""
+        if detail:
+            label = f"{label} [{detail}]"
+        if s.get("error"):
+            label += " !"
+        lines.append(f"{label[:48]:<48} {offset_ms:>9.1f} {duration_ms:>9.1f}  |{bar:<{width}}|")
+        for child in sorted(children.get(s["span_id"], []), key=lambda c: c["start"]):
+            render(child, depth + 1)
+
+    for root in sorted(children.get(None, []), key=lambda c: c["start"]):
+        render(root, 0)
+    return "\n".join(lines)
+
+
+# Command line latency waterfall
+@click.command()
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--workflow", "workflow_id", help="Only traces of this workflow (context id)")
+@click.option("--trace", "trace_id", help="Only this trace id")
+@click.option("--width", default=40, help="Width of the timeline in characters")
+def cli(files, workflow_id, trace_id, width):
+    """Prints a latency waterfall per trace from span JSONL files, e.g. those of the orchestrator and agents."""
+    spans = load_spans(files)
+    traces: dict[str, list[dict]] = {}
+    for s in spans:
+        traces.setdefault(s["trace_id"], []).append(s)
+    for current_trace_id, trace_spans in sorted(
+        traces.items(), key=lambda item: min(s["start"] for s in item[1])
+    ):
+        if trace_id and current_trace_id != trace_id:
+            continue
+        workflows = {s["attributes"].get("workflow_id") for s in trace_spans} - {None}
+        if workflow_id and workflow_id not in workflows:
+            continue
+        header = f"trace {current_trace_id}"
+        if workflows:
+            header += f" workflow {', '.join(sorted(workflows))}"
+        print(header)
+        print(waterfall(trace_spans, width))
+        print()
+
+
+if __name__ == "__main__":
+    cli()
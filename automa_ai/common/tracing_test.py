@@ -0,0 +1,93 @@
+import asyncio
+import contextvars
+import logging
+
+import pytest
+from click.testing import CliRunner
+
+from automa_ai.common import tracing
+from automa_ai.common.workflow import WorkflowGraph
+from automa_ai.common.workflow_test import build, drain
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    tracing.configure_tracing(path)
+    yield path
+    tracing.configure_tracing(None)
+
+
+class TestTracing:
+    """Test cases for spans, their export and trace context propagation."""
+
+    def test_disabled_by_default(self):
+        with tracing.span("route") as route_span:
+            assert route_span is None
+        assert tracing.inject() == {}
+
+    def test_nested_spans(self, trace_file):
+        with tracing.span("workflow", workflow_id="context") as outer:
+            with tracing.span("route", task="run annual simulation") as inner:
+                pass
+            with pytest.raises(ValueError):
+                with tracing.span("node"):
+                    raise ValueError("boom")
+        spans = {s["name"]: s for s in tracing.load_spans([trace_file])}
+        assert spans["route"]["parent_id"] == outer.span_id
+        assert spans["route"]["trace_id"] == outer.trace_id == inner.trace_id
+        assert spans["workflow"]["parent_id"] is None
+        assert "boom" in spans["node"]["error"]
+        assert spans["workflow"]["duration_ms"] >= spans["route"]["duration_ms"]
+
+    def test_propagation(self, trace_file):
+        with tracing.span("a2a.call") as call_span:
+            metadata = tracing.inject({"other": 1})
+        assert metadata["other"] == 1
+        parent = tracing.extract(metadata)
+        # The agent process continues the trace under the calling span
+        with tracing.span("agent.execute", parent=parent) as remote_span:
+            pass
+        assert remote_span.trace_id == call_span.trace_id
+        assert remote_span.parent_id == call_span.span_id
+        assert tracing.extract({"traceparent": "garbage"}) is None
+
+    def test_span_closed_in_another_context(self, trace_file):
+        node_span = tracing.span("node")
+        node_span.__enter__()
+        with pytest.raises(ValueError):
+            contextvars.copy_context().run(node_span.__exit__, None, None, None)
+
+    @pytest.mark.asyncio
+    async def test_async_generator_closed_in_another_task(self, trace_file, caplog):
+        async def stream():
+            with tracing.span("workflow"):
+                yield 1
+                yield 2
+
+        chunks = stream()
+        assert await chunks.__anext__() == 1
+        caplog.set_level(logging.DEBUG, logger=tracing.__name__)
+        await asyncio.create_task(chunks.aclose())
+        assert "closed outside the context" in caplog.text
+        assert [s["name"] for s in tracing.load_spans([trace_file])] == ["workflow"]
+
+    @pytest.mark.asyncio
+    async def test_workflow_waterfall(self, trace_file):
+        graph = WorkflowGraph()
+        build(graph, [], [("plan", "a")], plan={"delay": 0.01}, a={"delay": 0.01})
+        await drain(graph)
+        spans = tracing.load_spans([trace_file])
+        workflow_span = next(s for s in spans if s["name"] == "workflow")
+        nodes = [s for s in spans if s["name"] == "node"]
+        assert len(nodes) == 2
+        assert all(s["parent_id"] == workflow_span["span_id"] for s in nodes)
+
+        result = CliRunner().invoke(
+            tracing.cli, [str(trace_file), "--workflow", graph.workflow_id]
+        )
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        assert lines[0].startswith(f"trace {workflow_span['trace_id']}")
+        assert lines[2].startswith("workflow")
+        assert lines[3].startswith("  node [plan]")
@@ -32,6 +32,12 @@ class PlannerTask(BaseModel):
         ]
         | None
     ) = Field(description="Status of the task", default="input_required")
+    depends_on: list[int] | None = Field(
+        description="IDs of the tasks that must complete before this one. "
+        "An empty list means the task only needs the plan, "
+        "leave it out to run after the previous task.",
+        default=None,
+    )
 
 
 class ModelInfo(BaseModel):
@@ -57,5 +63,6 @@ class TaskList(BaseModel):
     blackboard: ModelInfo | None = Field(description="EnergyPlus or OpenStudio modeling task information")
 
     tasks: list[PlannerTask] = Field(
-        description="A list of tasks to be executed sequentially."
+        description="A list of tasks to be executed sequentially, "
+        "or in parallel where depends_on allows it."
     )
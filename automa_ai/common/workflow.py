@@ -1,28 +1,50 @@
+import asyncio
+import contextlib
+import hashlib
 import json
 import logging
+import time
 import uuid
+from collections import OrderedDict, deque
 from enum import Enum
-from typing import AsyncIterable, Any
+from typing import AsyncIterable, Any, Callable
 
-import httpx
 import networkx as nx
-from a2a.client import A2AClient
+from pydantic import ValidationError
 from a2a.types import (
     AgentCard,
+    Artifact,
+    Message,
+    Part,
+    Role,
     SendStreamingMessageRequest,
     MessageSendParams,
     SendStreamingMessageResponse,
     TaskArtifactUpdateEvent,
     TaskStatusUpdateEvent,
     TaskState,
+    TaskStatus,
+    TextPart,
     SendStreamingMessageSuccessResponse,
 )
 
+from automa_ai.common import tracing
+from automa_ai.common.a2a_client_pool import get_a2a_client_pool
+from automa_ai.common.artifact_store import ArtifactStore, get_artifact_store
+from automa_ai.common.checkpoint import CheckpointStore
+from automa_ai.common.resilience import get_resilience_policy, iterate_with_timeout
+from automa_ai.common.routing_cache import normalize_task, routing_cache
+from automa_ai.common.scheduler import AgentScheduler, Priority
 from automa_ai.common.utils import get_agent_mcp_server_config
 from automa_ai.mcp_servers import client
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_PARALLELISM = 4
+
+# Marks the end of a node's chunk stream in the merged queue
+_NODE_DONE = object()
+
 
 class Status(Enum):
     """Represents the status of a workflow and its associated node."""
@@ -31,6 +53,7 @@ class Status(Enum):
     RUNNING = "RUNNING"
     COMPLETED = "COMPLETED"
     PAUSED = "PAUSED"
+    FAILED = "FAILED"
     INITIALIZED = "INITIALIZED"
 
 
@@ -40,6 +63,21 @@ class WorkflowNode:
     It manages its own state (e.g., READY, RUNNING, COMPLETED, PAUSE) and can execute its assigned task.
     """
 
+    __slots__ = (
+        "id",
+        "node_key",
+        "node_label",
+        "task",
+        "result",
+        "results",
+        "state",
+        "agent_card",
+        "agent_card_task",
+        "blackboard_keys",
+        "cache_tags",
+        "timeout",
+    )
+
     def __init__(
         self, task: str, node_key: str | None = None, node_label: str | None = None
     ):
@@ -49,79 +87,425 @@ class WorkflowNode:
         self.task = task
         # self.history = history
         self.result = None
+        self.results = None
         self.state = Status.READY
+        # Agent resolved ahead of execution, see resolve_agents
+        self.agent_card: AgentCard | None = None
+        self.agent_card_task: asyncio.Task | None = None
+        # Blackboard keys the node reads (None for all) and extra tags, see NodeResultCache
+        self.blackboard_keys: list[str] | None = None
+        self.cache_tags: set[str] = set()
+        # Deadline of one agent call in seconds, overrides the ResiliencePolicy
+        self.timeout: float | None = None
 
     async def get_planner_resource(self) -> AgentCard | None:
         logger.info(f"Getting resource for node {self.id}")
         config = get_agent_mcp_server_config()
-        async with client.init_session(
-            config.host, config.port, config.transport
-        ) as session:
-            response = await client.find_resource(
+        response = await client.get_session_pool().run(
+            config.host,
+            config.port,
+            config.transport,
+            lambda session: client.find_resource(
                 session, "resource://agent_cards/planner_agent"
-            )
-            data = json.loads(response.contents[0].text)
-            if data:
-                return AgentCard(**data["agent_card"])
-            else:
-                return None
+            ),
+        )
+        data = json.loads(response.contents[0].text)
+        if data:
+            return AgentCard(**data["agent_card"])
+        else:
+            return None
 
     async def find_agent_for_task(self) -> AgentCard | None:
+        with tracing.span("route", task=self.task) as route_span:
+            agent_card = await self._find_agent_for_task()
+            if route_span is not None and agent_card is not None:
+                route_span.set(agent=agent_card.name)
+            return agent_card
+
+    async def _find_agent_for_task(self) -> AgentCard | None:
+        cached = routing_cache.get(self.task)
+        if cached is not None:
+            logger.info(f"Routing cache hit: agent {cached.name} for task {self.task}")
+            return cached
         logger.info(f"Finding agent for task - {self.task}")
         config = get_agent_mcp_server_config()
-        async with client.init_session(
-            config.host, config.port, config.transport
-        ) as session:
-            result = await client.find_agent(session, self.task)
-            agent_card_json = json.loads(result.content[0].text)
-            logger.info(f"Found agent {agent_card_json} for task {self.task}")
-            return AgentCard(**agent_card_json)
+        result = await client.get_session_pool().run(
+            config.host,
+            config.port,
+            config.transport,
+            lambda session: client.find_agents(session, self.task, top_k=1),
+        )
+        data = json.loads(result.content[0].text)
+        routing_cache.observe_version(data.get("version"))
+        if not data["matches"]:
+            return None
+        agent_card_json = data["matches"][0]["agent_card"]
+        logger.info(f"Found agent {agent_card_json} for task {self.task}")
+        agent_card = AgentCard(**agent_card_json)
+        routing_cache.put(self.task, agent_card)
+        return agent_card
+
+    async def resolve_agent(self) -> AgentCard | None:
+        """Returns the agent for this node, waiting for a prefetch started by resolve_agents."""
+        if self.node_key == "planner":
+            # Cached like a prefetched agent, the scheduler and run_node both ask for it
+            if self.agent_card is None:
+                self.agent_card = await self.get_planner_resource()
+            if self.agent_card is None:
+                self.agent_card = await self.find_agent_for_task()
+            return self.agent_card
+        if self.agent_card_task is not None:
+            try:
+                # Shielded, the batch is shared with other nodes
+                await asyncio.shield(self.agent_card_task)
+            except Exception as e:
+                logger.warning(f"Prefetching agent for node {self.id} failed: {e}")
+            self.agent_card_task = None
+        if self.agent_card is None:
+            self.agent_card = await self.find_agent_for_task()
+        return self.agent_card
+
+    async def find_alternative_agent(self, exclude: set[str]) -> AgentCard | None:
+        """Returns the best matching agent whose URL is not excluded and whose circuit is not open."""
+        policy = get_resilience_policy()
+        config = get_agent_mcp_server_config()
+        result = await client.get_session_pool().run(
+            config.host,
+            config.port,
+            config.transport,
+            lambda session: client.find_agents(
+                session, self.task, top_k=policy.reroute_candidates
+            ),
+        )
+        for match in json.loads(result.content[0].text)["matches"]:
+            agent_card = AgentCard(**match["agent_card"])
+            if agent_card.url not in exclude and policy.breaker.allow(agent_card.url):
+                return agent_card
+        return None
+
+    def send_message(
+        self, agent_card: AgentCard, query: str, task_id: str, context_id: str, blackboard: dict
+    ) -> AsyncIterable[SendStreamingMessageResponse]:
+        a2a_client = get_a2a_client_pool().get_client(agent_card)
+        payload: dict[str, any] = {
+            "message": {
+                "messageId": str(uuid.uuid4()),
+                "role": "user",
+                "parts": [{"kind": "text", "text": str({"query": query, "blackboard": blackboard})}],
+                "taskId": task_id,
+                "contextId": context_id,
+            }
+        }
+        # Lets the agent's spans join this trace
+        metadata = tracing.inject()
+        if metadata:
+            payload["message"]["metadata"] = metadata
+        request = SendStreamingMessageRequest(
+            id=str(uuid.uuid4()), params=MessageSendParams(**payload)
+        )
+        return a2a_client.send_message_streaming(request)
+
+    @staticmethod
+    def failure_chunk(message: str, task_id: str, context_id: str) -> SendStreamingMessageResponse:
+        """A final ``failed`` status update, streamed when the node's agent cannot be reached."""
+        return SendStreamingMessageResponse(
+            root=SendStreamingMessageSuccessResponse(
+                id=str(uuid.uuid4()),
+                result=TaskStatusUpdateEvent(
+                    taskId=task_id or str(uuid.uuid4()),
+                    contextId=context_id or str(uuid.uuid4()),
+                    final=True,
+                    status=TaskStatus(
+                        state=TaskState.failed,
+                        message=Message(
+                            messageId=str(uuid.uuid4()),
+                            role=Role.agent,
+                            parts=[Part(root=TextPart(text=message))],
+                        ),
+                    ),
+                ),
+            )
+        )
+
+    def reroute(self, agent_card: AgentCard, alternative: AgentCard) -> AgentCard:
+        """Switches the node to the alternative agent and returns it."""
+        logger.info(f"Re-routing node {self.id} from {agent_card.name} to {alternative.name}")
+        self.agent_card = alternative
+        # Later nodes and workflows with this task skip the failing agent too
+        routing_cache.put(self.task, alternative)
+        return alternative
 
     async def run_node(
         self, query: str, task_id: str, context_id: str, blackboard: dict
     ) -> AsyncIterable[dict[str, Any]]:
+        """Streams the agent's response, see ResiliencePolicy for timeouts, retries and re-routing.
+
+        When no agent can serve the task the stream ends with a ``failed``
+        status update instead of raising, so other branches keep running.
+        """
         logger.info(f"Executing node {self.id}")
-        agent_card = None
-        if self.node_key == "planner":
-            agent_card = await self.get_planner_resource()
-            if agent_card is None:
-                agent_card = await self.find_agent_for_task()
-        else:
-            agent_card = await self.find_agent_for_task()
-
-        #print(f"In the node, check out the blackboard: {blackboard}")
-
-        async with httpx.AsyncClient() as httpx_client:
-            # alternatively, a url would work too.
-            a2a_client = A2AClient(httpx_client, agent_card)
-            payload: dict[str, any] = {
-                "message": {
-                    "messageId": str(uuid.uuid4()),
-                    "role": "user",
-                    "parts": [{"kind": "text", "text": str({"query": query, "blackboard": blackboard})}],
-                    "taskId": task_id,
-                    "contextId": context_id,
-                }
-            }
-            request = SendStreamingMessageRequest(
-                id=str(uuid.uuid4()), params=MessageSendParams(**payload)
+        policy = get_resilience_policy()
+        agent_card = await self.resolve_agent()
+        if agent_card is None:
+            yield self.failure_chunk(f"No agent found for task {self.task}", task_id, context_id)
+            return
+        tried = set()
+        attempt = 0
+        while True:
+            if not policy.breaker.allow(agent_card.url):
+                logger.warning(f"Circuit for agent {agent_card.name} is open, node {self.id}")
+                tried.add(agent_card.url)
+                alternative = await self.find_alternative_agent(tried) if policy.reroute else None
+                if alternative is None:
+                    yield self.failure_chunk(
+                        f"Agent {agent_card.name} is unavailable", task_id, context_id
+                    )
+                    return
+                agent_card = self.reroute(agent_card, alternative)
+                attempt = 0
+
+            tried.add(agent_card.url)
+            streamed = False
+            try:
+                with tracing.span("a2a.call", agent=agent_card.name, attempt=attempt):
+                    stream = self.send_message(agent_card, query, task_id, context_id, blackboard)
+                    async for chunk in iterate_with_timeout(
+                        stream, policy.timeout_for(agent_card, self.timeout), policy.idle_timeout
+                    ):
+                        streamed = True
+                        logger.info(f"chunk returned {chunk}")
+                        # Save the artifact as a result of the node
+                        if isinstance(chunk.root, SendStreamingMessageSuccessResponse) and isinstance(
+                            chunk.root.result, TaskArtifactUpdateEvent
+                        ):
+                            artifact = chunk.root.result.artifact
+                            self.results = artifact
+                        yield chunk
+            except Exception as e:
+                if not policy.is_transient(e):
+                    raise
+                policy.breaker.record_failure(agent_card.url)
+                error = "timed out" if isinstance(e, TimeoutError) else f"failed: {e}"
+                logger.warning(f"Call to agent {agent_card.name} for node {self.id} {error}")
+                if streamed:
+                    # Chunks were forwarded already, a retry would repeat them
+                    yield self.failure_chunk(
+                        f"Agent {agent_card.name} {error}", task_id, context_id
+                    )
+                    return
+                if attempt < policy.retries:
+                    await asyncio.sleep(policy.backoff(attempt))
+                    attempt += 1
+                    continue
+                alternative = await self.find_alternative_agent(tried) if policy.reroute else None
+                if alternative is None:
+                    yield self.failure_chunk(
+                        f"Agent {agent_card.name} {error}", task_id, context_id
+                    )
+                    return
+                agent_card = self.reroute(agent_card, alternative)
+                attempt = 0
+            else:
+                policy.breaker.record_success(agent_card.url)
+                return
+
+
+def _is_final_failure(chunk) -> bool:
+    """True for a status update that means the node did not produce a reusable result."""
+    return (
+        isinstance(chunk.root, SendStreamingMessageSuccessResponse)
+        and isinstance(chunk.root.result, TaskStatusUpdateEvent)
+        and chunk.root.result.status.state
+        in (TaskState.input_required, TaskState.failed, TaskState.canceled, TaskState.rejected)
+    )
+
+
+class NodeResultCache:
+    """Opt-in cache of node chunk streams, replayed instead of calling the agent again.
+
+    Entries are keyed on the agent card name and version, the normalized task
+    text and a canonical hash of the blackboard slice the node reads
+    (``WorkflowNode.blackboard_keys``, the whole blackboard when None). Only
+    streams that finish without asking for input or failing are stored.
+    Entries expire ``ttl`` seconds after insertion and can be dropped by tag,
+    every entry is tagged with its agent name and the node's ``cache_tags``.
+    Replayed events carry ``{"node_cache": "hit"}`` in their metadata.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float | None = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        # key -> (inserted at, tags, chunks)
+        self._entries: OrderedDict[str, tuple[float, frozenset, list]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(agent_card: AgentCard, query: str, blackboard: dict, blackboard_keys=None) -> str:
+        if blackboard_keys is not None:
+            blackboard = {k: blackboard[k] for k in blackboard_keys if k in blackboard}
+        payload = [agent_card.name, agent_card.version, normalize_task(query), blackboard]
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> list | None:
+        entry = self._entries.get(key)
+        if entry is not None and (self.ttl is None or self._clock() - entry[0] < self.ttl):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, chunks: list, tags=()) -> None:
+        self._entries[key] = (self._clock(), frozenset(tags), list(chunks))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tag: str | None = None) -> int:
+        """Drops the entries carrying tag, or every entry when tag is None.
+
+        Returns:
+            The number of dropped entries.
+        """
+        if tag is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+        stale = [key for key, (_, tags, _) in self._entries.items() if tag in tags]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+        }
+
+    @staticmethod
+    def replay(chunks: list, task_id: str, context_id: str):
+        """Yields cached chunks rebound to the current task and context, marked as cache hits."""
+        for chunk in chunks:
+            event = chunk.root.result
+            update = {"metadata": {**(event.metadata or {}), "node_cache": "hit"}}
+            if isinstance(event, (TaskStatusUpdateEvent, TaskArtifactUpdateEvent)):
+                update.update(taskId=task_id or event.taskId, contextId=context_id or event.contextId)
+            yield SendStreamingMessageResponse(
+                root=chunk.root.model_copy(update={"result": event.model_copy(update=update)})
             )
-            response_stream = a2a_client.send_message_streaming(request)
-            async for chunk in response_stream:
-                logger.info(f"chunk returned {chunk}")
-                # Save the artifact as a result of the node
-                if isinstance(chunk.root, SendStreamingMessageResponse) and isinstance(
-                    chunk.root.result, TaskArtifactUpdateEvent
-                ):
-                    artifact = chunk.root.result.artifact
-                    self.results = artifact
+
+    async def run(
+        self, node: WorkflowNode, query: str, task_id: str, context_id: str, blackboard: dict
+    ) -> AsyncIterable[dict[str, Any]]:
+        """Runs a node through the cache, replaying a stored stream on a hit."""
+        agent_card = await node.resolve_agent()
+        if agent_card is None:
+            async for chunk in node.run_node(query, task_id, context_id, blackboard):
                 yield chunk
+            return
+        key = self.key(agent_card, query, blackboard, node.blackboard_keys)
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"Node cache hit for node {node.id}, replaying {len(cached)} chunks")
+            node_span = tracing.current_span()
+            if node_span is not None:
+                node_span.set(node_cache="hit")
+            for chunk in self.replay(cached, task_id, context_id):
+                # As run_node does, so the node's checkpoint keeps its result
+                if isinstance(chunk.root.result, TaskArtifactUpdateEvent):
+                    node.results = chunk.root.result.artifact
+                yield chunk
+            return
+        chunks = []
+        reusable = True
+        async for chunk in node.run_node(query, task_id, context_id, blackboard):
+            if isinstance(chunk.root, SendStreamingMessageSuccessResponse):
+                chunks.append(chunk)
+                reusable = reusable and not _is_final_failure(chunk)
+            else:
+                reusable = False
+            yield chunk
+        if reusable and chunks:
+            self.put(key, chunks, tags={agent_card.name, *node.cache_tags})
+
+
+async def resolve_agents(nodes: list[WorkflowNode]) -> None:
+    """Resolves the agents of many nodes with one ``find_agents_batch`` call.
+
+    Sets ``agent_card`` on every node that has a match and fills the routing
+    cache. Tasks already in the routing cache are not sent to the server.
+    """
+    pending = []
+    for node in nodes:
+        cached = routing_cache.get(node.task)
+        if cached is not None:
+            node.agent_card = cached
+        else:
+            pending.append(node)
+    if not pending:
+        return
+    # One query per distinct normalized task
+    queries = list({normalize_task(node.task): node.task for node in pending}.values())
+    logger.info(f"Resolving agents for {len(queries)} tasks")
+    config = get_agent_mcp_server_config()
+    with tracing.span("route.batch", tasks=len(queries)):
+        result = await client.get_session_pool().run(
+            config.host,
+            config.port,
+            config.transport,
+            lambda session: client.find_agents_batch(session, queries, top_k=1),
+        )
+    data = json.loads(result.content[0].text)
+    routing_cache.observe_version(data.get("version"))
+    agent_cards = {}
+    for query, entry in zip(queries, data["results"]):
+        if entry["matches"]:
+            agent_card = AgentCard(**entry["matches"][0]["agent_card"])
+            routing_cache.put(query, agent_card)
+            agent_cards[normalize_task(query)] = agent_card
+    for node in pending:
+        node.agent_card = agent_cards.get(normalize_task(node.task))
 
 
 class WorkflowGraph:
-    """Represents a graph of workflow nodes."""
+    """Represents a graph of workflow nodes.
+
+    Nodes whose predecessors are all complete run concurrently, up to
+    ``max_parallelism`` at a time, and their chunk streams are merged into the
+    single iterator returned by ``run_workflow``. Large blackboard values are
+    replaced by ``artifact://`` handles from ``artifact_store``. With a
+    ``scheduler``, every node also waits for a slot of its agent at
+    ``priority``, which bounds the load of workflows sharing the agents.
+    """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_parallelism: int = DEFAULT_MAX_PARALLELISM,
+        artifact_store: ArtifactStore | None = None,
+        checkpoint_store: CheckpointStore | None = None,
+        workflow_id: str | None = None,
+        node_cache: NodeResultCache | None = None,
+        scheduler: AgentScheduler | None = None,
+        priority: Priority = Priority.NORMAL,
+    ):
+        if max_parallelism < 1:
+            raise ValueError("max_parallelism must be at least 1")
         self.graph = nx.DiGraph()
         self.nodes = {}
         self.latest_node = None
@@ -129,49 +513,297 @@ class WorkflowGraph:
         self.state = Status.INITIALIZED
         self.blackboard = {}
         self.paused_node_id = None
+        self.max_parallelism = max_parallelism
+        # Nodes of an interrupted run that never started, picked up on resume
+        self.deferred_node_ids = set()
+        # Topological position of every node, kept valid as nodes and edges are added
+        self._order: dict[str, int] = {}
+        self._next_order = 0
+        # Nodes not COMPLETED yet, so resuming never walks the finished history
+        self._incomplete: set[str] = set()
+        # Large blackboard values are kept here and shared by reference
+        self.artifact_store = artifact_store or get_artifact_store()
+        # Node transitions are persisted here when set, see from_checkpoint
+        self.checkpoint_store = checkpoint_store
+        self.workflow_id = workflow_id or str(uuid.uuid4())
+        self.node_cache = node_cache
+        self.scheduler = scheduler
+        self.priority = priority
+        self._checkpoint_workflow()
 
-    def add_node(self, node) -> None:
-        logger.info(f"Adding one {node.id}")
-        self.graph.add_node(node.id, query=node.task)
+    @classmethod
+    def from_checkpoint(
+        cls, checkpoint_store: CheckpointStore, workflow_id: str, **kwargs
+    ) -> "WorkflowGraph | None":
+        """Rebuilds a workflow from its checkpoint, or returns None if there is none.
+
+        Nodes that were running when the checkpoint was written are reset to
+        READY, so running the graph again resumes from the first incomplete node.
+        """
+        checkpoint = checkpoint_store.load(workflow_id)
+        if checkpoint is None or not checkpoint["nodes"]:
+            return None
+        graph = cls(**kwargs)
+        interrupted = set()
+        for entry in checkpoint["nodes"]:
+            node = WorkflowNode(
+                entry["task"], node_key=entry["node_key"], node_label=entry["node_label"]
+            )
+            node.id = entry["node_id"]
+            node.state = Status(entry["state"])
+            if node.state == Status.RUNNING:
+                node.state = Status.READY
+                interrupted.add(node.id)
+            if entry["result"] is not None:
+                try:
+                    node.results = Artifact.model_validate(entry["result"])
+                except ValidationError:
+                    node.results = entry["result"]
+            graph._register(node, entry["attributes"])
+        for from_node_id, to_node_id in checkpoint["edges"]:
+            graph.add_edge(from_node_id, to_node_id)
+        graph.blackboard = checkpoint["blackboard"]
+        graph.paused_node_id = checkpoint["paused_node_id"]
+        graph.deferred_node_ids = set(checkpoint["deferred"]) | interrupted
+        state = Status(checkpoint["state"])
+        graph.state = Status.INITIALIZED if state == Status.RUNNING else state
+        graph.checkpoint_store = checkpoint_store
+        graph.workflow_id = workflow_id
+        graph._checkpoint_workflow()
+        logger.info(f"Restored workflow {workflow_id} with {len(graph.nodes)} nodes")
+        return graph
+
+    def attach_checkpoint_store(self, checkpoint_store: CheckpointStore) -> None:
+        """Writes the whole workflow to checkpoint_store and keeps checkpointing there."""
+        self.checkpoint_store = checkpoint_store
+        self._checkpoint_workflow()
+        for node_id in self.nodes:
+            self._checkpoint_node(node_id)
+        for from_node_id, to_node_id in self.graph.edges:
+            checkpoint_store.save_edge(self.workflow_id, from_node_id, to_node_id)
+
+    def _checkpoint_workflow(self) -> None:
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.save_workflow(
+                self.workflow_id,
+                self.state.value,
+                self.paused_node_id,
+                list(self.deferred_node_ids),
+                self.blackboard,
+            )
+
+    def _checkpoint_node(self, node_id: str) -> None:
+        if self.checkpoint_store is not None:
+            node = self.nodes[node_id]
+            self.checkpoint_store.save_node(
+                self.workflow_id,
+                node.id,
+                node.task,
+                node.state.value,
+                node.node_key,
+                node.node_label,
+                dict(self.graph.nodes[node_id]),
+                node.results,
+            )
+
+    def _register(self, node: WorkflowNode, attributes: dict) -> None:
+        self.graph.add_node(node.id, **attributes)
         self.nodes[node.id] = node
         self.latest_node = node.id
+        # A new node has no edges yet, so it can go last
+        self._order[node.id] = self._next_order
+        self._next_order += 1
+        if node.state != Status.COMPLETED:
+            self._incomplete.add(node.id)
+
+    def add_node(self, node) -> None:
+        logger.info(f"Adding one {node.id}")
+        self._register(node, {"query": node.task})
+        self._checkpoint_node(node.id)
 
     def add_edge(self, from_node_id: str, to_node_id: str) -> None:
+        """Adds an edge, keeping the topological order valid.
+
+        Raises:
+            ValueError: If a node id is unknown or the edge would create a cycle.
+        """
         if from_node_id not in self.nodes or to_node_id not in self.nodes:
             raise ValueError("Invalid node IDs")
+        if self._order[from_node_id] >= self._order[to_node_id]:
+            self._reorder(from_node_id, to_node_id)
         self.graph.add_edge(from_node_id, to_node_id)
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.save_edge(self.workflow_id, from_node_id, to_node_id)
+
+    def prefetch_agents(self, node_ids=None) -> asyncio.Task | None:
+        """Starts resolving agents for nodes in the background, all nodes when node_ids is None.
+
+        Nodes already resolved, being resolved, or completed are skipped, as is
+        the planner. Each node awaits the shared task in ``run_node``, so routing
+        overlaps with the execution of the nodes before it.
+        """
+        node_ids = self.nodes if node_ids is None else node_ids
+        nodes = [
+            self.nodes[node_id]
+            for node_id in node_ids
+            if self.nodes[node_id].node_key != "planner"
+            and self.nodes[node_id].state != Status.COMPLETED
+            and self.nodes[node_id].agent_card is None
+            and self.nodes[node_id].agent_card_task is None
+        ]
+        if not nodes:
+            return None
+        task = asyncio.create_task(resolve_agents(nodes))
+        # Nodes that never run would otherwise leave the error unretrieved
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        for node in nodes:
+            node.agent_card_task = task
+        return task
+
+    def _reorder(self, from_node_id: str, to_node_id: str) -> None:
+        """Repairs the order before adding an edge that points backwards (Pearce-Kelly).
+
+        Only nodes positioned between the two endpoints are visited, so adding
+        edges to freshly inserted nodes never touches the rest of the graph.
+        """
+        lower, upper = self._order[to_node_id], self._order[from_node_id]
+        forward, stack = [], [to_node_id]
+        seen = {to_node_id}
+        while stack:
+            node_id = stack.pop()
+            if node_id == from_node_id:
+                raise ValueError(f"Edge {from_node_id} -> {to_node_id} would create a cycle")
+            forward.append(node_id)
+            for successor in self.graph.successors(node_id):
+                if successor not in seen and self._order[successor] <= upper:
+                    seen.add(successor)
+                    stack.append(successor)
+        backward, stack = [], [from_node_id]
+        seen = {from_node_id}
+        while stack:
+            node_id = stack.pop()
+            backward.append(node_id)
+            for predecessor in self.graph.predecessors(node_id):
+                if predecessor not in seen and self._order[predecessor] >= lower:
+                    seen.add(predecessor)
+                    stack.append(predecessor)
+        # Everything that reaches the source moves ahead of everything the target reaches
+        affected = sorted(backward, key=self._order.get) + sorted(forward, key=self._order.get)
+        for node_id, position in zip(affected, sorted(self._order[n] for n in affected)):
+            self._order[node_id] = position
+
+    def execution_order(self) -> list[str]:
+        """Ids of all nodes in topological order."""
+        return sorted(self.nodes, key=self._order.get)
 
     def update_blackboard(self, blackboard):
-        self.blackboard = {**self.blackboard, **blackboard}
+        self.blackboard = {**self.blackboard, **self.artifact_store.externalize(blackboard)}
+        self._checkpoint_workflow()
         #print(self.blackboard)
 
-    async def run_workflow(
-        self, start_node_id: str = None
-    ) -> AsyncIterable[dict[str, any]]:
-        logger.info("Executing workflow graph")
-        if not start_node_id or start_node_id not in self.nodes:
-            start_nodes = [n for n, d in self.graph.in_degree() if d == 0]
-        else:
-            start_nodes = [self.nodes[start_node_id].id]
+    def _pending_nodes(self) -> list[str]:
+        """Node ids this run has to execute, in topological order.
 
-        applicable_graph = set()
+        Every node that is not complete runs: new nodes, a paused node and its
+        descendants, failed nodes and the nodes an earlier paused run never
+        started are all among them. The cost depends on the number of
+        incomplete nodes only, not on the length of the history.
+        """
+        # States may also be changed from outside, e.g. when restoring a checkpoint
+        self._incomplete = {
+            n for n in self._incomplete if self.nodes[n].state != Status.COMPLETED
+        }
+        self.deferred_node_ids = set()
+        return sorted(self._incomplete, key=self._order.get)
 
-        for node_id in start_nodes:
-            applicable_graph.add(node_id)
-            applicable_graph.update(nx.descendants(self.graph, node_id))
+    async def _pump_node(self, node: WorkflowNode, queue: asyncio.Queue) -> None:
+        """Runs one node and forwards its chunks, then a done marker, to the queue."""
+        query = self.graph.nodes[node.id].get("query")
+        task_id = self.graph.nodes[node.id].get("task_id")
+        context_id = self.graph.nodes[node.id].get("context_id")
+        if self.node_cache is not None and node.node_key != "planner":
+            stream = self.node_cache.run(node, query, task_id, context_id, self.blackboard)
+        else:
+            stream = node.run_node(query, task_id, context_id, self.blackboard)
+        try:
+            with tracing.span(
+                "node", node_id=node.id, task=node.node_label or node.task, workflow_id=self.workflow_id
+            ) as node_span:
+                if self.scheduler is not None:
+                    slot = self.scheduler.slot(await node.resolve_agent(), context_id, self.priority)
+                else:
+                    slot = contextlib.nullcontext(0.0)
+                async with slot as waited:
+                    if node_span is not None:
+                        node_span.set(queued_ms=waited * 1000)
+                    async for chunk in stream:
+                        await queue.put((node, chunk))
+        except Exception as e:
+            await queue.put((node, e))
+        else:
+            await queue.put((node, _NODE_DONE))
+
+    async def run_workflow(self) -> AsyncIterable[dict[str, any]]:
+        """Runs every incomplete node, independent branches concurrently, and streams their chunks."""
+        # Node tasks are created inside the span, so their spans are its children
+        with tracing.span("workflow", workflow_id=self.workflow_id):
+            async for chunk in self._run_workflow():
+                yield chunk
 
-        complete_graph = list(nx.topological_sort(self.graph))
-        sub_graph = [n for n in complete_graph if n in applicable_graph]
+    async def _run_workflow(self) -> AsyncIterable[dict[str, any]]:
+        logger.info("Executing workflow graph")
+        # The set of nodes is fixed when the run starts, nodes added while it
+        # runs (e.g. from a planner result) are executed by the next run.
+        sub_graph = self._pending_nodes()
         logger.info(f"Sub graph {sub_graph} size {len(sub_graph)}")
+        self.prefetch_agents(sub_graph)
+        pending = set(sub_graph)
+        unmet = {
+            n: sum(1 for p in self.graph.predecessors(n) if p in pending)
+            for n in sub_graph
+        }
+        ready = deque(n for n in sub_graph if unmet[n] == 0)
+        running: dict[str, asyncio.Task] = {}
+        queue: asyncio.Queue = asyncio.Queue()
+        # Nodes that asked for input while another node was already paused
+        deferred = set()
         self.state = Status.RUNNING
-        # Alternative is to loop over all nodes, but we only need the connected nodes.
-        for node_id in sub_graph:
-            node = self.nodes[node_id]
-            node.state = Status.RUNNING
-            query = self.graph.nodes[node_id].get("query")
-            task_id = self.graph.nodes[node_id].get("task_id")
-            context_id = self.graph.nodes[node_id].get("context_id")
-            async for chunk in node.run_node(query, task_id, context_id, self.blackboard):
+        self._checkpoint_workflow()
+        try:
+            while ready or running:
+                # Once a node pauses, let in-flight nodes finish but start no new ones
+                while ready and len(running) < self.max_parallelism and self.state != Status.PAUSED:
+                    node = self.nodes[ready.popleft()]
+                    node.state = Status.RUNNING
+                    self._checkpoint_node(node.id)
+                    running[node.id] = asyncio.create_task(self._pump_node(node, queue))
+                if not running:
+                    break
+
+                node, item = await queue.get()
+                if item is _NODE_DONE:
+                    running.pop(node.id)
+                    if node.state == Status.RUNNING:
+                        node.state = Status.COMPLETED
+                        self._incomplete.discard(node.id)
+                        self._checkpoint_node(node.id)
+                        for successor in self.graph.successors(node.id):
+                            if successor in unmet:
+                                unmet[successor] -= 1
+                                if unmet[successor] == 0:
+                                    ready.append(successor)
+                    elif node.state == Status.FAILED:
+                        skipped = nx.descendants(self.graph, node.id) & pending
+                        if skipped:
+                            logger.warning(f"Node {node.id} failed, skipping {len(skipped)} dependent nodes")
+                    continue
+                if isinstance(item, Exception):
+                    running.pop(node.id)
+                    raise item
+                if node.id in deferred:
+                    continue
+
+                chunk = item
                 # When the workflow node is paused, do not yield any chunks
                 # but, let the loop complete.
                 if node.state != Status.PAUSED:
@@ -189,22 +821,44 @@ class WorkflowGraph:
                             task_status_event.status.state == TaskState.input_required
                             and context_id
                         ):
+                            if self.state == Status.PAUSED:
+                                # Only one question is surfaced at a time, this node
+                                # runs again after the paused node is resumed.
+                                logger.info(f"Node {node.id} needs input while paused, deferring it")
+                                node.state = Status.READY
+                                deferred.add(node.id)
+                                self._checkpoint_node(node.id)
+                                continue
                             node.state = Status.PAUSED
                             self.state = Status.PAUSED
                             self.paused_node_id = node.id
+                            self._checkpoint_node(node.id)
+                        elif task_status_event.status.state == TaskState.failed:
+                            # Its dependents never run and it stays incomplete, so a resume retries it
+                            node.state = Status.FAILED
+                            self._checkpoint_node(node.id)
                     yield chunk
-            if self.state == Status.PAUSED:
-                break
-            if node.state == Status.RUNNING:
-                node.state = Status.COMPLETED
+        finally:
+            for task in running.values():
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.values(), return_exceptions=True)
+        if self.state == Status.PAUSED:
+            self.deferred_node_ids = deferred | set(ready)
         if self.state == Status.RUNNING:
-            self.state = Status.COMPLETED
+            failed = [n for n in sub_graph if self.nodes[n].state == Status.FAILED]
+            self.state = Status.FAILED if failed else Status.COMPLETED
+        self._checkpoint_workflow()
 
     def set_node_attribute(self, node_id, attribute, value):
         nx.set_node_attributes(self.graph, {node_id: value}, attribute)
+        if node_id in self.nodes:
+            self._checkpoint_node(node_id)
 
     def set_node_attributes(self, node_id, attr_val):
         nx.set_node_attributes(self.graph, {node_id: attr_val})
+        if node_id in self.nodes:
+            self._checkpoint_node(node_id)
 
     def is_empty(self) -> bool:
         return self.graph.number_of_nodes() == 0
@@ -0,0 +1,86 @@
+### Resume cost of WorkflowGraph as its history grows.
+# Usage: python -m automa_ai.common.workflow_benchmark --sizes 100,1000,10000
+import logging
+import time
+
+import click
+import networkx as nx
+
+from automa_ai.common.workflow import Status, WorkflowGraph, WorkflowNode
+
+
+def build_history(history: int, plan: int) -> tuple[WorkflowGraph, str]:
+    """A drafter/reviewer style graph: a long completed chain followed by a fresh plan.
+
+    Returns:
+        The graph and the id of the last completed node, where the run resumes.
+    """
+    graph = WorkflowGraph()
+    previous = None
+    for i in range(history):
+        node = WorkflowNode(f"iteration {i}")
+        node.state = Status.COMPLETED
+        graph.add_node(node)
+        if previous is not None:
+            graph.add_edge(previous, node.id)
+        previous = node.id
+    resume_node_id = previous
+    for i in range(plan):
+        node = WorkflowNode(f"planned task {i}")
+        graph.add_node(node)
+        graph.add_edge(resume_node_id, node.id)
+    return graph, resume_node_id
+
+
+def resume_setup(graph: WorkflowGraph) -> list[str]:
+    """The scheduling work run_workflow does before launching the first node."""
+    sub_graph = graph._pending_nodes()
+    pending = set(sub_graph)
+    unmet = {n: sum(1 for p in graph.graph.predecessors(n) if p in pending) for n in sub_graph}
+    return [n for n in sub_graph if unmet[n] == 0]
+
+
+def full_sort_setup(graph: WorkflowGraph, start_node_id: str) -> list[str]:
+    """The previous approach: descendants plus a topological sort of the whole graph."""
+    applicable = {start_node_id, *nx.descendants(graph.graph, start_node_id)}
+    sub_graph = [
+        n
+        for n in nx.topological_sort(graph.graph)
+        if n in applicable and graph.nodes[n].state != Status.COMPLETED
+    ]
+    pending = set(sub_graph)
+    return [n for n in sub_graph if not any(p in pending for p in graph.graph.predecessors(n))]
+
+
+def measure(setup, repeat: int) -> float:
+    """Median milliseconds of one call of setup, a resume setup without arguments."""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        setup()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return latencies[len(latencies) // 2]
+
+
+@click.command()
+@click.option("--sizes", default="100,1000,10000", help="Comma separated numbers of completed nodes")
+@click.option("--plan", default=5, help="Incomplete nodes added after the history")
+@click.option("--repeat", default=50, help="Resumes measured per size")
+def cli(sizes, plan, repeat):
+    """Reports the median resume setup time of the incremental order and of a full re-sort."""
+    # Every added node logs at INFO, which would flood the terminal and skew the build time
+    logging.getLogger("automa_ai.common.workflow").setLevel(logging.WARNING)
+    print(f"{'history':>8} {'build ms':>9} {'incremental ms':>15} {'full sort ms':>13}")
+    for history in (int(size) for size in sizes.split(",")):
+        start = time.perf_counter()
+        graph, resume_node_id = build_history(history, plan)
+        build_ms = (time.perf_counter() - start) * 1000
+        assert sorted(resume_setup(graph)) == sorted(full_sort_setup(graph, resume_node_id))
+        incremental = measure(lambda: resume_setup(graph), repeat)
+        full_sort = measure(lambda: full_sort_setup(graph, resume_node_id), repeat)
+        print(f"{history:>8} {build_ms:>9.1f} {incremental:>15.3f} {full_sort:>13.3f}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,349 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    Artifact,
+    Message,
+    Part,
+    Role,
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from automa_ai.common import workflow
+from automa_ai.common.checkpoint import CheckpointStore
+from automa_ai.common.routing_cache import RoutingCache
+from automa_ai.common.workflow import NodeResultCache, Status, WorkflowGraph, WorkflowNode
+from automa_ai.mcp_servers import client, server
+from automa_ai.mcp_servers.server_test import AGENT_CARDS_DIR, FakeEmbeddings
+
+
+def status_chunk(state: TaskState, text: str) -> SendStreamingMessageResponse:
+    return SendStreamingMessageResponse(
+        root=SendStreamingMessageSuccessResponse(
+            id="1",
+            result=TaskStatusUpdateEvent(
+                taskId="task",
+                contextId="context",
+                final=state != TaskState.working,
+                status=TaskStatus(
+                    state=state,
+                    message=Message(
+                        messageId="m",
+                        role=Role.agent,
+                        parts=[Part(root=TextPart(text=text))],
+                    ),
+                ),
+            ),
+        )
+    )
+
+
+class FakeNode(WorkflowNode):
+    """Workflow node that sleeps instead of calling an agent."""
+
+    def __init__(
+        self,
+        task: str,
+        log: list,
+        delay: float = 0.05,
+        ask: bool = False,
+        fail: bool = False,
+        artifact: str | None = None,
+    ):
+        super().__init__(task)
+        # Already resolved, so the graph does not route it through the MCP server
+        self.agent_card = AgentCard(
+            name=task,
+            description=task,
+            url="http://localhost:10101/",
+            version="0.0.1",
+            capabilities=AgentCapabilities(streaming=True),
+            defaultInputModes=["text"],
+            defaultOutputModes=["text"],
+            skills=[],
+        )
+        self.log = log
+        self.delay = delay
+        self.ask = ask
+        self.fail = fail
+        self.artifact = artifact
+
+    async def run_node(self, query, task_id, context_id, blackboard):
+        self.log.append(("start", self.task))
+        await asyncio.sleep(self.delay)
+        if self.ask and query == self.task:
+            yield status_chunk(TaskState.input_required, f"{self.task}?")
+            return
+        if self.fail:
+            yield status_chunk(TaskState.failed, f"{self.task} unavailable")
+            return
+        self.log.append(("end", self.task))
+        if self.artifact is not None:
+            self.results = Artifact(artifactId="a", parts=[Part(root=TextPart(text=self.artifact))])
+            yield SendStreamingMessageResponse(
+                root=SendStreamingMessageSuccessResponse(
+                    id="1",
+                    result=TaskArtifactUpdateEvent(
+                        taskId="task", contextId="context", artifact=self.results
+                    ),
+                )
+            )
+        yield status_chunk(TaskState.completed, self.task)
+
+
+def build(graph: WorkflowGraph, log: list, edges: list[tuple[str, str]], **nodes) -> dict:
+    built = {}
+    for name, kwargs in nodes.items():
+        node = FakeNode(name, log, **kwargs)
+        graph.add_node(node)
+        graph.set_node_attributes(node.id, {"context_id": "context"})
+        built[name] = node
+    for parent, child in edges:
+        graph.add_edge(built[parent].id, built[child].id)
+    return built
+
+
+async def drain(graph: WorkflowGraph) -> list:
+    return [chunk async for chunk in graph.run_workflow()]
+
+
+class TestWorkflowScheduling:
+    """Test cases for concurrent execution of independent workflow nodes."""
+
+    @pytest.mark.asyncio
+    async def test_independent_nodes_run_concurrently(self):
+        log = []
+        graph = WorkflowGraph(max_parallelism=4)
+        build(graph, log, [("plan", "a"), ("plan", "b"), ("a", "c"), ("b", "c")],
+              plan={}, a={"delay": 0.2}, b={"delay": 0.2}, c={})
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        chunks = await drain(graph)
+        assert loop.time() - started < 0.4
+        assert len(chunks) == 4
+        assert log.index(("end", "plan")) < log.index(("start", "a"))
+        assert log.index(("start", "b")) < log.index(("end", "a"))
+        assert log.index(("end", "a")) < log.index(("start", "c"))
+        assert log.index(("end", "b")) < log.index(("start", "c"))
+        assert graph.state == Status.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_max_parallelism_one_is_sequential(self):
+        log = []
+        graph = WorkflowGraph(max_parallelism=1)
+        build(graph, log, [], a={}, b={}, c={})
+        await drain(graph)
+        assert [event for event, _ in log] == ["start", "end"] * 3
+
+    @pytest.mark.asyncio
+    async def test_completed_nodes_are_skipped(self):
+        log = []
+        graph = WorkflowGraph()
+        nodes = build(graph, log, [("plan", "a")], plan={}, a={})
+        nodes["plan"].state = Status.COMPLETED
+        await drain(graph)
+        assert log == [("start", "a"), ("end", "a")]
+
+    @pytest.mark.asyncio
+    async def test_pause_lets_in_flight_nodes_finish(self):
+        log = []
+        graph = WorkflowGraph(max_parallelism=2)
+        nodes = build(graph, log, [("a", "c")],
+                      a={"delay": 0.01, "ask": True}, b={"delay": 0.1}, c={}, d={})
+        await drain(graph)
+        assert graph.state == Status.PAUSED
+        assert graph.paused_node_id == nodes["a"].id
+        # b was already running and finishes, d never started
+        assert ("end", "b") in log
+        assert ("start", "d") not in log
+        assert nodes["b"].state == Status.COMPLETED
+
+        graph.set_node_attributes(nodes["a"].id, {"query": "answer"})
+        await drain(graph)
+        assert graph.state == Status.COMPLETED
+        assert ("end", "a") in log and ("end", "c") in log and ("end", "d") in log
+        assert log.count(("start", "b")) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_node_blocks_dependents(self, tmp_path):
+        log = []
+        store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+        graph = WorkflowGraph(checkpoint_store=store, workflow_id="wf")
+        nodes = build(graph, log, [("a", "b")], a={"delay": 0, "fail": True}, b={}, c={"delay": 0})
+        await drain(graph)
+        assert graph.state == Status.FAILED
+        assert nodes["a"].state == Status.FAILED
+        assert nodes["c"].state == Status.COMPLETED
+        assert ("start", "b") not in log
+
+        restored = WorkflowGraph.from_checkpoint(store, "wf")
+        assert restored.state == Status.FAILED
+        assert restored.nodes[nodes["a"].id].state == Status.FAILED
+        assert restored._pending_nodes() == [nodes["a"].id, nodes["b"].id]
+
+        # A later run retries the failed node and then its dependents
+        nodes["a"].fail = False
+        await drain(graph)
+        assert graph.state == Status.COMPLETED
+        assert log[-2:] == [("start", "b"), ("end", "b")]
+        store.close()
+
+
+@pytest_asyncio.fixture
+async def agent_cards_session(monkeypatch):
+    """Routes the MCP client to an in-memory agent cards server and counts tool calls."""
+    monkeypatch.setattr(server, "_embedder", FakeEmbeddings())
+    monkeypatch.setattr(workflow, "routing_cache", RoutingCache())
+    mcp, _ = server.create_server("localhost", 0, str(AGENT_CARDS_DIR), use_cache=False)
+    calls = []
+
+    @asynccontextmanager
+    async def init_session(host, port, transport):
+        async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+            call_tool = session.call_tool
+
+            async def counting_call_tool(name, arguments=None, *args, **kwargs):
+                calls.append(name)
+                return await call_tool(name, arguments, *args, **kwargs)
+
+            session.call_tool = counting_call_tool
+            yield session
+
+    monkeypatch.setattr(client, "init_session", init_session)
+    yield calls
+    await client.close_session_pool()
+
+
+class TestAgentPrefetch:
+    """Test cases for resolving the agents of planned nodes ahead of execution."""
+
+    @pytest.mark.asyncio
+    async def test_prefetch_routes_all_nodes_in_one_call(self, agent_cards_session):
+        graph = WorkflowGraph()
+        sim = WorkflowNode("run annual simulation")
+        light = WorkflowNode("add daylighting sensors")
+        again = WorkflowNode("Run annual  simulation")
+        for node in (sim, light, again):
+            graph.add_node(node)
+
+        await graph.prefetch_agents()
+        assert agent_cards_session == ["find_agents_batch"]
+        assert sim.agent_card.name == "Energy Simulation Agent"
+        assert light.agent_card.name == "Energy Model Lighting Agent"
+        assert again.agent_card is sim.agent_card
+        # Resolved nodes are not fetched again
+        assert graph.prefetch_agents() is None
+        assert await light.resolve_agent() is light.agent_card
+        assert agent_cards_session == ["find_agents_batch"]
+
+    @pytest.mark.asyncio
+    async def test_planner_agent_is_resolved_once(self):
+        class PlannerNode(WorkflowNode):
+            lookups = 0
+
+            async def get_planner_resource(self):
+                PlannerNode.lookups += 1
+                return FakeNode("Planner Agent", []).agent_card
+
+        planner = PlannerNode("plan the retrofit", node_key="planner")
+        first = await planner.resolve_agent()
+        assert await planner.resolve_agent() is first
+        assert PlannerNode.lookups == 1
+
+
+class TestNodeResultCache:
+    """Test cases for replaying cached node results."""
+
+    @pytest.mark.asyncio
+    async def test_identical_node_is_replayed(self):
+        cache = NodeResultCache()
+        log = []
+        first = WorkflowGraph(node_cache=cache)
+        build(first, log, [], baseline={"delay": 0, "artifact": "EUI 42.5"})
+        first.update_blackboard({"model_path": "/tmp/model.osm"})
+        await drain(first)
+
+        second = WorkflowGraph(node_cache=cache)
+        nodes = build(second, log, [], baseline={"delay": 0, "artifact": "EUI 42.5"})
+        second.set_node_attributes(nodes["baseline"].id, {"task_id": "t2", "context_id": "c2"})
+        second.update_blackboard({"model_path": "/tmp/model.osm"})
+        chunks = await drain(second)
+
+        assert log.count(("start", "baseline")) == 1
+        event = chunks[0].root.result
+        assert event.metadata == {"node_cache": "hit"}
+        assert (event.taskId, event.contextId) == ("t2", "c2")
+        assert second.state == Status.COMPLETED
+        assert cache.stats()["hits"] == 1
+        # The replayed result is the node's result, as if it had run
+        assert nodes["baseline"].results.parts[0].root.text == "EUI 42.5"
+
+    @pytest.mark.asyncio
+    async def test_blackboard_change_misses(self):
+        cache = NodeResultCache()
+        log = []
+        for path in ("/tmp/a.osm", "/tmp/b.osm"):
+            graph = WorkflowGraph(node_cache=cache)
+            build(graph, log, [], baseline={"delay": 0})
+            graph.update_blackboard({"model_path": path})
+            await drain(graph)
+        assert log.count(("start", "baseline")) == 2
+
+    @pytest.mark.asyncio
+    async def test_input_required_is_not_cached(self):
+        cache = NodeResultCache()
+        graph = WorkflowGraph(node_cache=cache)
+        build(graph, [], [], ask={"delay": 0, "ask": True})
+        await drain(graph)
+        assert len(cache) == 0
+
+    def test_ttl_and_tags(self):
+        now = [0.0]
+        cache = NodeResultCache(ttl=10.0, clock=lambda: now[0])
+        cache.put("a", ["chunk"], tags={"Energy Simulation Agent"})
+        cache.put("b", ["chunk"], tags={"Energy Model Lighting Agent"})
+        assert cache.invalidate("Energy Simulation Agent") == 1
+        assert cache.get("a") is None
+        now[0] = 11.0
+        assert cache.get("b") is None
+
+
+class TestIncrementalOrder:
+    """Test cases for the incrementally maintained topological order."""
+
+    def test_backward_edge_reorders(self):
+        graph = WorkflowGraph()
+        nodes = build(graph, [], [("a", "b")], a={}, b={}, c={}, d={})
+        # d was added last but now has to run before a
+        graph.add_edge(nodes["d"].id, nodes["a"].id)
+        graph.add_edge(nodes["c"].id, nodes["d"].id)
+        order = graph.execution_order()
+        position = {node_id: i for i, node_id in enumerate(order)}
+        for u, v in graph.graph.edges:
+            assert position[u] < position[v]
+
+    def test_cycle_is_rejected(self):
+        graph = WorkflowGraph()
+        nodes = build(graph, [], [("a", "b"), ("b", "c")], a={}, b={}, c={})
+        with pytest.raises(ValueError):
+            graph.add_edge(nodes["c"].id, nodes["a"].id)
+        with pytest.raises(ValueError):
+            graph.add_edge(nodes["a"].id, nodes["a"].id)
+        assert not graph.graph.has_edge(nodes["c"].id, nodes["a"].id)
+
+    def test_nodes_use_slots(self):
+        node = WorkflowNode("task")
+        with pytest.raises(AttributeError):
+            node.unknown = 1
@@ -0,0 +1,298 @@
+### In-memory vector index over agent cards.
+import threading
+
+import numpy as np
+
+from automa_ai.mcp_servers.lexical_index import BM25Index
+from automa_ai.mcp_servers.vector_index import (
+    DEFAULT_ANN_THRESHOLD,
+    VectorIndex,
+    build_vector_index,
+)
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    """L2-normalizes a matrix (or a single vector) row-wise.
+
+    Rows with zero norm are left as zeros instead of producing NaNs.
+
+    Args:
+        vectors: An array-like of shape (N, D) or (D,).
+
+    Returns:
+        A C-contiguous float32 array with the same shape as the input.
+    """
+    arr = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(arr, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(arr / norms, dtype=np.float32)
+
+
+DEFAULT_LEXICAL_WEIGHT = 0.3
+
+
+def card_unit_texts(card: dict) -> list[str]:
+    """Splits an agent card into the texts that are embedded and indexed.
+
+    The first unit is the card name and description, followed by one unit per
+    skill (name, description, tags and examples). URLs, capability flags and
+    other metadata are left out so they do not add noise to the match.
+    """
+    name = card.get("name", "")
+    units = [f"{name}: {card.get('description', '')}"]
+    for skill in card.get("skills") or []:
+        parts = [f"{name}: {skill.get('name', '')}", skill.get("description") or ""]
+        if skill.get("tags"):
+            parts.append("Tags: " + ", ".join(skill["tags"]))
+        # Cards in the wild use both "examples" (A2A spec) and "example"
+        examples = skill.get("examples") or skill.get("example")
+        if examples:
+            parts.append("Examples: " + "; ".join(examples))
+        units.append(". ".join(part for part in parts if part))
+    return units
+
+
+class AgentCardIndex:
+    """Holds the loaded agent cards together with their embedding matrix.
+
+    Every card is indexed as one or more units (see ``card_unit_texts``), each
+    with its own embedding. The unit embeddings are stored as one contiguous,
+    L2-normalized float32 matrix of shape (U, D), grouped by card, so a query is
+    scored against every unit with a single matrix product and a card's semantic
+    score is the best score among its units. Semantic search goes through a
+    pluggable VectorIndex: exact brute force for small registries and an
+    approximate IVF index once the unit count reaches ``ann_threshold``.
+
+    When unit texts are given, a BM25 score over the same texts is fused with the
+    semantic score: ``(1 - lexical_weight) * cosine + lexical_weight * bm25``, with
+    BM25 scaled to [0, 1] per query.
+    """
+
+    def __init__(
+        self,
+        card_uris: list[str],
+        agent_cards: list[dict],
+        embeddings,
+        keys: list[str] | None = None,
+        backend: str = "auto",
+        ann_threshold: int = DEFAULT_ANN_THRESHOLD,
+        unit_cards: list[int] | None = None,
+        unit_texts: list[str] | None = None,
+        lexical_weight: float = DEFAULT_LEXICAL_WEIGHT,
+    ):
+        if len(card_uris) != len(agent_cards):
+            raise ValueError("card_uris and agent_cards must have the same length")
+        self.card_uris = list(card_uris)
+        self.agent_cards = list(agent_cards)
+        # Content keys of the embedded units, used to reuse vectors on reload.
+        self.keys = list(keys) if keys is not None else []
+        self.version = 0
+        self.backend = backend
+        self.ann_threshold = ann_threshold
+        self.lexical_weight = lexical_weight if unit_texts is not None else 0.0
+        if len(self.agent_cards):
+            self.matrix = normalize_rows(embeddings)
+        else:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+
+        # Card of every unit row, units of one card are contiguous.
+        self.unit_cards = np.asarray(
+            unit_cards if unit_cards is not None else range(len(self.agent_cards)),
+            dtype=np.int64,
+        )
+        if self.matrix.shape[0] != self.unit_cards.shape[0]:
+            raise ValueError("Expected one embedding per indexed unit")
+        if len(self.unit_cards) and (
+            np.any(np.diff(self.unit_cards) < 0)
+            or set(self.unit_cards.tolist()) != set(range(len(self.agent_cards)))
+        ):
+            raise ValueError("unit_cards must group units by card and cover every card")
+        counts = np.bincount(self.unit_cards, minlength=len(self.agent_cards))
+        self.card_offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        self.lexical_index = (
+            BM25Index(list(unit_texts)) if unit_texts is not None and self.lexical_weight else None
+        )
+        self.vector_index: VectorIndex = build_vector_index(
+            self.matrix, backend, ann_threshold
+        )
+
+        # O(1) lookups, built with the index and swapped together with it.
+        self.by_uri = {uri: card for uri, card in zip(self.card_uris, self.agent_cards)}
+        self.by_name = {}
+        self.by_url = {}
+        for card in self.agent_cards:
+            if card.get("name"):
+                self.by_name.setdefault(card["name"], card)
+            if card.get("url"):
+                self.by_url.setdefault(card["url"], card)
+
+    def __len__(self) -> int:
+        return len(self.agent_cards)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.agent_cards) == 0
+
+    @property
+    def dimension(self) -> int:
+        return self.matrix.shape[1]
+
+    def get_by_uri(self, uri: str) -> dict | None:
+        return self.by_uri.get(uri)
+
+    def get_by_name(self, name: str) -> dict | None:
+        return self.by_name.get(name)
+
+    def get_by_url(self, url: str) -> dict | None:
+        return self.by_url.get(url) or self.by_url.get(url.rstrip("/") + "/") or self.by_url.get(url.rstrip("/"))
+
+    def vectors_by_key(self) -> dict[str, np.ndarray]:
+        """Maps each unit content key to its (normalized) embedding row."""
+        return {key: self.matrix[i] for i, key in enumerate(self.keys)}
+
+    def score(self, query_vec) -> np.ndarray:
+        """Semantic (cosine) score of one query vector for every card, shape (N,)."""
+        return self.score_many([query_vec])[0]
+
+    def score_many(self, query_vecs) -> np.ndarray:
+        """Semantic (cosine) score of M query vectors for every card, shape (M, N)."""
+        unit_scores = normalize_rows(query_vecs) @ self.matrix.T
+        return np.maximum.reduceat(unit_scores, self.card_offsets[:-1], axis=1)
+
+    def lexical_scores(self, query_text: str) -> np.ndarray:
+        """BM25 score of a query for every card scaled to [0, 1], shape (N,)."""
+        scores = np.zeros(len(self.agent_cards), dtype=np.float32)
+        if self.lexical_index is None or not query_text:
+            return scores
+        unit_scores = self.lexical_index.score(query_text)
+        scores = np.maximum.reduceat(unit_scores, self.card_offsets[:-1])
+        best = scores.max()
+        return scores / best if best > 0 else scores
+
+    @staticmethod
+    def rank(scores: np.ndarray, top_k: int = 1, min_score: float | None = None) -> list[tuple[int, float]]:
+        """Ranks a 1-D score vector and returns the best (index, score) pairs.
+
+        Args:
+            scores: Similarity scores, one per card.
+            top_k: Maximum number of candidates to return.
+            min_score: Optional lower bound, candidates scoring below it are dropped.
+
+        Returns:
+            A list of (card index, score) tuples sorted by descending score.
+        """
+        n = scores.shape[0]
+        if n == 0 or top_k <= 0:
+            return []
+        k = min(top_k, n)
+        if k < n:
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(n)
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [
+            (int(i), float(scores[i]))
+            for i in order
+            if np.isfinite(scores[i]) and (min_score is None or scores[i] >= min_score)
+        ]
+
+    def top_k(
+        self,
+        query_vec,
+        top_k: int = 1,
+        min_score: float | None = None,
+        query_text: str | None = None,
+    ) -> list[tuple[int, float]]:
+        """Returns the best matching (card index, score) pairs for one query."""
+        return self.top_k_many(
+            [query_vec], top_k, min_score, [query_text] if query_text else None
+        )[0]
+
+    def top_k_many(
+        self,
+        query_vecs,
+        top_k: int = 1,
+        min_score: float | None = None,
+        query_texts: list[str] | None = None,
+    ) -> list[list[tuple[int, float]]]:
+        """Returns the best matching (card index, score) pairs for each of M queries.
+
+        Args:
+            query_vecs: Query embeddings, one per query.
+            top_k: Maximum number of cards to return per query.
+            min_score: Optional lower bound on the (fused) score.
+            query_texts: Optional query strings, enables the lexical component.
+        """
+        if self.empty or top_k <= 0:
+            return [[] for _ in query_vecs]
+        queries = normalize_rows(query_vecs)
+        approximate = self.vector_index.name != "brute_force"
+        if approximate:
+            semantic = self._approximate_semantic(queries, top_k)
+        else:
+            semantic = self.score_many(queries)
+
+        weight = self.lexical_weight if query_texts else 0.0
+        results = []
+        for row, query_semantic in enumerate(semantic):
+            fused = query_semantic
+            if weight:
+                lexical = self.lexical_scores(query_texts[row])
+                if approximate:
+                    # Cards the lexical score nominates but the ANN search missed get
+                    # an exact semantic score, so they can still win the fusion.
+                    nominated = np.flatnonzero(lexical > 0)
+                    missing = nominated[~np.isfinite(query_semantic[nominated])]
+                    if missing.size:
+                        query_semantic = query_semantic.copy()
+                        query_semantic[missing] = self._exact_card_scores(queries[row], missing)
+                fused = (1.0 - weight) * query_semantic + weight * lexical
+            results.append(self.rank(fused, top_k, min_score))
+        return results
+
+    def _approximate_semantic(self, queries: np.ndarray, top_k: int) -> np.ndarray:
+        """Card semantic scores from the ANN index, -inf for cards without a neighbour hit."""
+        semantic = np.full((queries.shape[0], len(self.agent_cards)), -np.inf, dtype=np.float32)
+        # Several units can belong to one card, so ask for more neighbours than cards
+        unit_ids, unit_scores = self.vector_index.search(queries, max(4 * top_k, 32))
+        for row in range(queries.shape[0]):
+            found = unit_ids[row] >= 0
+            np.maximum.at(semantic[row], self.unit_cards[unit_ids[row][found]], unit_scores[row][found])
+        return semantic
+
+    def _exact_card_scores(self, query: np.ndarray, cards: np.ndarray) -> np.ndarray:
+        """Exact semantic score of one normalized query for the given cards."""
+        starts, ends = self.card_offsets[cards], self.card_offsets[cards + 1]
+        units = np.concatenate([np.arange(a, b) for a, b in zip(starts, ends)])
+        segments = np.concatenate(([0], np.cumsum(ends - starts)[:-1]))
+        return np.maximum.reduceat(self.matrix[units] @ query, segments)
+
+
+class AgentCardIndexHolder:
+    """Holds the current AgentCardIndex and swaps it atomically on reload.
+
+    Readers take ``holder.index`` once per request and keep using that snapshot,
+    so a reload never changes the index underneath an in-flight call.
+    """
+
+    def __init__(self, index: AgentCardIndex):
+        self._lock = threading.Lock()
+        index.version = max(index.version, 1)
+        self._index = index
+
+    @property
+    def index(self) -> AgentCardIndex:
+        return self._index
+
+    @property
+    def version(self) -> int:
+        return self._index.version
+
+    def swap(self, index: AgentCardIndex) -> AgentCardIndex:
+        """Publishes a new index and returns the previous one."""
+        with self._lock:
+            previous = self._index
+            index.version = previous.version + 1
+            self._index = index
+        return previous
@@ -0,0 +1,65 @@
+### Recall and latency benchmark of the agent card vector index backends.
+# Usage: python -m automa_ai.mcp_servers.card_index_benchmark --sizes 100,1000,10000
+import time
+
+import click
+import numpy as np
+
+from automa_ai.mcp_servers.card_index import normalize_rows
+from automa_ai.mcp_servers.vector_index import BruteForceIndex, IVFIndex
+
+
+def synthetic_embeddings(n: int, dim: int, topics: int, rng: np.random.Generator) -> np.ndarray:
+    """Clustered unit vectors, mimicking cards that share a domain (building type, standard, measure)."""
+    centers = normalize_rows(rng.standard_normal((topics, dim)))
+    labels = rng.integers(0, topics, n)
+    noise = rng.standard_normal((n, dim)) / np.sqrt(dim)
+    return normalize_rows(centers[labels] + 0.6 * noise)
+
+
+def measure(index, queries: np.ndarray, top_k: int) -> tuple[np.ndarray, float, float]:
+    """Runs single-query searches and returns (indices, p50 ms, p95 ms)."""
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        indices, _ = index.search(query[None, :], top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(indices[0])
+    return np.array(results), float(np.percentile(latencies, 50)), float(np.percentile(latencies, 95))
+
+
+def recall_at_k(approximate: np.ndarray, exact: np.ndarray) -> float:
+    hits = sum(len(set(a) & set(e)) for a, e in zip(approximate, exact))
+    return hits / exact.size
+
+
+@click.command()
+@click.option("--sizes", default="100,1000,5000,20000", help="Comma separated card counts")
+@click.option("--dim", default=1024, help="Embedding dimension (mxbai-embed-large is 1024)")
+@click.option("--queries", "num_queries", default=200, help="Queries per size")
+@click.option("--top_k", default=5, help="Neighbours per query")
+@click.option("--seed", default=0, help="Random seed")
+def cli(sizes, dim, num_queries, top_k, seed):
+    """Reports recall@k and per-query latency of the brute force and IVF indexes."""
+    rng = np.random.default_rng(seed)
+    print(f"{'cards':>8} {'backend':>12} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8} {'build ms':>9}")
+    for n in (int(size) for size in sizes.split(",")):
+        matrix = synthetic_embeddings(n, dim, max(8, n // 50), rng)
+        # Queries are paraphrases: perturbed copies of existing cards
+        noise = rng.standard_normal((num_queries, dim)) / np.sqrt(dim)
+        queries = normalize_rows(matrix[rng.integers(0, n, num_queries)] + 0.4 * noise)
+        exact = None
+        for backend in (BruteForceIndex, IVFIndex):
+            start = time.perf_counter()
+            index = backend(matrix)
+            build_ms = (time.perf_counter() - start) * 1000
+            found, p50, p95 = measure(index, queries, top_k)
+            if exact is None:
+                exact = found
+            recall = recall_at_k(found, exact)
+            print(f"{n:>8} {backend.name:>12} {recall:>9.3f} {p50:>8.3f} {p95:>8.3f} {build_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from automa_ai.mcp_servers.card_index import (
+    AgentCardIndex,
+    card_unit_texts,
+    normalize_rows,
+)
+
+
+class TestAgentCardIndex:
+    """Test cases for the vectorized agent card index."""
+
+    @pytest.fixture
+    def index(self):
+        embeddings = [[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [1.0, 1.0, 0.0]]
+        return AgentCardIndex(
+            ["resource://agent_cards/a", "resource://agent_cards/b", "resource://agent_cards/c"],
+            [{"name": "a"}, {"name": "b"}, {"name": "c"}],
+            embeddings,
+        )
+
+    def test_matrix_is_normalized_float32(self, index):
+        assert index.matrix.dtype == np.float32
+        assert index.matrix.flags["C_CONTIGUOUS"]
+        np.testing.assert_allclose(np.linalg.norm(index.matrix, axis=1), 1.0, rtol=1e-6)
+
+    def test_top_k_is_ranked(self, index):
+        ranked = index.top_k([0.0, 1.0, 0.0], top_k=3)
+        assert [i for i, _ in ranked] == [1, 2, 0]
+        assert ranked[0][1] == pytest.approx(1.0)
+
+    def test_top_k_min_score(self, index):
+        ranked = index.top_k([1.0, 0.0, 0.0], top_k=3, min_score=0.5)
+        assert [i for i, _ in ranked] == [0, 2]
+
+    def test_top_k_larger_than_index(self, index):
+        assert len(index.top_k([1.0, 0.0, 0.0], top_k=10)) == 3
+
+    def test_score_many(self, index):
+        scores = index.score_many([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+        assert scores.shape == (2, 3)
+        assert int(np.argmax(scores[1])) == 1
+
+    def test_empty_index(self):
+        index = AgentCardIndex([], [], [])
+        assert index.empty
+        assert index.top_k([1.0, 0.0]) == []
+
+    def test_zero_vector_is_not_nan(self):
+        assert not np.isnan(normalize_rows([0.0, 0.0])).any()
+
+
+class TestHybridRanking:
+    """Test cases for skill level units and BM25 fusion."""
+
+    CARDS = [
+        {
+            "name": "Energy Simulation Agent",
+            "description": "Runs simulations",
+            "url": "http://localhost:10105/",
+            "skills": [
+                {
+                    "name": "Annual simulation",
+                    "description": "Run an annual EnergyPlus simulation",
+                    "tags": ["simulation"],
+                    "example": ["run annual simulation of the model"],
+                }
+            ],
+        },
+        {
+            "name": "Energy Model Lighting Agent",
+            "description": "Updates lighting",
+            "url": "http://localhost:10104/",
+            "skills": [
+                {"name": "Daylighting", "description": "Add daylighting sensors", "tags": ["lighting"]},
+                {"name": "LPD", "description": "Change lighting power density"},
+            ],
+        },
+    ]
+
+    def build(self, embeddings, lexical_weight=0.5, backend="brute_force"):
+        texts, unit_cards = [], []
+        for idx, card in enumerate(self.CARDS):
+            units = card_unit_texts(card)
+            texts.extend(units)
+            unit_cards.extend([idx] * len(units))
+        return AgentCardIndex(
+            ["resource://agent_cards/sim", "resource://agent_cards/light"],
+            self.CARDS,
+            embeddings,
+            unit_cards=unit_cards,
+            unit_texts=texts,
+            lexical_weight=lexical_weight,
+            backend=backend,
+        )
+
+    def test_unit_texts_skip_metadata(self):
+        units = card_unit_texts(self.CARDS[0])
+        assert len(units) == 2
+        assert "localhost" not in " ".join(units)
+        assert "Examples: run annual simulation of the model" in units[1]
+
+    def test_card_score_is_best_unit(self):
+        embeddings = [[1, 0, 0], [0, 1, 0], [0, 0, 1], [0, 1, 1], [1, 1, 0]]
+        index = self.build(embeddings, lexical_weight=0.0)
+        np.testing.assert_allclose(index.score([0, 0, 1]), [0.0, 1.0], atol=1e-6)
+
+    def test_lexical_breaks_semantic_tie(self):
+        # Every unit has the same embedding, only BM25 can tell the cards apart
+        index = self.build([[1, 0, 0]] * 5)
+        ranked = index.top_k([1, 0, 0], top_k=2, query_text="run annual simulation")
+        assert ranked[0][0] == 0
+        ranked = index.top_k([1, 0, 0], top_k=2, query_text="add daylighting sensors")
+        assert ranked[0][0] == 1
+
+    def test_unit_cards_must_be_grouped(self):
+        with pytest.raises(ValueError):
+            AgentCardIndex(["a", "b"], [{}, {}], [[1, 0], [0, 1], [1, 1]], unit_cards=[0, 1, 0])
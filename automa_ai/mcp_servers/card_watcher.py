@@ -0,0 +1,103 @@
+### Polling watcher for the agent cards directory.
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CardDirectoryChanges:
+    """Agent card files added, changed or deleted since the previous scan."""
+
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.deleted)
+
+
+def scan_card_files(directory: str | Path) -> dict[str, tuple[int, int]]:
+    """Returns {filename: (mtime_ns, size)} for every ``*.json`` file in a directory."""
+    snapshot = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except OSError as e:
+        logger.error(f"Failed to scan agent cards directory {directory}: {e}")
+    return snapshot
+
+
+def diff_snapshots(
+    before: dict[str, tuple[int, int]], after: dict[str, tuple[int, int]]
+) -> CardDirectoryChanges:
+    return CardDirectoryChanges(
+        added=sorted(after.keys() - before.keys()),
+        changed=sorted(name for name in after.keys() & before.keys() if after[name] != before[name]),
+        deleted=sorted(before.keys() - after.keys()),
+    )
+
+
+class CardDirectoryWatcher:
+    """Polls an agent cards directory and reports added, changed and deleted cards.
+
+    The callback runs on the watcher thread. Exceptions raised by the callback are
+    logged and the changes are retried on the next poll.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        on_change: Callable[[CardDirectoryChanges], None],
+        interval: float = 2.0,
+    ):
+        self.directory = Path(directory)
+        self.on_change = on_change
+        self.interval = interval
+        self._snapshot = scan_card_files(self.directory)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def poll(self) -> CardDirectoryChanges:
+        """Scans the directory once and invokes the callback if anything changed."""
+        current = scan_card_files(self.directory)
+        changes = diff_snapshots(self._snapshot, current)
+        if changes:
+            logger.info(
+                f"Agent cards changed in {self.directory}: added={changes.added}, "
+                f"changed={changes.changed}, deleted={changes.deleted}"
+            )
+            try:
+                self.on_change(changes)
+            except Exception as e:
+                logger.error(f"Failed to reload agent cards: {e}", exc_info=True)
+                return changes
+        self._snapshot = current
+        return changes
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="agent-card-watcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Watching {self.directory} for agent card changes every {self.interval}s")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
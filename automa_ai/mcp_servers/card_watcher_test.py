@@ -0,0 +1,49 @@
+import json
+import os
+
+from automa_ai.mcp_servers.card_watcher import CardDirectoryWatcher
+
+
+class TestCardDirectoryWatcher:
+    """Test cases for the polling agent cards watcher."""
+
+    @staticmethod
+    def write_card(path, name, mtime_ns=None):
+        path.write_text(json.dumps({"name": name}))
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_detects_added_changed_deleted(self, tmp_path):
+        self.write_card(tmp_path / "a.json", "a", 1_000_000_000)
+        self.write_card(tmp_path / "b.json", "b", 1_000_000_000)
+        (tmp_path / "notes.txt").write_text("ignored")
+        seen = []
+        watcher = CardDirectoryWatcher(tmp_path, seen.append)
+
+        assert not watcher.poll()
+
+        self.write_card(tmp_path / "a.json", "a2", 2_000_000_000)
+        (tmp_path / "b.json").unlink()
+        self.write_card(tmp_path / "c.json", "c")
+        changes = watcher.poll()
+
+        assert changes.added == ["c.json"]
+        assert changes.changed == ["a.json"]
+        assert changes.deleted == ["b.json"]
+        assert seen == [changes]
+        assert not watcher.poll()
+
+    def test_failed_callback_is_retried(self, tmp_path):
+        calls = []
+
+        def on_change(changes):
+            calls.append(changes)
+            if len(calls) == 1:
+                raise RuntimeError("embedding backend unavailable")
+
+        watcher = CardDirectoryWatcher(tmp_path, on_change)
+        self.write_card(tmp_path / "a.json", "a")
+        watcher.poll()
+        watcher.poll()
+        assert len(calls) == 2
+        assert calls[1].added == ["a.json"]
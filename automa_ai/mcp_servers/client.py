@@ -1,14 +1,18 @@
 import asyncio
 import json
 import logging
+import time
 from contextlib import asynccontextmanager
 
+import anyio
 import click
 from mcp import ClientSession, StdioServerParameters, stdio_client
 from mcp.client.sse import sse_client
 from mcp.server.fastmcp.utilities.logging import get_logger
 from mcp.types import CallToolResult, ReadResourceResult
 
+from automa_ai.common import tracing
+
 logging.basicConfig(
     filename="mcp_client.log",
     filemode="w",  # Overwrite each run
@@ -72,6 +76,226 @@ async def init_session(host, port, transport):
         )
 
 
+# Errors that mean the underlying stream is gone and the session must be replaced.
+TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+)
+
+
+class _PooledSession:
+    """A warm, initialized MCP session kept open by a background task.
+
+    The transport context managers are entered and exited by the same task, as
+    anyio requires, while any number of borrowers send requests through the
+    session concurrently.
+    """
+
+    def __init__(self, host, port, transport):
+        self.host = host
+        self.port = port
+        self.transport = transport
+        self.session: ClientSession | None = None
+        self.borrowers = 0
+        self.last_used = time.monotonic()
+        self.broken = False
+        self._closing = asyncio.Event()
+        self._ready: asyncio.Future | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            not self.broken
+            and self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def open(self) -> None:
+        self._ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(
+            self._run(), name=f"mcp-session-{self.host}:{self.port}"
+        )
+        await self._ready
+
+    async def _run(self):
+        try:
+            async with init_session(self.host, self.port, self.transport) as session:
+                self.session = session
+                self._ready.set_result(None)
+                await self._closing.wait()
+        except Exception as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                logger.warning(f"MCP session to {self.host}:{self.port} dropped: {e}")
+        finally:
+            self.session = None
+            self.broken = True
+            if not self._ready.done():
+                self._ready.set_exception(ConnectionError("MCP session closed during setup"))
+
+    async def close(self, timeout: float = 5.0) -> None:
+        self.broken = True
+        self._closing.set()
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except (asyncio.TimeoutError, Exception):
+            self._task.cancel()
+
+
+class MCPSessionPool:
+    """Pool of warm, initialized MCP client sessions keyed by (host, port, transport).
+
+    ``init_session`` pays a full connect and ``initialize`` handshake per use; the
+    pool keeps sessions open so cheap calls (routing, resource reads) skip it.
+    A session is shared by up to ``max_borrowers_per_session`` concurrent
+    borrowers and at most ``max_sessions_per_key`` sessions are opened per server.
+    Sessions idle for longer than ``health_check_interval`` seconds are pinged
+    before reuse, and sessions whose streams dropped are replaced.
+
+    Example:
+        async with pool.borrow(host, port, transport) as session:
+            await find_agent(session, query)
+    """
+
+    def __init__(
+        self,
+        max_sessions_per_key: int = 4,
+        max_borrowers_per_session: int = 8,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 5.0,
+    ):
+        self.max_sessions_per_key = max_sessions_per_key
+        self.max_borrowers_per_session = max_borrowers_per_session
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self._sessions: dict[tuple, list[_PooledSession]] = {}
+        self._locks: dict[tuple, asyncio.Lock] = {}
+        self._closed = False
+        self.loop = asyncio.get_running_loop()
+        self.connects = 0
+        self.reuses = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def _acquire(self, key: tuple) -> _PooledSession:
+        if self._closed:
+            raise RuntimeError("MCPSessionPool is closed")
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            sessions = [s for s in self._sessions.get(key, []) if s.alive]
+            self._sessions[key] = sessions
+            pooled = min(sessions, key=lambda s: s.borrowers, default=None)
+            if pooled is not None and (
+                pooled.borrowers < self.max_borrowers_per_session
+                or len(sessions) >= self.max_sessions_per_key
+            ):
+                if await self._healthy(pooled):
+                    self.reuses += 1
+                    pooled.borrowers += 1
+                    return pooled
+                sessions.remove(pooled)
+                await pooled.close()
+            pooled = _PooledSession(*key)
+            with tracing.span("mcp.connect", server=f"{key[0]}:{key[1]}"):
+                await pooled.open()
+            self.connects += 1
+            sessions.append(pooled)
+            pooled.borrowers += 1
+            return pooled
+
+    async def _healthy(self, pooled: _PooledSession) -> bool:
+        if time.monotonic() - pooled.last_used < self.health_check_interval:
+            return True
+        try:
+            await asyncio.wait_for(pooled.session.send_ping(), self.health_check_timeout)
+            return True
+        except Exception as e:
+            logger.info(f"MCP session to {pooled.host}:{pooled.port} failed health check: {e}")
+            return False
+
+    @asynccontextmanager
+    async def borrow(self, host, port, transport):
+        """Borrows an initialized ClientSession for (host, port, transport).
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+        """
+        pooled = await self._acquire((host, port, transport))
+        try:
+            yield pooled.session
+        except TRANSPORT_ERRORS:
+            # Do not hand this session out again
+            pooled.broken = True
+            raise
+        finally:
+            pooled.borrowers -= 1
+            pooled.last_used = time.monotonic()
+            if pooled.broken and pooled.borrowers == 0:
+                await pooled.close()
+
+    async def run(self, host, port, transport, call, retries: int = 1):
+        """Runs ``await call(session)`` on a pooled session, reconnecting on transport errors."""
+        for attempt in range(retries + 1):
+            try:
+                with tracing.span("mcp.call", server=f"{host}:{port}", attempt=attempt):
+                    async with self.borrow(host, port, transport) as session:
+                        return await call(session)
+            except TRANSPORT_ERRORS as e:
+                if attempt == retries:
+                    raise
+                logger.info(f"Retrying MCP call to {host}:{port} on a new session after: {e!r}")
+
+    def stats(self) -> dict:
+        return {
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "sessions": {
+                f"{host}:{port}/{transport}": len([s for s in sessions if s.alive])
+                for (host, port, transport), sessions in self._sessions.items()
+            },
+        }
+
+    async def close(self) -> None:
+        """Closes every pooled session, later borrows raise RuntimeError."""
+        self._closed = True
+        sessions = [s for group in self._sessions.values() for s in group]
+        self._sessions.clear()
+        await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+        logger.info(f"Closed MCP session pool ({len(sessions)} sessions)")
+
+
+_session_pool: MCPSessionPool | None = None
+
+
+def get_session_pool() -> MCPSessionPool:
+    """Returns the process wide MCP session pool of the running event loop."""
+    global _session_pool
+    if (
+        _session_pool is None
+        or _session_pool.closed
+        or _session_pool.loop is not asyncio.get_running_loop()
+    ):
+        _session_pool = MCPSessionPool()
+    return _session_pool
+
+
+async def close_session_pool() -> None:
+    """Closes the process wide MCP session pool, if one was created in this event loop."""
+    global _session_pool
+    pool, _session_pool = _session_pool, None
+    if pool is not None and not pool.closed and pool.loop is asyncio.get_running_loop():
+        await pool.close()
+
+
 async def find_agent(session: ClientSession, query) -> CallToolResult:
     """Calls the 'find_agent' tool on the connected MCP server.
 
@@ -91,6 +315,76 @@ async def find_agent(session: ClientSession, query) -> CallToolResult:
     )
 
 
+async def find_agents(
+    session: ClientSession, query, top_k: int = 3, min_score: float | None = None
+) -> CallToolResult:
+    """Calls the 'find_agents' tool on the connected MCP server.
+
+    Args:
+        session: The active ClientSession.
+        query: The natural language query to send to the 'find_agents' tool.
+        top_k: Maximum number of ranked candidates to return.
+        min_score: Optional minimum similarity score for a candidate.
+
+    Returns:
+        The result of the tool call, a json object with a ``matches`` list.
+    """
+    logger.info(f"Calling 'find_agents' tool with query: '{query[:50]}', top_k={top_k}")
+    arguments = {"query": query, "top_k": top_k}
+    if min_score is not None:
+        arguments["min_score"] = min_score
+    return await session.call_tool(name="find_agents", arguments=arguments)
+
+
+async def find_agents_batch(
+    session: ClientSession,
+    queries: list[str],
+    top_k: int = 1,
+    min_score: float | None = None,
+) -> CallToolResult:
+    """Calls the 'find_agents_batch' tool to route many queries in one round trip.
+
+    Args:
+        session: The active ClientSession.
+        queries: The natural language task descriptions to route.
+        top_k: Maximum number of ranked candidates per query.
+        min_score: Optional minimum similarity score for a candidate.
+
+    Returns:
+        The result of the tool call, a json object with a ``results`` list
+        (one ``{"query", "matches"}`` entry per query) and the index ``version``.
+    """
+    logger.info(f"Calling 'find_agents_batch' tool with {len(queries)} queries, top_k={top_k}")
+    arguments = {"queries": list(queries), "top_k": top_k}
+    if min_score is not None:
+        arguments["min_score"] = min_score
+    return await session.call_tool(name="find_agents_batch", arguments=arguments)
+
+
+async def route_queries(
+    host, port, transport, queries: list[str], top_k: int = 1
+) -> list[list[dict]]:
+    """Routes a whole plan of task descriptions to agent cards in a single call.
+
+    Args:
+        host: The hostname or IP address of the agent cards MCP server.
+        port: The port number of the agent cards MCP server.
+        transport: The communication transport to use ('sse' or 'stdio').
+        queries: The task descriptions to route.
+        top_k: Maximum number of ranked candidates per query.
+
+    Returns:
+        One ranked list of ``{"card_uri", "score", "agent_card"}`` per query.
+    """
+    if not queries:
+        return []
+    result = await get_session_pool().run(
+        host, port, transport, lambda session: find_agents_batch(session, queries, top_k)
+    )
+    data = json.loads(result.content[0].text)
+    return [entry["matches"] for entry in data["results"]]
+
+
 async def find_resource(session: ClientSession, resource) -> ReadResourceResult:
     """Reads a resource from the connected MCP server.
 
@@ -0,0 +1,84 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from automa_ai.mcp_servers import client
+
+
+@pytest.fixture
+def in_memory_sessions(monkeypatch):
+    """Replaces the network transport with in-memory sessions to a tiny FastMCP server."""
+    mcp = FastMCP("pool-test")
+
+    @mcp.tool()
+    async def echo(text: str) -> str:
+        await asyncio.sleep(0.01)
+        return text
+
+    opened = []
+
+    @asynccontextmanager
+    async def init_session(host, port, transport):
+        async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+            opened.append(session)
+            yield session
+
+    monkeypatch.setattr(client, "init_session", init_session)
+    return opened
+
+
+class TestMCPSessionPool:
+    """Test cases for the pooled MCP client sessions."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_reused(self, in_memory_sessions):
+        pool = client.MCPSessionPool()
+        for _ in range(3):
+            async with pool.borrow("localhost", 10100, "sse") as session:
+                result = await session.call_tool("echo", {"text": "hi"})
+                assert result.content[0].text == "hi"
+        assert len(in_memory_sessions) == 1
+        assert pool.stats()["reuses"] == 2
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_borrowers_share_sessions(self, in_memory_sessions):
+        pool = client.MCPSessionPool(max_sessions_per_key=2, max_borrowers_per_session=4)
+
+        async def call(i):
+            async with pool.borrow("localhost", 10100, "sse") as session:
+                result = await session.call_tool("echo", {"text": str(i)})
+                return result.content[0].text
+
+        results = await asyncio.gather(*(call(i) for i in range(16)))
+        assert results == [str(i) for i in range(16)]
+        assert len(in_memory_sessions) <= 2
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_broken_session_is_replaced(self, in_memory_sessions):
+        pool = client.MCPSessionPool()
+        calls = []
+
+        async def flaky(session):
+            calls.append(session)
+            if len(calls) == 1:
+                raise ConnectionError("stream dropped")
+            return await session.call_tool("echo", {"text": "ok"})
+
+        result = await pool.run("localhost", 10100, "sse", flaky)
+        assert result.content[0].text == "ok"
+        assert len(in_memory_sessions) == 2
+        assert calls[0] is not calls[1]
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_closed_pool_rejects_borrow(self, in_memory_sessions):
+        pool = client.MCPSessionPool()
+        await pool.close()
+        with pytest.raises(RuntimeError):
+            async with pool.borrow("localhost", 10100, "sse"):
+                pass
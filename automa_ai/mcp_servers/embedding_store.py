@@ -0,0 +1,244 @@
+### Persistent, content-addressed embedding cache for the agent cards server.
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_NAME = ".agent_card_embeddings.sqlite"
+
+
+def canonical_json(data) -> str:
+    """Serializes data to a stable json string (sorted keys, no whitespace)."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def content_key(content, model: str) -> str:
+    """SHA-256 key of a piece of content combined with the embedding model name.
+
+    Args:
+        content: A string, or any json serializable object (hashed in canonical form).
+        model: Name of the embedding model that produces the vector.
+    """
+    text = content if isinstance(content, str) else canonical_json(content)
+    digest = hashlib.sha256()
+    digest.update(model.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+    """SQLite backed store of embedding vectors keyed by content hash.
+
+    The store lives next to the agent cards (see ``DEFAULT_STORE_NAME``) so that
+    restarting the MCP server only re-embeds cards that are new or changed.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+            )
+
+    @classmethod
+    def for_directory(cls, directory: str | Path) -> "EmbeddingStore | None":
+        """Opens the sidecar store of a cards directory, or None if it cannot be created."""
+        try:
+            return cls(Path(directory) / DEFAULT_STORE_NAME)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Embedding cache disabled, cannot open store in {directory}: {e}")
+            return None
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        """Returns the cached vectors for the given keys, missing keys are omitted."""
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            # Stay below SQLite's bound parameter limit
+            for start in range(0, len(unique_keys), 500):
+                batch = unique_keys[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, dim, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32, count=dim)
+        return found
+
+    def put_many(self, items: dict[str, Sequence[float]], model: str) -> None:
+        rows = []
+        for key, vector in items.items():
+            arr = np.asarray(vector, dtype=np.float32)
+            rows.append((key, model, int(arr.shape[0]), arr.tobytes()))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vector) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def prune(self, keep_keys: Sequence[str], model: str) -> int:
+        """Deletes the vectors of a model that are not listed in keep_keys.
+
+        Returns:
+            The number of deleted entries.
+        """
+        keep = set(keep_keys)
+        with self._lock, self._conn:
+            stale = [
+                (key,)
+                for (key,) in self._conn.execute(
+                    "SELECT key FROM embeddings WHERE model = ?", (model,)
+                )
+                if key not in keep
+            ]
+            self._conn.executemany("DELETE FROM embeddings WHERE key = ?", stale)
+        return len(stale)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def embed_with_cache(
+    texts: Sequence[str],
+    keys: Sequence[str],
+    embed_documents: Callable[[list[str]], list[list[float]]],
+    model: str,
+    store: EmbeddingStore | None = None,
+    known: dict[str, np.ndarray] | None = None,
+) -> tuple[np.ndarray, int, int]:
+    """Embeds texts, reusing vectors found in the store and saving new ones.
+
+    Args:
+        texts: The texts to embed.
+        keys: Content keys for the texts (see ``content_key``), same length as texts.
+        embed_documents: Batch embedding function used for cache misses.
+        model: Embedding model name, recorded with new entries.
+        store: Optional embedding store, when None every text is embedded.
+        known: Optional in-memory vectors by key (e.g. from the previous index),
+            checked before the store.
+
+    Returns:
+        A tuple of (float32 matrix of shape (N, D), cache hits, cache misses).
+    """
+    if len(texts) != len(keys):
+        raise ValueError("texts and keys must have the same length")
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32), 0, 0
+
+    cached = {key: known[key] for key in keys if known and key in known}
+    if store and len(cached) < len(keys):
+        cached.update(store.get_many([key for key in keys if key not in cached]))
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    if missing:
+        new_vectors = embed_documents([texts[i] for i in missing])
+        fresh = {keys[i]: np.asarray(vec, dtype=np.float32) for i, vec in zip(missing, new_vectors)}
+        if store:
+            try:
+                store.put_many(fresh, model)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist {len(fresh)} embeddings: {e}")
+        cached.update(fresh)
+
+    matrix = np.vstack([cached[key] for key in keys]).astype(np.float32, copy=False)
+    return matrix, len(texts) - len(missing), len(missing)
+
+
+def normalize_query(text: str) -> str:
+    """Normalizes query text for cache lookups (case and whitespace insensitive)."""
+    return " ".join(text.split()).lower()
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU cache from normalized query text to its embedding vector.
+
+    Entries expire ``ttl`` seconds after insertion (never when ttl is None).
+    Hit and miss counters are kept so callers can confirm that repeated
+    routing requests skip the embedding round trip.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = 3600.0, clock: Callable[[], float] = time.monotonic):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str) -> np.ndarray | None:
+        key = normalize_query(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or self._clock() - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, text: str, vector) -> None:
+        key = normalize_query(text)
+        with self._lock:
+            self._entries[key] = (self._clock(), np.asarray(vector, dtype=np.float32))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_embed(self, text: str, embed_query: Callable[[str], list[float]]) -> np.ndarray:
+        vector = self.get(text)
+        if vector is None:
+            vector = np.asarray(embed_query(text), dtype=np.float32)
+            self.put(text, vector)
+        return vector
+
+    def get_or_embed_many(
+        self, texts: Sequence[str], embed_documents: Callable[[list[str]], list[list[float]]]
+    ) -> list[np.ndarray]:
+        """Looks up many queries and embeds all misses with one batch call."""
+        vectors = [self.get(text) for text in texts]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            # Embed each distinct normalized text once
+            unique = list(dict.fromkeys(normalize_query(texts[i]) for i in missing))
+            embedded = dict(zip(unique, embed_documents(unique)))
+            for i in missing:
+                vectors[i] = np.asarray(embedded[normalize_query(texts[i])], dtype=np.float32)
+                self.put(texts[i], vectors[i])
+        return vectors
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
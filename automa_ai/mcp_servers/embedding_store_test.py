@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from automa_ai.mcp_servers.embedding_store import (
+    EmbeddingStore,
+    QueryEmbeddingCache,
+    content_key,
+    embed_with_cache,
+)
+
+MODEL = "test-embed"
+
+
+class TestEmbeddingStore:
+    """Test cases for the content-hashed embedding cache."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = EmbeddingStore.for_directory(tmp_path)
+        yield store
+        store.close()
+
+    @staticmethod
+    def fake_embedder(calls):
+        def embed(docs):
+            calls.append(list(docs))
+            return [[float(len(doc)), 1.0] for doc in docs]
+
+        return embed
+
+    def test_content_key_is_canonical(self):
+        assert content_key({"a": 1, "b": 2}, MODEL) == content_key({"b": 2, "a": 1}, MODEL)
+        assert content_key({"a": 1}, MODEL) != content_key({"a": 1}, "other-model")
+
+    def test_only_misses_are_embedded(self, store):
+        calls = []
+        texts = ["card one", "card two"]
+        keys = [content_key(t, MODEL) for t in texts]
+        matrix, hits, misses = embed_with_cache(texts, keys, self.fake_embedder(calls), MODEL, store)
+        assert (hits, misses) == (0, 2)
+        assert matrix.shape == (2, 2)
+
+        texts.append("card three!")
+        keys.append(content_key(texts[-1], MODEL))
+        matrix, hits, misses = embed_with_cache(texts, keys, self.fake_embedder(calls), MODEL, store)
+        assert (hits, misses) == (2, 1)
+        assert calls[-1] == ["card three!"]
+        np.testing.assert_allclose(matrix[2], [11.0, 1.0])
+
+    def test_persists_across_instances(self, tmp_path, store):
+        calls = []
+        keys = [content_key("card", MODEL)]
+        embed_with_cache(["card"], keys, self.fake_embedder(calls), MODEL, store)
+        reopened = EmbeddingStore.for_directory(tmp_path)
+        _, hits, misses = embed_with_cache(["card"], keys, self.fake_embedder(calls), MODEL, reopened)
+        reopened.close()
+        assert (hits, misses) == (1, 0)
+        assert len(calls) == 1
+
+    def test_prune(self, store):
+        store.put_many({"k1": [1.0], "k2": [2.0]}, MODEL)
+        assert store.prune(["k1"], MODEL) == 1
+        assert set(store.get_many(["k1", "k2"])) == {"k1"}
+
+
+class TestQueryEmbeddingCache:
+    """Test cases for the in-memory query embedding LRU."""
+
+    def test_hits_on_normalized_text(self):
+        calls = []
+        cache = QueryEmbeddingCache(maxsize=4, ttl=None)
+        embed = lambda text: calls.append(text) or [1.0, 0.0]
+        cache.get_or_embed("Run annual  simulation", embed)
+        cache.get_or_embed("run annual simulation ", embed)
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["hit_rate"] == pytest.approx(0.5)
+
+    def test_get_or_embed_many_batches_misses(self):
+        calls = []
+        cache = QueryEmbeddingCache(maxsize=8, ttl=None)
+        cache.put("known task", [0.0, 1.0])
+
+        def embed_documents(texts):
+            calls.append(list(texts))
+            return [[1.0, 0.0] for _ in texts]
+
+        vectors = cache.get_or_embed_many(["Known task", "new task", "New  task", "other"], embed_documents)
+        assert calls == [["new task", "other"]]
+        assert len(vectors) == 4
+        np.testing.assert_allclose(vectors[0], [0.0, 1.0])
+
+    def test_lru_eviction(self):
+        cache = QueryEmbeddingCache(maxsize=2, ttl=None)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.get("a")
+        cache.put("c", [3.0])
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = QueryEmbeddingCache(maxsize=2, ttl=10.0, clock=lambda: now[0])
+        cache.put("a", [1.0])
+        now[0] = 5.0
+        assert cache.get("a") is not None
+        now[0] = 11.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
@@ -8,6 +8,7 @@ from chromadb.utils import embedding_functions
 from mcp.server import FastMCP
 from mcp.server.fastmcp.utilities.logging import get_logger
 
+from automa_ai.common.artifact_store import register_artifact_tools
 from automa_ai.common.chunk import chunk_idd_objects
 
 logger = get_logger(__name__)
@@ -423,6 +424,8 @@ def serve(host, port, transport):
     """
     logger.info("Starting EnergyPlus MCP Server")
     mcp = FastMCP("eplus-tools", host=host, port=port)
+    # Object lists can be large, let agents pass them by reference
+    register_artifact_tools(mcp)
 
     @mcp.tool(
         name="find_energyplus_object_schema",
@@ -0,0 +1,58 @@
+### BM25 lexical scoring over agent card skill texts.
+import re
+from collections import Counter
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)*")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or the this to with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercases text and splits it into word tokens, dropping common stop words.
+
+    Dotted numbers such as "90.1" are kept as one token.
+    """
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed set of documents.
+
+    Term weights are precomputed per posting list, so scoring a query is one
+    vectorized scatter-add per query term.
+    """
+
+    def __init__(self, documents: list[str], k1: float = 1.5, b: float = 0.75):
+        self.size = len(documents)
+        tokenized = [tokenize(doc) for doc in documents]
+        lengths = np.array([len(tokens) for tokens in tokenized], dtype=np.float32)
+        avg_length = float(lengths.mean()) if self.size and lengths.mean() > 0 else 1.0
+
+        postings: dict[str, tuple[list[int], list[int]]] = {}
+        for doc_id, tokens in enumerate(tokenized):
+            for term, count in Counter(tokens).items():
+                ids, counts = postings.setdefault(term, ([], []))
+                ids.append(doc_id)
+                counts.append(count)
+
+        # term -> (document ids, BM25 weights)
+        self.postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for term, (ids, counts) in postings.items():
+            ids = np.array(ids, dtype=np.int64)
+            tf = np.array(counts, dtype=np.float32)
+            idf = np.log(1.0 + (self.size - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = tf + k1 * (1.0 - b + b * lengths[ids] / avg_length)
+            self.postings[term] = (ids, (idf * tf * (k1 + 1.0) / norm).astype(np.float32))
+
+    def score(self, query: str) -> np.ndarray:
+        """BM25 score of the query against every document, shape (N,)."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                # Document ids are unique within a posting list
+                scores[posting[0]] += posting[1]
+        return scores
@@ -2,17 +2,36 @@
 import json
 import logging
 import os
+import time
 from pathlib import Path
+from urllib.parse import unquote
 
-import numpy as np
 from langchain_ollama import OllamaEmbeddings
 from mcp.server import FastMCP
 from mcp.server.fastmcp.utilities.logging import get_logger
-import pandas as pd
+
+from automa_ai.common.artifact_store import register_artifact_tools
+from automa_ai.mcp_servers.card_index import (
+    DEFAULT_LEXICAL_WEIGHT,
+    AgentCardIndex,
+    AgentCardIndexHolder,
+    card_unit_texts,
+)
+from automa_ai.mcp_servers.card_watcher import CardDirectoryChanges, CardDirectoryWatcher
+from automa_ai.mcp_servers.embedding_store import (
+    EmbeddingStore,
+    QueryEmbeddingCache,
+    content_key,
+    embed_with_cache,
+)
 
 # BASE_DIR = Path(__file__).resolve().parent.parent  # goes from automa_ai/mcp_servers/ -> automa_ai/
 # AGENT_CARDS_DIR = BASE_DIR / "agent_cards"
 MODEL = "ollama_chat/llama3.1:8b"
+EMBEDDING_MODEL = "mxbai-embed-large"
+QUERY_CACHE_SIZE = 1024
+QUERY_CACHE_TTL = 3600.0  # seconds
+INDEX_BACKEND = "auto"  # "auto" picks brute force or IVF by card count
 
 logging.basicConfig(
     filename="mcp_server.log",
@@ -22,6 +41,25 @@ logging.basicConfig(
 )
 logger = get_logger(__name__)
 
+# One embedding client per server process, created on first use.
+_embedder: OllamaEmbeddings | None = None
+query_embedding_cache = QueryEmbeddingCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL)
+
+
+def get_embedder() -> OllamaEmbeddings:
+    """Returns the process wide embedding client."""
+    global _embedder
+    if _embedder is None:
+        _embedder = OllamaEmbeddings(model=EMBEDDING_MODEL)
+    return _embedder
+
+
+def configure_query_cache(size: int = QUERY_CACHE_SIZE, ttl: float | None = QUERY_CACHE_TTL):
+    """Replaces the query embedding cache with one of the given size and TTL (seconds)."""
+    global query_embedding_cache
+    query_embedding_cache = QueryEmbeddingCache(size, ttl)
+    return query_embedding_cache
+
 
 def generate_embeddings(text):
     """
@@ -29,8 +67,12 @@ def generate_embeddings(text):
     :param text:
     :return:
     """
-    embed_model = OllamaEmbeddings(model="mxbai-embed-large")
-    return embed_model.embed_query(text)
+    return get_embedder().embed_query(text)
+
+
+def embed_query(query: str):
+    """Embeds a query string, served from the query embedding cache when possible."""
+    return query_embedding_cache.get_or_embed(query, generate_embeddings)
 
 
 def load_agent_cards(agent_card_dir: str):
@@ -48,7 +90,7 @@ def load_agent_cards(agent_card_dir: str):
         logger.error(
             f"Agent cards directory not found or is not a directory: {agent_card_dir}"
         )
-        return agent_cards
+        return card_uris, agent_cards
 
     logger.info(f"Loading agent cards from card repo: {agent_card_dir}")
 
@@ -79,60 +121,196 @@ def load_agent_cards(agent_card_dir: str):
     return card_uris, agent_cards
 
 
-def build_agent_card_embeddings(agent_card_dir: str) -> pd.DataFrame:
-    card_uris, agent_cards = load_agent_cards(agent_card_dir)
+def build_agent_card_embeddings(
+    agent_card_dir: str,
+    use_cache: bool = True,
+    previous: AgentCardIndex | None = None,
+    backend: str | None = None,
+    lexical_weight: float | None = None,
+) -> AgentCardIndex:
+    """Loads the agent cards and embeds them into an AgentCardIndex.
 
-    if not agent_cards:
-        return pd.DataFrame()
+    Each card is embedded as its name and description plus one unit per skill
+    (see ``card_unit_texts``), and the same texts feed the BM25 lexical index.
+    The embeddings are computed once and held as a contiguous, L2-normalized
+    float32 matrix so each query is scored with a single matrix product.
+    Embeddings are cached in a sidecar store in the cards directory, keyed by
+    the SHA-256 of each unit text and the embedding model, so only new or
+    changed cards are re-embedded.
 
-    texts = [json.dumps(card) for card in agent_cards]
-    embedding_model = OllamaEmbeddings(model="mxbai-embed-large")
-    embeddings = embedding_model.embed_documents(texts)  # shape: (N, D)
+    Args:
+        agent_card_dir: directory to agent cards
+        use_cache: whether to read and write the on-disk embedding cache
+        previous: the index being replaced on reload, its vectors are reused for unchanged cards
+        backend: vector index backend ("auto", "brute_force" or "ivf"), defaults to
+            the backend of the previous index or "auto"
+        lexical_weight: weight of the BM25 score in the fused ranking, defaults to
+            the weight of the previous index
+    """
+    if backend is None:
+        backend = previous.backend if previous else INDEX_BACKEND
+    if lexical_weight is None:
+        lexical_weight = previous.lexical_weight if previous else DEFAULT_LEXICAL_WEIGHT
+    start = time.perf_counter()
+    card_uris, agent_cards = load_agent_cards(agent_card_dir)
 
-    df = pd.DataFrame(
-        {"card_uri": card_uris, "agent_card": agent_cards, "embedding": embeddings}
+    if not agent_cards:
+        return AgentCardIndex([], [], [], backend=backend)
+
+    texts = []
+    unit_cards = []
+    for card_idx, card in enumerate(agent_cards):
+        units = card_unit_texts(card)
+        texts.extend(units)
+        unit_cards.extend([card_idx] * len(units))
+    keys = [content_key(text, EMBEDDING_MODEL) for text in texts]
+    store = EmbeddingStore.for_directory(agent_card_dir) if use_cache else None
+    try:
+        embeddings, hits, misses = embed_with_cache(
+            texts,
+            keys,
+            lambda docs: get_embedder().embed_documents(docs),
+            EMBEDDING_MODEL,
+            store,
+            known=previous.vectors_by_key() if previous else None,
+        )
+        if store:
+            store.prune(keys, EMBEDDING_MODEL)
+    finally:
+        if store:
+            store.close()
+
+    logger.info(
+        f"Built agent card index with {len(agent_cards)} cards ({len(texts)} units) in "
+        f"{(time.perf_counter() - start) * 1000:.1f} ms "
+        f"(embedding cache hits={hits}, misses={misses})"
+    )
+    index = AgentCardIndex(
+        card_uris,
+        agent_cards,
+        embeddings,
+        keys=keys,
+        backend=backend,
+        unit_cards=unit_cards,
+        unit_texts=texts,
+        lexical_weight=lexical_weight,
     )
-    return df
+    logger.info(f"Using {index.vector_index.name} vector index for {len(index)} cards")
+    return index
 
 
-def find_best_match(df: pd.DataFrame, query: str) -> dict:
-    if df.empty:
-        raise ValueError("No agent cards loaded.")
-    embedding_model = OllamaEmbeddings(model="mxbai-embed-large")
-    query_vec = embedding_model.embed_query(query)
-    scores = df["embedding"].apply(lambda emb: np.dot(emb, query_vec))
+def reload_agent_card_index(
+    holder: AgentCardIndexHolder, agent_card_dir: str, changes: CardDirectoryChanges | None = None
+) -> AgentCardIndex:
+    """Re-indexes the cards directory and atomically swaps the new index into the holder.
 
-    best_idx = scores.idxmax()
-    best_card = df.loc[best_idx, "agent_card"]
-    best_uri = df.loc[best_idx, "card_uri"]
-    best_score = scores[best_idx]
-
-    logger.info(f"Best match: {best_uri} with score {best_score:.4f}")
-    return best_card
+    Unchanged cards reuse the vectors of the current index, so only added or
+    edited cards are embedded. In-flight lookups keep the index they started with.
+    """
+    if changes is not None:
+        logger.info(
+            f"Re-indexing agent cards: added={changes.added}, changed={changes.changed}, deleted={changes.deleted}"
+        )
+    index = build_agent_card_embeddings(agent_card_dir, previous=holder.index)
+    holder.swap(index)
+    logger.info(f"Agent card index updated to version {index.version} with {len(index)} cards")
+    return index
 
 
-def get_card_by_uri(df: pd.DataFrame, uri: str) -> dict | None:
-    result = df[df["card_uri"] == uri]
-    if result.empty:
-        return None
-    return result.iloc[0]["agent_card"]
+def find_top_matches(
+    index: AgentCardIndex, query: str, top_k: int = 3, min_score: float | None = None
+) -> list[dict]:
+    """Ranks the agent cards against a query.
 
+    Returns:
+        A list of ``{"card_uri", "score", "agent_card"}`` dictionaries sorted by
+        descending fused (semantic and lexical) score.
+    """
+    if index.empty:
+        raise ValueError("No agent cards loaded.")
+    query_vec = embed_query(query)
+    return [
+        {
+            "card_uri": index.card_uris[i],
+            "score": score,
+            "agent_card": index.agent_cards[i],
+        }
+        for i, score in index.top_k(query_vec, top_k, min_score, query_text=query)
+    ]
+
+
+def find_top_matches_batch(
+    index: AgentCardIndex,
+    queries: list[str],
+    top_k: int = 1,
+    min_score: float | None = None,
+) -> list[list[dict]]:
+    """Ranks the agent cards against many queries at once.
+
+    Uncached queries are embedded with a single ``embed_documents`` call and all
+    queries are scored with one matrix product.
 
-def serve(host, port, transport, agent_cards_dir: str):
-    """Initialize and runs the agent cards mcp_servers server.
-    Args:
-        host: The hostname or IP address to bind the server to.
-        port: The port number to bind the server to.
-        transport: The transport mechanism for the MCP server (e.g., 'stdio', 'sse')
-        agent_cards_dir: directory to agent_cards
+    Returns:
+        One ranked match list per query, in the order of ``queries``.
+    """
+    if index.empty:
+        raise ValueError("No agent cards loaded.")
+    if not queries:
+        return []
+    query_vecs = query_embedding_cache.get_or_embed_many(
+        queries, lambda texts: get_embedder().embed_documents(texts)
+    )
+    return [
+        [
+            {
+                "card_uri": index.card_uris[i],
+                "score": score,
+                "agent_card": index.agent_cards[i],
+            }
+            for i, score in ranked
+        ]
+        for ranked in index.top_k_many(query_vecs, top_k, min_score, query_texts=queries)
+    ]
+
+
+def find_best_match(index: AgentCardIndex, query: str) -> dict:
+    best = find_top_matches(index, query, top_k=1)[0]
+    logger.info(f"Best match: {best['card_uri']} with score {best['score']:.4f}")
+    return best["agent_card"]
+
+
+def get_card_by_uri(index: AgentCardIndex, uri: str) -> dict | None:
+    return index.get_by_uri(uri)
+
+
+def create_server(
+    host,
+    port,
+    agent_cards_dir: str,
+    query_cache_size: int = QUERY_CACHE_SIZE,
+    query_cache_ttl: float | None = QUERY_CACHE_TTL,
+    index_backend: str = INDEX_BACKEND,
+    lexical_weight: float = DEFAULT_LEXICAL_WEIGHT,
+    use_cache: bool = True,
+) -> tuple[FastMCP, AgentCardIndexHolder]:
+    """Builds the agent cards index and the FastMCP server exposing it.
+
+    See ``serve`` for the arguments, ``use_cache`` toggles the on-disk embedding cache.
 
-    Raises:
-        ValueError
+    Returns:
+        The FastMCP server and the holder of its (reloadable) card index.
     """
-    logger.info("Starting Agent Cards MCP Server")
     mcp = FastMCP("agent-cards", host=host, port=port)
-
-    df = build_agent_card_embeddings(agent_cards_dir)
+    configure_query_cache(query_cache_size, query_cache_ttl)
+
+    holder = AgentCardIndexHolder(
+        build_agent_card_embeddings(
+            agent_cards_dir,
+            use_cache=use_cache,
+            backend=index_backend,
+            lexical_weight=lexical_weight,
+        )
+    )
 
     @mcp.tool(
         name="find_agent",
@@ -144,15 +322,100 @@ def serve(host, port, transport, agent_cards_dir: str):
 
         This function takes a user query, typically a natural language question or a task generated by an agent,
         generates its embedding, and compares it against the
-        pre-computed embedding of the loaded agent cards. It uses the dot product to measure similarity and identifies the agent card with the highest similarity score.
+        pre-computed embeddings of the loaded agent cards and their skills. It fuses cosine similarity with a BM25
+        score over the skill names, descriptions, tags and examples, and identifies the agent card with the highest score.
 
         Args:
             query: The natual language query string used to search for a relevant agent.
 
         Returns:
-            The json representing the agent card deemed most relevant to the input query based on embedding similarity.
+            The json representing the agent card deemed most relevant to the input query.
         """
-        return find_best_match(df, query)
+        return find_best_match(holder.index, query)
+
+    @mcp.tool(
+        name="find_agents",
+        description="Ranks agent cards against a natural language query string and returns the top candidates with scores.",
+    )
+    def find_agents(query: str, top_k: int = 3, min_score: float | None = None) -> dict:
+        """
+        Finds the top ranked agent cards for a query string.
+
+        Args:
+            query: The natural language query string used to search for relevant agents.
+            top_k: Maximum number of candidates to return.
+            min_score: Optional minimum fused score a candidate must reach.
+
+        Returns:
+            A json object with a ``matches`` list of ``{"card_uri", "score", "agent_card"}``
+            entries sorted by descending score, and the card index ``version``.
+        """
+        index = holder.index
+        return {
+            "matches": find_top_matches(index, query, top_k, min_score),
+            "version": index.version,
+        }
+
+    @mcp.tool(
+        name="find_agents_batch",
+        description="Resolves many task descriptions to their best matching agent cards in one call.",
+    )
+    def find_agents_batch(
+        queries: list[str], top_k: int = 1, min_score: float | None = None
+    ) -> dict:
+        """
+        Finds the top ranked agent cards for each of several query strings.
+
+        All queries are embedded in one batch and scored with a single matrix product,
+        so a whole plan can be routed in one round trip.
+
+        Args:
+            queries: The natural language task descriptions to route.
+            top_k: Maximum number of candidates to return per query.
+            min_score: Optional minimum fused score a candidate must reach.
+
+        Returns:
+            A json object with a ``results`` list holding, for every query in order,
+            ``{"query", "matches"}``, and the card index ``version``.
+        """
+        index = holder.index
+        matches = find_top_matches_batch(index, queries, top_k, min_score)
+        return {
+            "results": [
+                {"query": query, "matches": query_matches}
+                for query, query_matches in zip(queries, matches)
+            ],
+            "version": index.version,
+        }
+
+    @mcp.resource("resource://agent_cards/list", mime_type="application/json")
+    def list_agent_cards() -> dict:
+        """Returns every loaded agent card in one read so clients can cache them locally.
+
+        Returns:
+            A json object with the card index ``version`` and a ``cards`` list of
+            ``{"card_uri", "agent_card"}`` entries.
+        """
+        index = holder.index
+        return {
+            "version": index.version,
+            "cards": [
+                {"card_uri": uri, "agent_card": card}
+                for uri, card in zip(index.card_uris, index.agent_cards)
+            ],
+        }
+
+    @mcp.resource("resource://agent_cards/by_name/{name}", mime_type="application/json")
+    def get_agent_card_by_name(name: str) -> dict:
+        """Retrieves an agent card by its ``name`` field.
+
+        Returns:
+            A json / dictionary, empty when no card has that name
+        """
+        card = holder.index.get_by_name(unquote(name))
+        if card:
+            return {"agent_card": card}
+        return {}
 
     @mcp.resource("resource://agent_cards/{card_name}", mime_type="application/json")
     def get_agent_card(card_name: str) -> dict:
@@ -165,10 +428,71 @@ def serve(host, port, transport, agent_cards_dir: str):
             A json / dictionary
         """
         uri = f"resource://agent_cards/{card_name}"
-        card = get_card_by_uri(df, uri)
+        card = get_card_by_uri(holder.index, uri)
         if card:
             return {"agent_card": card}
         return {}
 
+    @mcp.resource("resource://agent_cards/metrics", mime_type="application/json")
+    def get_metrics() -> dict:
+        """Reports the query embedding cache counters (hits, misses, hit rate, size)."""
+        return {
+            "index_version": holder.version,
+            "cards": len(holder.index),
+            "query_embedding_cache": query_embedding_cache.stats(),
+        }
+
+    # Shared by every agent for passing large payloads by reference
+    register_artifact_tools(mcp)
+
+    return mcp, holder
+
+
+def serve(
+    host,
+    port,
+    transport,
+    agent_cards_dir: str,
+    query_cache_size: int = QUERY_CACHE_SIZE,
+    query_cache_ttl: float | None = QUERY_CACHE_TTL,
+    watch: bool = False,
+    watch_interval: float = 2.0,
+    index_backend: str = INDEX_BACKEND,
+    lexical_weight: float = DEFAULT_LEXICAL_WEIGHT,
+):
+    """Initialize and runs the agent cards mcp_servers server.
+    Args:
+        host: The hostname or IP address to bind the server to.
+        port: The port number to bind the server to.
+        transport: The transport mechanism for the MCP server (e.g., 'stdio', 'sse')
+        agent_cards_dir: directory to agent_cards
+        query_cache_size: maximum number of cached query embeddings
+        query_cache_ttl: seconds a cached query embedding stays valid, None to never expire
+        watch: poll agent_cards_dir and hot-reload added, changed and deleted cards
+        watch_interval: seconds between polls when watch is enabled
+        index_backend: vector index backend, "auto", "brute_force" or "ivf"
+        lexical_weight: weight of the BM25 skill score fused with the semantic score (0 disables it)
+
+    Raises:
+        ValueError
+    """
+    logger.info("Starting Agent Cards MCP Server")
+    mcp, holder = create_server(
+        host,
+        port,
+        agent_cards_dir,
+        query_cache_size=query_cache_size,
+        query_cache_ttl=query_cache_ttl,
+        index_backend=index_backend,
+        lexical_weight=lexical_weight,
+    )
+    if watch:
+        watcher = CardDirectoryWatcher(
+            agent_cards_dir,
+            lambda changes: reload_agent_card_index(holder, agent_cards_dir, changes),
+            interval=watch_interval,
+        )
+        watcher.start()
+
     logger.info(f"Agent cards MCP Server at {host}:{port} and transport {transport}")
     mcp.run(transport=transport)
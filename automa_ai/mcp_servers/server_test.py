@@ -0,0 +1,60 @@
+import json
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from automa_ai.mcp_servers import server
+
+AGENT_CARDS_DIR = Path(__file__).resolve().parents[2] / "examples" / "sim_bem_network" / "agent_cards"
+
+
+class FakeEmbeddings:
+    """Deterministic stand-in for OllamaEmbeddings, hashes words into a small vector."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        vec = np.zeros(64, dtype=np.float32)
+        for word in text.lower().split():
+            vec[zlib.crc32(word.encode()) % 64] += 1.0
+        return vec.tolist()
+
+
+@pytest.fixture
+def agent_cards_server(monkeypatch):
+    monkeypatch.setattr(server, "_embedder", FakeEmbeddings())
+    mcp, holder = server.create_server("localhost", 0, str(AGENT_CARDS_DIR), use_cache=False)
+    return mcp, holder
+
+
+@pytest.mark.asyncio
+async def test_list_cards_and_lookup(agent_cards_server):
+    mcp, holder = agent_cards_server
+    async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+        result = await session.read_resource("resource://agent_cards/list")
+        data = json.loads(result.contents[0].text)
+        assert data["version"] == holder.version
+        assert len(data["cards"]) == len(holder.index)
+
+        result = await session.read_resource("resource://agent_cards/planner_agent")
+        card = json.loads(result.contents[0].text)["agent_card"]
+        assert holder.index.get_by_name(card["name"]) == card
+        assert holder.index.get_by_url(card["url"]) == card
+
+
+@pytest.mark.asyncio
+async def test_find_agents_batch(agent_cards_server):
+    mcp, _ = agent_cards_server
+    async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+        result = await session.call_tool(
+            "find_agents_batch",
+            {"queries": ["run annual simulation", "add daylighting sensors"], "top_k": 2},
+        )
+        data = json.loads(result.content[0].text)
+        assert [len(entry["matches"]) for entry in data["results"]] == [2, 2]
+        assert data["results"][0]["matches"][0]["card_uri"] == "resource://agent_cards/simulation_agent"
+        assert data["results"][1]["matches"][0]["card_uri"] == "resource://agent_cards/lighting_agent"
@@ -0,0 +1,159 @@
+### Pluggable nearest neighbour indexes over L2-normalized embedding matrices.
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# Registries at or above this many vectors use the approximate index when the
+# backend is "auto".
+DEFAULT_ANN_THRESHOLD = 2048
+
+
+def top_k_rows(scores: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the column indices and values of the top_k scores of each row, best first."""
+    n = scores.shape[1]
+    k = min(top_k, n)
+    if k <= 0:
+        empty = np.zeros((scores.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(np.float32)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    return (
+        np.take_along_axis(candidates, order, axis=1),
+        np.take_along_axis(candidate_scores, order, axis=1),
+    )
+
+
+class VectorIndex(ABC):
+    """Interface of a cosine similarity index over an (N, D) normalized matrix."""
+
+    name: str = "base"
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @abstractmethod
+    def search(self, queries: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the nearest vectors of each normalized query.
+
+        Args:
+            queries: Normalized query matrix of shape (M, D).
+            top_k: Number of neighbours per query.
+
+        Returns:
+            A tuple of (indices, scores), both of shape (M, min(top_k, N)), sorted
+            by descending score.
+        """
+        pass
+
+
+class BruteForceIndex(VectorIndex):
+    """Exact search with one matrix product against every vector."""
+
+    name = "brute_force"
+
+    def search(self, queries: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        return top_k_rows(queries @ self.matrix.T, top_k)
+
+
+class IVFIndex(VectorIndex):
+    """Approximate search with an inverted file over spherical k-means clusters.
+
+    Vectors are grouped by their nearest centroid and stored contiguously per
+    cluster. A query is compared against the centroids first and then only
+    against the vectors of the ``nprobe`` closest clusters.
+    """
+
+    name = "ivf"
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        nlist: int | None = None,
+        nprobe: int | None = None,
+        iterations: int = 10,
+        seed: int = 0,
+    ):
+        super().__init__(matrix)
+        n = matrix.shape[0]
+        self.nlist = max(1, min(n, nlist or int(np.sqrt(n))))
+        self.nprobe = max(1, min(self.nlist, nprobe or max(1, self.nlist // 4)))
+        self.centroids = self._train(matrix, self.nlist, iterations, seed)
+        assignments = np.argmax(matrix @ self.centroids.T, axis=1)
+        # Reorder vectors so every inverted list is one contiguous slice
+        self.ids = np.argsort(assignments, kind="stable")
+        self.sorted_matrix = np.ascontiguousarray(matrix[self.ids])
+        counts = np.bincount(assignments, minlength=self.nlist)
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    @staticmethod
+    def _train(matrix: np.ndarray, nlist: int, iterations: int, seed: int) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        # Train on a sample, a few hundred points per centroid is plenty
+        sample_size = min(matrix.shape[0], 256 * nlist)
+        sample = matrix[rng.choice(matrix.shape[0], sample_size, replace=False)]
+        centroids = sample[:nlist].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            one_hot = np.zeros((nlist, sample_size), dtype=np.float32)
+            one_hot[assignments, np.arange(sample_size)] = 1.0
+            sums = one_hot @ sample
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            filled = norms[:, 0] > 0
+            # Empty clusters keep their previous centroid
+            centroids[filled] = sums[filled] / norms[filled]
+        return np.ascontiguousarray(centroids, dtype=np.float32)
+
+    def search(self, queries: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        k = min(top_k, len(self))
+        indices = np.full((queries.shape[0], k), -1, dtype=np.int64)
+        scores = np.full((queries.shape[0], k), -np.inf, dtype=np.float32)
+        probes, _ = top_k_rows(queries @ self.centroids.T, self.nprobe)
+        for row, (query, lists) in enumerate(zip(queries, probes)):
+            # Inverted lists are contiguous slices, so scoring them copies nothing
+            slices = [(self.offsets[c], self.offsets[c + 1]) for c in lists]
+            candidate_scores = np.concatenate(
+                [self.sorted_matrix[start:end] @ query for start, end in slices]
+            )
+            if candidate_scores.size == 0:
+                continue
+            positions = np.concatenate([np.arange(start, end) for start, end in slices])
+            found, found_scores = top_k_rows(candidate_scores[None, :], k)
+            count = found.shape[1]
+            indices[row, :count] = self.ids[positions[found[0]]]
+            scores[row, :count] = found_scores[0]
+        return indices, scores
+
+
+INDEX_BACKENDS = {
+    BruteForceIndex.name: BruteForceIndex,
+    IVFIndex.name: IVFIndex,
+}
+
+
+def build_vector_index(
+    matrix: np.ndarray, backend: str = "auto", ann_threshold: int = DEFAULT_ANN_THRESHOLD
+) -> VectorIndex:
+    """Creates the vector index for a normalized embedding matrix.
+
+    Args:
+        matrix: L2-normalized float32 matrix of shape (N, D).
+        backend: "brute_force", "ivf", or "auto" to choose by vector count.
+        ann_threshold: Minimum vector count for "auto" to pick the IVF index.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend == "auto":
+        backend = IVFIndex.name if matrix.shape[0] >= ann_threshold else BruteForceIndex.name
+    if backend not in INDEX_BACKENDS:
+        raise ValueError(
+            f"Unsupported index backend: {backend}. Must be one of {['auto', *INDEX_BACKENDS]}."
+        )
+    return INDEX_BACKENDS[backend](matrix)
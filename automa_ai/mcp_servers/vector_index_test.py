@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from automa_ai.mcp_servers.card_index import AgentCardIndex, normalize_rows
+from automa_ai.mcp_servers.vector_index import (
+    BruteForceIndex,
+    IVFIndex,
+    build_vector_index,
+)
+
+
+@pytest.fixture
+def clustered():
+    rng = np.random.default_rng(7)
+    centers = normalize_rows(rng.standard_normal((20, 32)))
+    labels = rng.integers(0, 20, 1000)
+    matrix = normalize_rows(centers[labels] + 0.1 * rng.standard_normal((1000, 32)))
+    queries = normalize_rows(matrix[:50] + 0.05 * rng.standard_normal((50, 32)))
+    return matrix, queries
+
+
+class TestVectorIndex:
+    """Test cases for the brute force and IVF vector index backends."""
+
+    def test_brute_force_is_exact(self, clustered):
+        matrix, queries = clustered
+        indices, scores = BruteForceIndex(matrix).search(queries, 3)
+        expected = np.argsort(-(queries @ matrix.T), axis=1)[:, :3]
+        np.testing.assert_array_equal(indices, expected)
+        assert np.all(np.diff(scores, axis=1) <= 0)
+
+    def test_ivf_recall(self, clustered):
+        matrix, queries = clustered
+        exact, _ = BruteForceIndex(matrix).search(queries, 5)
+        approx, _ = IVFIndex(matrix).search(queries, 5)
+        recall = sum(len(set(a) & set(e)) for a, e in zip(approx, exact)) / exact.size
+        assert recall >= 0.9
+
+    def test_auto_backend_selection(self, clustered):
+        matrix, _ = clustered
+        assert build_vector_index(matrix[:10], "auto", ann_threshold=100).name == "brute_force"
+        assert build_vector_index(matrix, "auto", ann_threshold=100).name == "ivf"
+
+    def test_unknown_backend(self, clustered):
+        with pytest.raises(ValueError, match="Unsupported index backend"):
+            build_vector_index(clustered[0], "hnsw")
+
+    def test_card_index_uses_ann_backend(self, clustered):
+        matrix, queries = clustered
+        uris = [f"resource://agent_cards/{i}" for i in range(len(matrix))]
+        cards = [{"name": str(i)} for i in range(len(matrix))]
+        index = AgentCardIndex(uris, cards, matrix, backend="ivf")
+        assert index.vector_index.name == "ivf"
+        assert index.top_k(matrix[3], top_k=1)[0][0] == 3
@@ -2,20 +2,23 @@ import asyncio
 import logging
 from typing import Dict, Any
 
+from automa_ai.common.a2a_client_pool import close_a2a_client_pool
 from automa_ai.common.agent_registry import A2AServerManager, A2AAgentServer
 from automa_ai.common.base_agent import BaseAgent
 from automa_ai.common.file_util import verify_directory_and_json_files
 from automa_ai.common.mcp_registry import MCPServerManager, MCPServerConfig
+from automa_ai.mcp_servers.client import close_session_pool
 from automa_ai.mcp_servers.server import serve
 
 logger = logging.getLogger(__name__)
 
 
 class ServiceOrchestrator:
-    def __init__(self, orchestrator: BaseAgent, agent_cards_dir: str):
+    def __init__(self, orchestrator: BaseAgent, agent_cards_dir: str, watch_agent_cards: bool = False):
         """
         :param orchestrator: orchestrator agent
         :param agent_cards_dir: directory to agent cards.
+        :param watch_agent_cards: hot-reload cards added, changed or deleted in agent_cards_dir.
         """
         self.mcp_manager = MCPServerManager()
         self.a2a_manager = A2AServerManager()
@@ -30,7 +33,8 @@ class ServiceOrchestrator:
             port=10100,
             serve=serve,
             transport="sse",
-            agent_cards_dir=agent_cards_dir
+            agent_cards_dir=agent_cards_dir,
+            serve_kwargs={"watch": watch_agent_cards},
         )
         self.add_mcp_server(agent_card_mcp_config)
 
@@ -71,6 +75,10 @@ class ServiceOrchestrator:
         logger.info("Shutting down all services...")
 
         try:
+            # Close pooled client sessions before their servers go away
+            await close_session_pool()
+            await close_a2a_client_pool()
+
             # Shutdown A2A servers first (they depend on MCP)
             logger.info("Shutting down A2A servers...")
             await self.a2a_manager.stop_all()
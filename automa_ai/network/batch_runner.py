@@ -0,0 +1,244 @@
+### Runs a file of what-if queries concurrently against one long lived agentic network.
+# Usage: python -m automa_ai.network.batch_runner queries.csv --network my_app:build_network --output results.jsonl
+import asyncio
+import csv
+import importlib
+import inspect
+import json
+import logging
+import time
+from contextlib import aclosing
+from pathlib import Path
+from typing import Any, Iterable
+from uuid import uuid4
+
+import click
+
+from automa_ai.common.base_agent import BaseAgent
+from automa_ai.common.human_input import HumanInputProvider, ScriptedInputProvider, UpstreamInputProvider
+from automa_ai.common.scheduler import Priority
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_CONCURRENCY = 4
+
+
+def load_queries(path: str | Path) -> list[dict]:
+    """Reads queries from a CSV file with a header or a JSONL file, one query per row.
+
+    Each row needs a "query" and may have an "id", the row number by default.
+    Other columns are kept as the row's parameters, e.g. building type or climate zone.
+    """
+    path = Path(path)
+    with path.open(newline="") as file:
+        if path.suffix.lower() == ".csv":
+            rows = list(csv.DictReader(file))
+        else:
+            rows = [json.loads(line) for line in file if line.strip()]
+    queries = []
+    for index, row in enumerate(rows):
+        if not row.get("query"):
+            raise ValueError(f"Row {index} of {path} has no query")
+        row = dict(row)
+        query_id = str(row.pop("id", None) or index)
+        queries.append({"id": query_id, "query": row.pop("query"), "params": row})
+    return queries
+
+
+def completed_ids(output: str | Path) -> set[str]:
+    """Ids of the queries already completed in an output file, these are skipped when resuming."""
+    output = Path(output)
+    if not output.exists():
+        return set()
+    ids = set()
+    with output.open() as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interruption
+                continue
+            if record.get("status") == "completed":
+                ids.add(record["id"])
+    return ids
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+async def run_query(
+    orchestrator: BaseAgent, item: dict, priority: Priority, human_input: HumanInputProvider
+) -> dict:
+    """Streams one query through the orchestrator in its own context and returns its record."""
+    context_id = f"batch-{item['id']}-{uuid4().hex[:8]}"
+    record = {
+        "id": item["id"],
+        "query": item["query"],
+        "params": item.get("params", {}),
+        "context_id": context_id,
+        "status": "failed",
+        "content": None,
+    }
+    started = time.perf_counter()
+    try:
+        stream = orchestrator.stream(
+            item["query"], context_id, context_id, priority=priority, human_input=human_input
+        )
+        # Closed right away on break, so the workflow releases its session and slots
+        async with aclosing(stream):
+            async for chunk in stream:
+                if not isinstance(chunk, dict):
+                    continue
+                if chunk.get("is_task_failed"):
+                    # Not completed, so it is retried when the batch is resumed
+                    record["content"] = chunk.get("content")
+                    break
+                if chunk.get("is_task_complete"):
+                    record.update(status="completed", content=chunk.get("content"))
+                    break
+                if chunk.get("require_user_input"):
+                    # Answered by nobody in a batch, see ScriptedInputProvider
+                    record.update(status="input_required", content=chunk.get("content"))
+                    break
+    except Exception as e:
+        logger.error(f"Query {item['id']} failed: {e}")
+        record["content"] = str(e)
+    record["latency_s"] = time.perf_counter() - started
+    sessions = getattr(orchestrator, "sessions", None)
+    if sessions is not None:
+        # A paused workflow is not resumed by a batch, free its session
+        sessions.discard(context_id)
+    return record
+
+
+async def run_batch(
+    orchestrator: BaseAgent,
+    queries: Iterable[dict],
+    output: str | Path,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    priority: Priority = Priority.BATCH,
+    human_input: HumanInputProvider | None = None,
+) -> dict:
+    """Runs queries concurrently and appends a JSON record per query to output as it finishes.
+
+    Queries already completed in output are skipped, so an interrupted batch
+    is resumed by running it again. The batch's agent calls run at
+    ``priority`` and questions of its agents go to ``human_input``, recorded
+    as input_required when it has no answer. Both are passed with each query,
+    so other users of the orchestrator are not affected.
+
+    Returns:
+        Counts, throughput (queries per minute) and latency percentiles (seconds) of this run.
+    """
+    done = completed_ids(output)
+    pending = [item for item in queries if item["id"] not in done]
+    if done:
+        logger.info(f"Resuming batch, skipping {len(done)} completed queries")
+    human_input = human_input or UpstreamInputProvider()
+
+    work: asyncio.Queue = asyncio.Queue()
+    for item in pending:
+        work.put_nowait(item)
+    records = []
+    started = time.perf_counter()
+
+    async def worker(file) -> None:
+        while not work.empty():
+            item = work.get_nowait()
+            record = await run_query(orchestrator, item, priority, human_input)
+            # Written as soon as it is done, so an interruption loses no finished query
+            file.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+            file.flush()
+            records.append(record)
+            logger.info(
+                f"Query {record['id']} {record['status']} in {record['latency_s']:.1f}s, "
+                f"{len(records)}/{len(pending)}"
+            )
+
+    with Path(output).open("a") as file:
+        await asyncio.gather(*(worker(file) for _ in range(max(1, concurrency))))
+
+    elapsed = time.perf_counter() - started
+    latencies = [record["latency_s"] for record in records]
+    statuses = [record["status"] for record in records]
+    return {
+        "queries": len(records),
+        "skipped": len(done),
+        "completed": statuses.count("completed"),
+        "input_required": statuses.count("input_required"),
+        "failed": statuses.count("failed"),
+        "elapsed_s": elapsed,
+        "throughput_per_min": len(records) / elapsed * 60 if elapsed > 0 else 0.0,
+        "latency_p50": percentile(latencies, 0.5),
+        "latency_p90": percentile(latencies, 0.9),
+        "latency_p99": percentile(latencies, 0.99),
+    }
+
+
+def write_parquet(output: str | Path, parquet: str | Path) -> None:
+    """Converts the JSONL records to Parquet, which needs pyarrow or fastparquet installed."""
+    import pandas as pd
+
+    # A query retried on resume keeps its last record
+    frame = pd.read_json(output, lines=True, dtype={"id": str}).drop_duplicates("id", keep="last")
+    # Parameters differ between query files, keep them as JSON text
+    frame["params"] = frame["params"].map(json.dumps)
+    frame.to_parquet(parquet, index=False)
+
+
+def load_network(spec: str) -> Any:
+    """Imports module:factory, the factory returns (or is) a TaskServiceOrchestrator, possibly async."""
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise click.BadParameter(f"Expected module:factory, got {spec}", param_hint="--network")
+    factory = getattr(importlib.import_module(module_name), attribute)
+    return factory() if callable(factory) else factory
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['queries']} queries ({report['skipped']} skipped): {report['completed']} completed, "
+        f"{report['input_required']} input required, {report['failed']} failed"
+    )
+    print(f"{report['elapsed_s']:.1f}s, {report['throughput_per_min']:.2f} queries/min")
+    print(
+        f"latency p50 {report['latency_p50']:.1f}s, p90 {report['latency_p90']:.1f}s, "
+        f"p99 {report['latency_p99']:.1f}s"
+    )
+
+
+async def _main(queries_file, network_spec, output, concurrency, answers, parquet) -> dict:
+    network = load_network(network_spec)
+    if inspect.isawaitable(network):
+        network = await network
+    human_input = ScriptedInputProvider(answers) if answers else None
+    async with network:
+        await network.run()
+        return await network.run_batch(
+            load_queries(queries_file), output, concurrency=concurrency, human_input=human_input
+        )
+
+
+@click.command()
+@click.argument("queries_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--network", "network_spec", required=True, help="module:factory building the TaskServiceOrchestrator")
+@click.option("--output", required=True, type=click.Path(dir_okay=False), help="JSONL results, appended and resumed")
+@click.option("--concurrency", default=DEFAULT_BATCH_CONCURRENCY, help="Queries running at once")
+@click.option("--answers", default=None, type=click.Path(exists=True, dir_okay=False),
+              help="JSON answers to agents' questions, see ScriptedInputProvider")
+@click.option("--parquet", default=None, type=click.Path(dir_okay=False), help="Also write all results as Parquet")
+def cli(queries_file, network_spec, output, concurrency, answers, parquet):
+    """Runs every query of a CSV or JSONL file against one agentic network."""
+    report = asyncio.run(_main(queries_file, network_spec, output, concurrency, answers, parquet))
+    print_report(report)
+    if parquet:
+        write_parquet(output, parquet)
+        print(f"Results written to {parquet}")
+
+
+if __name__ == "__main__":
+    cli()
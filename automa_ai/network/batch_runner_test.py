@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+
+from automa_ai.common.human_input import ScriptedInputProvider
+from automa_ai.common.scheduler import Priority
+from automa_ai.network.batch_runner import load_queries, percentile, run_batch
+
+
+class FakeOrchestrator:
+    """Summarizes each query after a short delay, asks a question for queries mentioning "ask".
+
+    Queries in ``fail`` raise, the workflows of queries in ``failed_tasks`` report failed tasks.
+    """
+
+    def __init__(self, fail: set[str] = frozenset(), failed_tasks: set[str] = frozenset()):
+        self.fail = set(fail)
+        self.failed_tasks = set(failed_tasks)
+        self.priority = Priority.INTERACTIVE
+        self.human_input = None
+        self.running = 0
+        self.max_running = 0
+        self.priorities = []
+
+    async def stream(self, query, context_id, task_id, priority=None, human_input=None):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        self.priorities.append(self.priority if priority is None else priority)
+        human_input = human_input or self.human_input
+        try:
+            await asyncio.sleep(0.01)
+            if query in self.fail:
+                raise RuntimeError("agent unavailable")
+            if query in self.failed_tasks:
+                yield {"is_task_complete": False, "require_user_input": False, "is_task_failed": True,
+                       "content": "Some tasks of the workflow failed"}
+                return
+            if "ask" in query:
+                answer = await human_input.ask(context_id, "Which climate zone?")
+                if answer is None:
+                    yield {"is_task_complete": False, "require_user_input": True, "content": "Which climate zone?"}
+                    return
+                query = f"{query} in {answer}"
+            yield {"is_task_complete": False, "require_user_input": False, "content": "Summary "}
+            yield {"is_task_complete": True, "require_user_input": False, "content": f"Summary of {query}"}
+        finally:
+            self.running -= 1
+
+
+def read(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestBatchRunner:
+    """Test cases for running many queries against one orchestrator."""
+
+    def test_load_queries(self, tmp_path):
+        csv_file = tmp_path / "queries.csv"
+        csv_file.write_text("id,query,climate_zone\nmo-4a,Medium office,4A\n,Small office,2A\n")
+        assert load_queries(csv_file) == [
+            {"id": "mo-4a", "query": "Medium office", "params": {"climate_zone": "4A"}},
+            {"id": "1", "query": "Small office", "params": {"climate_zone": "2A"}},
+        ]
+        jsonl_file = tmp_path / "queries.jsonl"
+        jsonl_file.write_text('{"query": "Warehouse"}\n')
+        assert load_queries(jsonl_file) == [{"id": "0", "query": "Warehouse", "params": {}}]
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_report(self, tmp_path):
+        orchestrator = FakeOrchestrator(fail={"q3"})
+        queries = [{"id": str(i), "query": f"q{i}", "params": {}} for i in range(10)]
+        queries.append({"id": "ask", "query": "ask zone", "params": {}})
+        output = tmp_path / "results.jsonl"
+        report = await run_batch(orchestrator, queries, output, concurrency=3)
+
+        assert orchestrator.max_running == 3
+        assert set(orchestrator.priorities) == {Priority.BATCH}
+        # Passed with each query, the shared orchestrator is left alone
+        assert orchestrator.priority == Priority.INTERACTIVE
+        assert orchestrator.human_input is None
+        assert (report["completed"], report["failed"], report["input_required"]) == (9, 1, 1)
+        assert report["latency_p50"] <= report["latency_p90"] <= report["latency_p99"]
+        records = {record["id"]: record for record in read(output)}
+        assert records["0"]["content"] == "Summary of q0"
+        assert records["3"]["content"] == "agent unavailable"
+        assert records["ask"]["content"] == "Which climate zone?"
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed(self, tmp_path):
+        output = tmp_path / "results.jsonl"
+        queries = [{"id": str(i), "query": f"q{i}", "params": {}} for i in range(4)]
+        queries.append({"id": "ask", "query": "ask zone", "params": {}})
+        report = await run_batch(FakeOrchestrator(fail={"q1"}, failed_tasks={"q2"}), queries, output)
+        assert (report["completed"], report["failed"], report["input_required"]) == (2, 2, 1)
+        assert next(record for record in read(output) if record["id"] == "2")["status"] == "failed"
+
+        orchestrator = FakeOrchestrator()
+        report = await run_batch(
+            orchestrator, queries, output, human_input=ScriptedInputProvider(["4A"])
+        )
+        assert report["skipped"] == 2
+        assert report["completed"] == 3
+        completed = {record["id"]: record for record in read(output) if record["status"] == "completed"}
+        assert sorted(completed) == ["0", "1", "2", "3", "ask"]
+        assert completed["ask"]["content"] == "Summary of ask zone in 4A"
+        assert completed["2"]["content"] == "Summary of q2"
+
+    def test_percentile(self):
+        assert percentile([], 0.5) == 0.0
+        assert percentile([3.0, 1.0, 2.0], 0.5) == 2.0
+        assert percentile([1.0, 2.0], 0.99) == 2.0
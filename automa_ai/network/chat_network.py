@@ -8,12 +8,17 @@ from automa_ai.network.agentic_network import ServiceOrchestrator
 logger = logging.getLogger(__name__)
 
 class ChatServiceOrchestrator(ServiceOrchestrator):
-    def __init__(self, orchestrator_agent: BaseAgent, agent_cards_dir: str):
+    def __init__(self, orchestrator_agent: BaseAgent, agent_cards_dir: str, watch_agent_cards: bool = False):
         """
         :param orchestrator_agent: An orchestrator layer to interact with all other AI agents and produce summary when task completed.
         :param agent_cards_dir: The directory to access agents
+        :param watch_agent_cards: Hot-reload cards added, changed or deleted in agent_cards_dir
         """
-        super().__init__(orchestrator=orchestrator_agent, agent_cards_dir=agent_cards_dir)
+        super().__init__(
+            orchestrator=orchestrator_agent,
+            agent_cards_dir=agent_cards_dir,
+            watch_agent_cards=watch_agent_cards,
+        )
 
     async def user_query(self, query: str, context_id: str, task_id: str):
         try:
@@ -35,10 +40,20 @@ class ChatServiceOrchestrator(ServiceOrchestrator):
                     elif isinstance(message_event, TaskArtifactUpdateEvent):
                         results.append(message_event.artifact)
                         print("📦 Received artifact:", message_event.artifact)
-                # ✅ STEP 3: Final summary message from orchestrator
+                # ✅ STEP 3: Summary tokens, then the final summary from orchestrator
                 elif isinstance(chunk, dict):
+                    if not (
+                        chunk.get("is_task_complete")
+                        or chunk.get("require_user_input")
+                        or chunk.get("is_task_failed")
+                    ):
+                        print(chunk.get("content", ""), end="", flush=True)
+                        continue
                     results.append(chunk)
-                    print("✅ Final summary:", chunk)
+                    if chunk.get("is_task_failed"):
+                        print("\n❌ Workflow failed:", chunk.get("content"))
+                        break
+                    print("\n✅ Final summary:", chunk)
                     if chunk.get("is_task_complete"):
                         break
                 else:
@@ -1,14 +1,23 @@
 import logging
-from a2a.types import SendStreamingMessageSuccessResponse, TaskStatusUpdateEvent, TaskState, TaskArtifactUpdateEvent, \
-    SendStreamingMessageResponse
+from pathlib import Path
+from typing import Iterable
+
+from a2a.types import SendStreamingMessageSuccessResponse, TaskStatusUpdateEvent, TaskState, TaskArtifactUpdateEvent
 from automa_ai.common.base_agent import BaseAgent
+from automa_ai.common.human_input import HumanInputProvider
+from automa_ai.common.scheduler import Priority
+from automa_ai.network import batch_runner
 from automa_ai.network.agentic_network import ServiceOrchestrator
 
 logger = logging.getLogger(__name__)
 
 class TaskServiceOrchestrator(ServiceOrchestrator):
-    def __init__(self, orchestrator: BaseAgent, agent_cards_dir: str):
-        super().__init__(orchestrator=orchestrator, agent_cards_dir=agent_cards_dir)
+    def __init__(self, orchestrator: BaseAgent, agent_cards_dir: str, watch_agent_cards: bool = False):
+        super().__init__(
+            orchestrator=orchestrator,
+            agent_cards_dir=agent_cards_dir,
+            watch_agent_cards=watch_agent_cards,
+        )
 
     async def user_query(self, query: str, context_id: str, task_id: str):
         try:
@@ -30,17 +39,49 @@ class TaskServiceOrchestrator(ServiceOrchestrator):
                     elif isinstance(message_event, TaskArtifactUpdateEvent):
                         results.append(message_event.artifact)
                         print("📦 Received artifact:", message_event.artifact)
-                # ✅ STEP 3: Final summary message from orchestrator
+                # ✅ STEP 3: Summary tokens, then the final summary from orchestrator
                 elif isinstance(chunk, dict):
+                    if not (
+                        chunk.get("is_task_complete")
+                        or chunk.get("require_user_input")
+                        or chunk.get("is_task_failed")
+                    ):
+                        print(chunk.get("content", ""), end="", flush=True)
+                        continue
                     results.append(chunk)
-                    if chunk.get("content"):
-                        print("✅ Final summary:", chunk["content"])
+                    if chunk.get("is_task_failed"):
+                        print("\n❌ Workflow failed:", chunk.get("content"))
+                        break
                     if chunk.get("is_task_complete"):
+                        print("\n✅ Summary complete.")
                         break
-                elif isinstance(chunk.root, SendStreamingMessageResponse):
-                    print(SendStreamingMessageResponse)
+                    if chunk.get("content"):
+                        print("❓", chunk["content"])
+                elif hasattr(chunk, "root"):
+                    print(f"⚠️ Agent error: {chunk.root}")
                 else:
                     print(f"⚠️ Unexpected chunk type: {type(chunk)}")
         finally:
             print("🛑 Tearing down agentic network")
             await self.shutdown_all()
+
+    async def run_batch(
+        self,
+        queries: Iterable[dict],
+        output: str | Path,
+        concurrency: int = batch_runner.DEFAULT_BATCH_CONCURRENCY,
+        priority: Priority = Priority.BATCH,
+        human_input: HumanInputProvider | None = None,
+    ) -> dict:
+        """Runs many queries against the running network, which stays up afterwards.
+
+        :param queries: rows with "id", "query" and "params", see batch_runner.load_queries.
+        :param output: JSONL file the results are appended to, completed queries in it are skipped.
+        :param concurrency: queries running at once, each in its own context.
+        :param priority: priority of the batch's agent calls, below interactive users by default.
+        :param human_input: answers to agents' questions, e.g. a ScriptedInputProvider.
+        :return: counts, throughput and latency percentiles, see batch_runner.run_batch.
+        """
+        return await batch_runner.run_batch(
+            self.orchestrator, queries, output, concurrency, priority, human_input
+        )